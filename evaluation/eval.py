@@ -1,9 +1,12 @@
 import numpy as np
 import random
+import time
+import tracemalloc
 import pandas as pd
 
+from minirag.indexes import FlatIndex, Int8Index, get_index_class
 from minirag.services.rag_service import RagService
-from minirag.models import Chunk
+from minirag.models import Chunk, Collection
 from minirag.utils.stats_utils import function_stats
 
 
@@ -21,7 +24,7 @@ def generate_synthetic_embedding(dim: int = 384) -> list[float]:
     return normalized_embedding.tolist()
 
 
-def create_synthetic_collection(size: int) -> list[Chunk]:
+def create_synthetic_collection(size: int) -> Collection:
     """Create a synthetic collection of specified size."""
     collection = []
     for i in range(size):
@@ -31,7 +34,7 @@ def create_synthetic_collection(size: int) -> list[Chunk]:
             document_name=f"synthetic_doc_{i}", text=text, embedding=embedding
         )
         collection.append(chunk)
-    return collection
+    return Collection.from_chunks(collection)
 
 
 def evaluate_similarity_search(
@@ -75,6 +78,218 @@ def evaluate_similarity_search(
     return pd.DataFrame(results)
 
 
+def recall_at_k(exact_rows: np.ndarray, approximate_rows: np.ndarray) -> float:
+    """Fraction of the exact top-k rows that the approximate search returned."""
+    if len(exact_rows) == 0:
+        return 1.0
+    return len(set(exact_rows.tolist()) & set(approximate_rows.tolist())) / len(
+        exact_rows
+    )
+
+
+def evaluate_index_recall(
+    collection_sizes: list[int],
+    index_name: str = "ivf",
+    index_params: dict | None = None,
+    num_queries: int = 20,
+    top_k: int = 5,
+):
+    """Compare an approximate index against exact flat search (latency and recall@k)."""
+    results = []
+    index_class = get_index_class(index_name)
+
+    for size in collection_sizes:
+        print(f"\nEvaluating {index_name} index with collection size: {size}")
+        embeddings = np.asarray(
+            [generate_synthetic_embedding() for _ in range(size)], dtype=np.float32
+        )
+        flat_index = FlatIndex(embeddings)
+        index = index_class.build(embeddings, **(index_params or {}))
+
+        # Queries close to stored chunks, like real questions about a document
+        query_rows = np.random.choice(size, num_queries)
+        queries = embeddings[query_rows] + np.random.normal(
+            0, 0.05, (num_queries, embeddings.shape[1])
+        )
+
+        for query_idx, query in enumerate(queries):
+            start_time = time.perf_counter()
+            exact_rows, _ = flat_index.search(query, top_k)
+            flat_time = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            approximate_rows, _ = index.search(query, top_k)
+            index_time = time.perf_counter() - start_time
+
+            results.append(
+                {
+                    "collection_size": size,
+                    "index": index_name,
+                    "query_number": query_idx + 1,
+                    "flat_time": flat_time,
+                    "index_time": index_time,
+                    f"recall_at_{top_k}": recall_at_k(exact_rows, approximate_rows),
+                }
+            )
+
+    return pd.DataFrame(results)
+
+
+def evaluate_int8_quantization(
+    collection_sizes: list[int],
+    scales: tuple[str, ...] = ("dimension", "vector"),
+    rerank_factor: int = 4,
+    num_queries: int = 20,
+    top_k: int = 5,
+):
+    """Report recall@k, scan latency and memory of int8 quantization against float32."""
+    results = []
+
+    for size in collection_sizes:
+        print(f"\nEvaluating int8 quantization with collection size: {size}")
+        embeddings = np.asarray(
+            [generate_synthetic_embedding() for _ in range(size)], dtype=np.float32
+        )
+        flat_index = FlatIndex(embeddings)
+        query_rows = np.random.choice(size, num_queries)
+        queries = embeddings[query_rows] + np.random.normal(
+            0, 0.05, (num_queries, embeddings.shape[1])
+        )
+
+        for scale in scales:
+            index = Int8Index.build(
+                embeddings, scale=scale, rerank_factor=rerank_factor
+            )
+            for query_idx, query in enumerate(queries):
+                start_time = time.perf_counter()
+                exact_rows, _ = flat_index.search(query, top_k)
+                flat_time = time.perf_counter() - start_time
+
+                start_time = time.perf_counter()
+                approximate_rows, _ = index.search(query, top_k)
+                index_time = time.perf_counter() - start_time
+
+                results.append(
+                    {
+                        "collection_size": size,
+                        "scale": scale,
+                        "query_number": query_idx + 1,
+                        "flat_time": flat_time,
+                        "index_time": index_time,
+                        "float32_bytes": flat_index.vectors.nbytes,
+                        "int8_bytes": index.nbytes,
+                        f"recall_at_{top_k}": recall_at_k(exact_rows, approximate_rows),
+                    }
+                )
+
+    return pd.DataFrame(results)
+
+
+def evaluate_blocked_scan(
+    collection_sizes: list[int],
+    block_sizes: list[int],
+    num_queries: int = 5,
+    top_k: int = 5,
+):
+    """Compare the blocked exact scan with the full scan (latency and peak memory)."""
+    results = []
+
+    for size in collection_sizes:
+        print(f"\nEvaluating blocked scan with collection size: {size}")
+        embeddings = np.asarray(
+            [generate_synthetic_embedding() for _ in range(size)], dtype=np.float32
+        )
+        queries = np.random.normal(0, 1, (num_queries, embeddings.shape[1]))
+
+        for block_size in [0, *block_sizes]:
+            index = FlatIndex(embeddings, block_size=block_size)
+            for query_idx, query in enumerate(queries):
+                tracemalloc.start()
+                start_time = time.perf_counter()
+                rows, _ = index.search(query, top_k)
+                execution_time = time.perf_counter() - start_time
+                _, peak_memory = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                results.append(
+                    {
+                        "collection_size": size,
+                        "block_size": block_size,
+                        "query_number": query_idx + 1,
+                        "execution_time": execution_time,
+                        "peak_memory": peak_memory,
+                        "same_as_full_scan": rows.tolist()
+                        == FlatIndex(embeddings).search(query, top_k)[0].tolist(),
+                    }
+                )
+
+    return pd.DataFrame(results)
+
+
+def create_clustered_collection(size: int, chunks_per_document: int = 50) -> Collection:
+    """Create a synthetic collection whose documents cover one topic each."""
+    chunks = []
+    for doc_idx in range(-(-size // chunks_per_document)):
+        topic = np.asarray(generate_synthetic_embedding())
+        for _ in range(min(chunks_per_document, size - len(chunks))):
+            embedding = topic + np.random.normal(0, 0.05, topic.shape[0])
+            chunks.append(
+                Chunk(
+                    document_name=f"synthetic_doc_{doc_idx}",
+                    text="",
+                    embedding=embedding.tolist(),
+                )
+            )
+    return Collection.from_chunks(chunks)
+
+
+def evaluate_hierarchical_recall(
+    collection_sizes: list[int],
+    top_documents: list[int],
+    num_queries: int = 20,
+    top_k: int = 5,
+):
+    """Compare hierarchical retrieval with flat search (latency and recall@k)."""
+    results = []
+
+    for size in collection_sizes:
+        print(f"\nEvaluating hierarchical retrieval with collection size: {size}")
+        collection = create_clustered_collection(size)
+        embeddings = np.asarray(collection.embeddings)
+        flat_index = FlatIndex(embeddings)
+        collection.get_document_centroids()
+
+        query_rows = np.random.choice(size, num_queries)
+        queries = embeddings[query_rows] + np.random.normal(
+            0, 0.05, (num_queries, embeddings.shape[1])
+        )
+
+        for query_idx, query in enumerate(queries):
+            start_time = time.perf_counter()
+            exact_rows, _ = flat_index.search(query, top_k)
+            flat_time = time.perf_counter() - start_time
+
+            for documents in top_documents:
+                start_time = time.perf_counter()
+                rows, _ = RagService.search_hierarchical(
+                    "", collection, top_k, query.tolist(), top_documents=documents
+                )
+                hierarchical_time = time.perf_counter() - start_time
+
+                results.append(
+                    {
+                        "collection_size": size,
+                        "top_documents": documents,
+                        "query_number": query_idx + 1,
+                        "flat_time": flat_time,
+                        "hierarchical_time": hierarchical_time,
+                        f"recall_at_{top_k}": recall_at_k(exact_rows, rows),
+                    }
+                )
+
+    return pd.DataFrame(results)
+
+
 def main():
     # Define collection sizes to test (you can adjust these)
     collection_sizes = [100, 500, 1000, 5000, 10_000, 20_000, 50_000]
@@ -98,6 +313,37 @@ def main():
         "\nDetailed results saved to 'evaluation/results/similarity_search_performance.csv'"
     )
 
+    # Approximate index recall and latency against exact search
+    recall_df = evaluate_index_recall(collection_sizes, "ivf", {"nprobe": 8})
+    print("\nIVF recall summary:")
+    print(recall_df.groupby("collection_size").mean(numeric_only=True))
+    recall_df.to_csv("evaluation/results/ivf_recall.csv", index=False)
+
+    int8_df = evaluate_int8_quantization(collection_sizes)
+    print("\nInt8 quantization summary:")
+    print(int8_df.groupby(["collection_size", "scale"]).mean(numeric_only=True))
+    int8_df.to_csv("evaluation/results/int8_recall.csv", index=False)
+
+    binary_df = evaluate_index_recall(collection_sizes, "binary", {"candidates": 256})
+    print("\nBinary recall summary:")
+    print(binary_df.groupby("collection_size").mean(numeric_only=True))
+    binary_df.to_csv("evaluation/results/binary_recall.csv", index=False)
+
+    # Block size 0 is the full scan the blocked kernel is compared against
+    blocked_df = evaluate_blocked_scan(collection_sizes, [1024, 4096, 16384])
+    print("\nBlocked scan summary:")
+    print(blocked_df.groupby(["collection_size", "block_size"]).mean(numeric_only=True))
+    blocked_df.to_csv("evaluation/results/blocked_scan.csv", index=False)
+
+    hierarchical_df = evaluate_hierarchical_recall(collection_sizes, [1, 5, 20])
+    print("\nHierarchical retrieval summary:")
+    print(
+        hierarchical_df.groupby(["collection_size", "top_documents"]).mean(
+            numeric_only=True
+        )
+    )
+    hierarchical_df.to_csv("evaluation/results/hierarchical_recall.csv", index=False)
+
 
 if __name__ == "__main__":
     main()
@@ -3,10 +3,20 @@ from typing import Generator
 
 
 class Backend(ABC):
+    default_embedding_model = ""
+
+    def get_embedding_model(self, model_name: str = "") -> str:
+        return model_name or self.default_embedding_model
+
     @abstractmethod
     def generate_embeddings(self, text: str, model_name: str = "") -> list[float]:
         pass
 
+    def generate_embeddings_batch(
+        self, texts: list[str], model_name: str = ""
+    ) -> list[list[float]]:
+        return [self.generate_embeddings(text, model_name) for text in texts]
+
     @abstractmethod
     def chat_streaming(
         self,
@@ -6,15 +6,29 @@ from minirag.backends.base import Backend
 
 
 class OllamaBackend(Backend):
+    default_embedding_model = "all-minilm"
+
     def generate_embeddings(
         self, text: str, model_name: str = "all-minilm"
     ) -> list[float]:
         emb = ollama.embeddings(
-            model=model_name or "all-minilm",
+            model=self.get_embedding_model(model_name),
             prompt=text,
         )
         return list(emb["embedding"])
 
+    def generate_embeddings_batch(
+        self, texts: list[str], model_name: str = "all-minilm"
+    ) -> list[list[float]]:
+        if not texts:
+            return []
+
+        response = ollama.embed(
+            model=self.get_embedding_model(model_name),
+            input=texts,
+        )
+        return [list(embedding) for embedding in response["embeddings"]]
+
     def chat_streaming(
         self,
         model: str,
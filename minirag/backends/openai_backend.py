@@ -38,6 +38,8 @@ except ImportError:
 
 
 class OpenAIBackend(Backend):
+    default_embedding_model = "text-embedding-3-small"
+
     def __init__(self) -> None:
         if not _openai_available:
             raise ImportError(
@@ -57,11 +59,23 @@ class OpenAIBackend(Backend):
         self, text: str, model_name: str = "text-embedding-3-small"
     ) -> list[float]:
         response = self.client.embeddings.create(
-            model=model_name or "text-embedding-3-small",
+            model=self.get_embedding_model(model_name),
             input=text,
         )
         return response.data[0].embedding
 
+    def generate_embeddings_batch(
+        self, texts: list[str], model_name: str = "text-embedding-3-small"
+    ) -> list[list[float]]:
+        if not texts:
+            return []
+
+        response = self.client.embeddings.create(
+            model=self.get_embedding_model(model_name),
+            input=texts,
+        )
+        return [item.embedding for item in response.data]
+
     def chat_streaming(
         self,
         model: str,
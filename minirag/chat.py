@@ -1,6 +1,11 @@
 from typing import Generator
 
+import numpy as np
+
+from minirag.indexes.base import normalize_rows
 from minirag.models import ChatSession
+from minirag.models.chat_session import DEFAULT_HISTORY_DECAY
+from minirag.services.rag_service import RagService
 from minirag.utils.backend_manager import get_backend_instance
 
 
@@ -59,3 +64,28 @@ def clear_conversation(session: ChatSession) -> None:
 
 def build_retrieval_query(query: str, session: ChatSession) -> str:
     return session.build_retrieval_query(query)
+
+
+def embed_session_query(query: str, session: ChatSession) -> list[float]:
+    embedding = session.query_embeddings.get(query)
+    if embedding is None:
+        embedding = RagService.embed_query(query)
+        session.query_embeddings[query] = embedding
+    return embedding
+
+
+def build_retrieval_embedding(
+    query: str,
+    session: ChatSession,
+    decay: float = DEFAULT_HISTORY_DECAY,
+) -> list[float]:
+    # Newest first: the query has weight 1, the message before it `decay`,
+    # the one before that `decay ** 2`, and so on.
+    texts = [query, *reversed(session.recent_user_messages())]
+    vectors = normalize_rows(
+        np.array([embed_session_query(text, session) for text in texts])
+    )
+    weights = decay ** np.arange(len(texts), dtype=np.float32)
+    # Only messages still inside the history window can be reused.
+    session.query_embeddings = {text: session.query_embeddings[text] for text in texts}
+    return (weights @ vectors).tolist()
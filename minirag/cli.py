@@ -1,36 +1,80 @@
 import argparse
+import json
 import os
+import re
 import subprocess
 from pathlib import Path
 
 from dotenv import load_dotenv
+from prompt_toolkit.patch_stdout import patch_stdout
 from prompt_toolkit.shortcuts import prompt
 
 from minirag.chat import (
     add_msg_to_memory,
+    build_retrieval_embedding,
     build_retrieval_query,
     chat_streaming,
     clear_conversation,
 )
-from minirag.models import ChatSession, Chunk
+from minirag.models import ChatSession, Chunk, RetrievalFilter, RetrievalOptions
+from minirag.models.chat_session import DEFAULT_HISTORY_DECAY
+from minirag.models.retrieval_options import HISTORY_MODES
 from minirag.services.collection_service import CollectionService
-from minirag.services.rag_service import RagService
+from minirag.services.ingestion_service import DEFAULT_EMBEDDING_CONCURRENCY
+from minirag.services.job_service import IngestionJobQueue
+from minirag.services.rag_service import (
+    DEFAULT_EMBEDDING_BATCH_SIZE,
+    DEFAULT_MMR_CANDIDATES,
+    DEFAULT_TOP_DOCUMENTS,
+    RETRIEVAL_MODES,
+    RagService,
+)
 from minirag.utils.model_utils import handle_model
 from minirag.utils.backend_manager import set_backend
+from minirag.utils.embedding_cache import (
+    DEFAULT_MAX_ENTRIES,
+    EmbeddingCache,
+    set_embedding_cache,
+)
+from minirag.utils.query_cache import (
+    DEFAULT_QUERY_CACHE_SIZE,
+    QueryEmbeddingCache,
+    get_query_cache,
+    set_query_cache,
+)
+from minirag.utils.answer_cache import (
+    DEFAULT_ANSWER_CACHE_SIZE,
+    DEFAULT_ANSWER_CACHE_TTL,
+    DEFAULT_SIMILARITY_THRESHOLD,
+    AnswerCache,
+    get_answer_cache,
+    set_answer_cache,
+)
 from minirag.backends import BACKENDS
+from minirag.indexes import INDEXES
+from minirag.indexes.int8 import SCALE_MODES
 
 collection_service = CollectionService()
+retrieval_options = RetrievalOptions()
+job_queue: IngestionJobQueue | None = None
 DEFAULT_TOP_K = 5
+FILTER_OPTION_PATTERN = re.compile(r"""--(doc|pages)\s+("[^"]*"|'[^']*'|\S+)\s*""")
 
 
 def show_help() -> None:
     print("MiniRAG commands:")
-    print("  /add                         Create a collection from files or folders.")
+    print("  /add                         Create a collection in the background.")
+    print(
+        "  /jobs                        Show background /add jobs and their progress."
+    )
+    print("  /cancel <job_id>             Stop a queued or running /add job.")
+    print("  /update <collection_name>    Re-index new, changed or removed files.")
     print("  /activate <collection_name>  Load a collection for RAG answers.")
     print("  /deactivate                  Unload the active collection.")
     print(
         "  /retrieve <query>            Show retrieved chunks without asking the model."
     )
+    print("           [--doc <name>] [--pages <from-to>] restrict the search first.")
     print("  /list                        Show saved collections.")
     print("  /status                      Show the active collection state.")
     print("  /clear                       Clear conversation history and the terminal.")
@@ -42,6 +86,47 @@ def show_help() -> None:
     print()
     print("Options:")
     print("  --top-k                      Number of chunks to retrieve for RAG.")
+    print(
+        "  --retrieval-mode             dense, lexical (BM25), hybrid or hierarchical."
+    )
+    print("  --top-documents              Documents searched per query (hierarchical).")
+    print("  --retrieval-history          Combine history as text or cached vectors.")
+    print("  --mmr-lambda                 Relevance vs. diversity of retrieved chunks.")
+    print("  --embedding-batch-size       Chunks sent per embedding request on /add.")
+    print(
+        "  --ingest-workers             Processes reading documents in parallel on /add."
+    )
+    print(
+        "  --embedding-concurrency      Embedding requests in flight on parallel /add."
+    )
+    print(
+        "  --pdf-workers                Processes extracting pages of large PDFs on /add."
+    )
+    print(
+        "  --include, --exclude         Glob patterns for files found in folders on /add."
+    )
+    print(
+        "  --max-file-size              Skip larger files (MB) found in folders on /add."
+    )
+    print("  --no-embedding-cache         Disable the on-disk chunk embedding cache.")
+    print("  --no-query-cache             Disable the in-memory query embedding cache.")
+    print("  --answer-cache               Reuse answers to near-identical questions.")
+    print(
+        "  --index                      Index built on /add (see --help for choices)."
+    )
+    print(
+        "  --scan-block-size            Rows scored per block by exact search (flat)."
+    )
+    print("  --nprobe                     Inverted lists scanned per query (ivf).")
+    print("  --ef-search                  Graph candidates explored per query (hnsw).")
+    print("  --rerank-factor              Shortlist size per result reranked (int8).")
+    print(
+        "  --binary-candidates          Hamming candidates rescored per query (binary)."
+    )
+    print("  --shard-size                 Chunks per shard file (sharded).")
+    print(
+        "  --search-workers             Threads searching shards per query (sharded)."
+    )
     print()
 
 
@@ -56,6 +141,33 @@ def normalize_doc_path(doc_path: str) -> str:
     return doc_path
 
 
+def show_retrieve_usage() -> None:
+    print("Usage: /retrieve <query>")
+    print("       /retrieve [--doc <name>] [--pages <from-to>] <query>")
+
+
+def parse_page_range(value: str) -> tuple[int, int]:
+    first_page, _, last_page = value.partition("-")
+    page_range = (int(first_page), int(last_page or first_page))
+    if page_range[0] < 1 or page_range[0] > page_range[1]:
+        raise ValueError(f"Invalid page range: {value}")
+
+    return page_range
+
+
+def parse_retrieval_filter(command_args: str) -> tuple[RetrievalFilter, str]:
+    retrieval_filter = RetrievalFilter()
+    while match := FILTER_OPTION_PATTERN.match(command_args):
+        option, value = match.group(1), normalize_doc_path(match.group(2))
+        if option == "doc":
+            retrieval_filter.documents.append(value)
+        else:
+            retrieval_filter.pages = parse_page_range(value)
+        command_args = command_args[match.end() :]
+
+    return retrieval_filter, command_args
+
+
 def get_user_input() -> str:
     user_query = prompt(
         ">>> ",
@@ -69,7 +181,7 @@ def generate_response(
     model_name: str,
     session: ChatSession,
     context: str | None = None,
-) -> None:
+) -> str:
     model_response = ""
 
     for chunk in chat_streaming(user_query, model_name, context, session):
@@ -78,6 +190,41 @@ def generate_response(
     print()
 
     add_msg_to_memory(session, user_query, model_response)
+    return model_response
+
+
+def generate_cached_response(
+    user_query: str,
+    model_name: str,
+    session: ChatSession,
+    chunks: list[Chunk],
+) -> None:
+    answer_cache = get_answer_cache()
+    collection = collection_service.active_collection
+    context = chunks_to_context(chunks)
+    if answer_cache is None or collection is None:
+        generate_response(user_query, model_name, session, context)
+        return
+
+    # Reuses the embedding from retrieval; lexical retrieval has none, so
+    # only the exact question can hit.
+    query_embedding = RagService.last_query_embedding
+    chunks_key = AnswerCache.hash_chunks(
+        [chunk.chunk_id for chunk in chunks],
+        [chunk.text for chunk in chunks],
+        None if query_embedding is not None else user_query,
+    )
+    cache_args = (collection.name, model_name, chunks_key, query_embedding)
+    cached_answer = answer_cache.get(*cache_args)
+    if cached_answer is not None:
+        session.answer_cache_hits += 1
+        print(cached_answer)
+        add_msg_to_memory(session, user_query, cached_answer)
+        return
+
+    session.answer_cache_misses += 1
+    model_response = generate_response(user_query, model_name, session, context)
+    answer_cache.put(*cache_args, model_response)
 
 
 def chunks_to_context(chunks: list[Chunk]) -> str:
@@ -123,31 +270,129 @@ def get_documents() -> list[str]:
     return doc_paths
 
 
-def show_status() -> None:
+def show_status(session: ChatSession | None = None) -> None:
     if collection_service.active_collection:
         chunk_count = len(collection_service.active_collection)
         print(f"Collection active ({chunk_count} chunks).")
     else:
         print("No collection active.")
 
+    query_cache = get_query_cache()
+    if query_cache is not None:
+        print(
+            f"Query embedding cache: {query_cache.hits} hits, "
+            f"{query_cache.misses} misses "
+            f"({len(query_cache)}/{query_cache.max_entries} entries)."
+        )
+    if session is not None and get_answer_cache() is not None:
+        print(
+            f"Answer cache: {session.answer_cache_hits} hits, "
+            f"{session.answer_cache_misses} misses this session."
+        )
+
+
+def get_job_queue() -> IngestionJobQueue:
+    global job_queue
+    if job_queue is None:
+        job_queue = IngestionJobQueue(collection_service)
+    return job_queue
+
+
+def show_jobs() -> None:
+    jobs = get_job_queue().jobs
+    if not jobs:
+        print("No ingestion jobs.")
+        return
+
+    for job in jobs:
+        line = (
+            f"{job.job_id}  {job.collection_name}  {job.status}  "
+            f"{job.documents_done}/{job.documents_total} documents, "
+            f"{job.chunks_done} chunks"
+        )
+        if job.status == "running":
+            line += (
+                f"  {job.documents_per_second:.2f} docs/s, "
+                f"{job.chunks_per_second:.1f} chunks/s"
+            )
+            if job.eta is not None:
+                line += f", ETA {job.eta:.0f}s"
+        if job.error:
+            line += f"  ({job.error})"
+        print(line)
+
 
 def retrieve_chunks_for_query(
     user_query: str,
     session: ChatSession,
     top_k: int = DEFAULT_TOP_K,
+    retrieval_filter: RetrievalFilter | None = None,
 ) -> list[Chunk]:
     if not collection_service.active_collection:
         print("No collection active. Use /activate <collection_name> first.")
         return []
 
     retrieval_query = build_retrieval_query(user_query, session)
+    query_embedding = None
+    if retrieval_options.history == "vector" and retrieval_options.mode != "lexical":
+        query_embedding = build_retrieval_embedding(
+            user_query, session, retrieval_options.history_decay
+        )
+
     return RagService.retrieve_chunks(
         retrieval_query,
         collection_service.active_collection,
         top_k=top_k,
+        mode=retrieval_options.mode,
+        query_embedding=query_embedding,
+        mmr_lambda=retrieval_options.mmr_lambda,
+        mmr_candidates=retrieval_options.mmr_candidates,
+        retrieval_filter=retrieval_filter,
+        top_documents=retrieval_options.top_documents,
     )
 
 
+def chunk_to_result(chunk: Chunk) -> dict:
+    return {
+        "document_name": chunk.document_name,
+        "chunk_id": chunk.chunk_id,
+        "chunk_index": chunk.chunk_index,
+        "page_number": chunk.page_number,
+        "score": chunk.similarity,
+        "text": chunk.text,
+    }
+
+
+def run_batch_queries(
+    queries_path: str,
+    output_path: str,
+    collection_name: str,
+    top_k: int = DEFAULT_TOP_K,
+) -> None:
+    collection_service.load_collection(collection_name)
+    if not collection_service.active_collection:
+        return
+
+    with open(queries_path) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+
+    retrieved = RagService.retrieve_many(
+        [record["query"] for record in records],
+        collection_service.active_collection,
+        top_k=top_k,
+        mode=retrieval_options.mode,
+        batch_size=collection_service.embedding_batch_size,
+        top_documents=retrieval_options.top_documents,
+    )
+
+    with open(output_path, "w") as f:
+        for record, chunks in zip(records, retrieved):
+            result = {**record, "results": [chunk_to_result(c) for c in chunks]}
+            f.write(json.dumps(result) + "\n")
+
+    print(f"Wrote results for {len(records)} queries to {output_path}")
+
+
 def handle_user_query(
     user_query: str,
     model_name: str,
@@ -168,6 +413,13 @@ def handle_user_query(
         print("Conversation cleared.")
     elif user_query == "/help" or user_query == "/?":
         show_help()
+    elif user_query.startswith("/update"):
+        command_parts = user_query.split(maxsplit=1)
+        if len(command_parts) == 1:
+            print("Usage: /update <collection_name>")
+            return
+
+        collection_service.update_collection(command_parts[1])
     elif user_query.startswith("/activate"):
         command_parts = user_query.split(maxsplit=1)
         if len(command_parts) == 1:
@@ -179,56 +431,92 @@ def handle_user_query(
     elif user_query == "/list":
         collection_service.list_collections()
     elif user_query == "/status":
-        show_status()
+        show_status(session)
     elif user_query == "/deactivate":
         print("Collection deactivated.")
         collection_service.active_collection = None
     elif user_query.startswith("/retrieve"):
         command_parts = user_query.split(maxsplit=1)
         if len(command_parts) == 1:
-            print("Usage: /retrieve <query>")
+            show_retrieve_usage()
             return
 
-        retrieved_chunks = retrieve_chunks_for_query(command_parts[1], session, top_k)
+        try:
+            retrieval_filter, query = parse_retrieval_filter(command_parts[1])
+        except ValueError as e:
+            print(f"{e}. Use --pages <page> or --pages <from-to>.")
+            return
+        if not query:
+            show_retrieve_usage()
+            return
+
+        retrieved_chunks = retrieve_chunks_for_query(
+            query, session, top_k, retrieval_filter
+        )
+        if retrieved_chunks:
+            print(f"Served by: {RagService.last_index_name} index")
         show_retrieved_chunks(retrieved_chunks)
     elif user_query == "/add":
-        collection_name = ""
         documents = get_documents()
-        if documents:
-            collection_name = prompt(
-                "Enter a name   for the collection: ",
-            )
+        if not documents:
+            print("No documents selected.")
+            return
+        # Only a cheap existence check here; the job walks the folders.
+        missing_paths = [path for path in documents if not os.path.exists(path)]
+        if missing_paths:
+            print(f"Path not found: {', '.join(missing_paths)}")
+            return
+
+        collection_name = prompt(
+            "Enter a name   for the collection: ",
+        ).strip()
+        if not collection_name:
+            print("Collection name cannot be empty.")
+            return
 
         print(f"Adding documents to collection: {collection_name}")
         print(f"Docs selected: {documents}")
 
-        collection_service.create_collection(documents, collection_name)
+        job = get_job_queue().submit(documents, collection_name)
+        print(f"Job {job.job_id} queued. Use /jobs to follow its progress.")
+    elif user_query == "/jobs":
+        show_jobs()
+    elif user_query.startswith("/cancel"):
+        command_parts = user_query.split(maxsplit=1)
+        if len(command_parts) == 1:
+            print("Usage: /cancel <job_id>")
+            return
+
+        if get_job_queue().cancel(command_parts[1]):
+            print(f"Job {command_parts[1]} cancelled.")
+        else:
+            print(f"No queued or running job {command_parts[1]}.")
     elif user_query.startswith("/"):
         print(f"Unknown command: {user_query}")
         print("Use /help to see available commands.")
     else:
         if collection_service.active_collection:
             retrieved_chunks = retrieve_chunks_for_query(user_query, session, top_k)
-            context = chunks_to_context(retrieved_chunks)
+            generate_cached_response(user_query, model_name, session, retrieved_chunks)
         else:
-            context = None
-
-        generate_response(user_query, model_name, session, context)
+            generate_response(user_query, model_name, session)
 
 
 def chat_cli(model_name: str, top_k: int = DEFAULT_TOP_K) -> None:
     session = ChatSession()
-    while True:
-        try:
-            user_query = get_user_input()
-            handle_user_query(user_query, model_name, session, top_k)
-
-        except KeyboardInterrupt:
-            # Ctrl-C to stop the model from responding
-            print("\nUse Ctrl + d or /bye to exit.")
-        except EOFError:
-            # Ctrl-D to exit
-            break
+    # Background jobs print above the prompt instead of over it.
+    with patch_stdout():
+        while True:
+            try:
+                user_query = get_user_input()
+                handle_user_query(user_query, model_name, session, top_k)
+
+            except KeyboardInterrupt:
+                # Ctrl-C to stop the model from responding
+                print("\nUse Ctrl + d or /bye to exit.")
+            except EOFError:
+                # Ctrl-D to exit
+                break
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -251,7 +539,233 @@ def parse_arguments() -> argparse.Namespace:
         default=DEFAULT_TOP_K,
         help="Number of chunks to retrieve for RAG.",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--retrieval-mode",
+        type=str,
+        default="dense",
+        choices=list(RETRIEVAL_MODES),
+        help=(
+            "Retrieval mode: dense vectors, lexical BM25, hybrid (fused ranks) or "
+            "hierarchical (closest documents first)."
+        ),
+    )
+    parser.add_argument(
+        "--top-documents",
+        type=parse_positive_int,
+        default=DEFAULT_TOP_DOCUMENTS,
+        help="Documents whose chunks are scored with --retrieval-mode hierarchical.",
+    )
+    parser.add_argument(
+        "--retrieval-history",
+        type=str,
+        default="text",
+        choices=list(HISTORY_MODES),
+        help="Embed recent user messages joined as text, or combine cached vectors.",
+    )
+    parser.add_argument(
+        "--history-decay",
+        type=float,
+        default=DEFAULT_HISTORY_DECAY,
+        help="Weight multiplier per earlier message with --retrieval-history vector.",
+    )
+    parser.add_argument(
+        "--mmr-lambda",
+        type=parse_unit_float,
+        default=None,
+        help="Diversify retrieved chunks with MMR (1 is pure relevance, 0 pure diversity).",
+    )
+    parser.add_argument(
+        "--mmr-candidates",
+        type=parse_positive_int,
+        default=DEFAULT_MMR_CANDIDATES,
+        help="Candidate pool size that MMR selects the top-k chunks from.",
+    )
+    parser.add_argument(
+        "--batch-queries",
+        type=str,
+        default=None,
+        help='Run the JSONL queries in this file (one {"query": ...} per line) and exit.',
+    )
+    parser.add_argument(
+        "--batch-output",
+        type=str,
+        default=None,
+        help="JSONL file where --batch-queries results are written.",
+    )
+    parser.add_argument(
+        "--collection",
+        type=str,
+        default=None,
+        help="Collection searched by --batch-queries.",
+    )
+    parser.add_argument(
+        "--embedding-batch-size",
+        type=parse_positive_int,
+        default=DEFAULT_EMBEDDING_BATCH_SIZE,
+        help="Number of chunks sent per embedding request when creating collections.",
+    )
+    parser.add_argument(
+        "--ingest-workers",
+        type=parse_non_negative_int,
+        default=0,
+        help="Processes used to read documents in parallel (0 reads sequentially).",
+    )
+    parser.add_argument(
+        "--embedding-concurrency",
+        type=parse_positive_int,
+        default=DEFAULT_EMBEDDING_CONCURRENCY,
+        help="Concurrent embedding requests when --ingest-workers is set.",
+    )
+    parser.add_argument(
+        "--pdf-workers",
+        type=parse_non_negative_int,
+        default=0,
+        help="Processes extracting page ranges of large PDFs (0 extracts sequentially).",
+    )
+    parser.add_argument(
+        "--include",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="Only ingest folder files matching this glob (default: .txt and .pdf).",
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="Skip folder files and subfolders matching this glob (repeatable).",
+    )
+    parser.add_argument(
+        "--max-file-size",
+        type=parse_non_negative_int,
+        default=0,
+        help="Skip folder files larger than this many MB (0 disables the limit).",
+    )
+    parser.add_argument(
+        "--no-embedding-cache",
+        action="store_true",
+        help="Do not reuse embeddings cached on disk from previous builds.",
+    )
+    parser.add_argument(
+        "--embedding-cache-size",
+        type=parse_positive_int,
+        default=DEFAULT_MAX_ENTRIES,
+        help="Maximum number of embeddings kept in the on-disk cache.",
+    )
+    parser.add_argument(
+        "--no-query-cache",
+        action="store_true",
+        help="Do not keep query embeddings in memory for repeated queries.",
+    )
+    parser.add_argument(
+        "--query-cache-size",
+        type=parse_positive_int,
+        default=DEFAULT_QUERY_CACHE_SIZE,
+        help="Maximum number of query embeddings kept in memory.",
+    )
+    parser.add_argument(
+        "--answer-cache",
+        action="store_true",
+        help="Reuse cached answers for near-identical questions on the same chunks.",
+    )
+    parser.add_argument(
+        "--answer-cache-threshold",
+        type=float,
+        default=DEFAULT_SIMILARITY_THRESHOLD,
+        help="Minimum query similarity for an answer cache hit.",
+    )
+    parser.add_argument(
+        "--answer-cache-ttl",
+        type=parse_positive_int,
+        default=DEFAULT_ANSWER_CACHE_TTL,
+        help="Seconds a cached answer stays valid (one week by default).",
+    )
+    parser.add_argument(
+        "--answer-cache-size",
+        type=parse_positive_int,
+        default=DEFAULT_ANSWER_CACHE_SIZE,
+        help="Maximum number of cached answers.",
+    )
+    parser.add_argument(
+        "--index",
+        type=str,
+        default="flat",
+        choices=list(INDEXES.keys()),
+        help="Index built for new collections (flat, ivf, hnsw, int8, binary, sharded).",
+    )
+    parser.add_argument(
+        "--scan-block-size",
+        type=parse_non_negative_int,
+        default=None,
+        help="Rows scored per block by exact flat search (0 scores all rows at once).",
+    )
+    parser.add_argument(
+        "--nprobe",
+        type=parse_positive_int,
+        default=None,
+        help="Number of inverted lists scanned per query with the ivf index.",
+    )
+    parser.add_argument(
+        "--ivf-lists",
+        type=parse_positive_int,
+        default=None,
+        help="Number of inverted lists trained for the ivf index (sqrt(N) by default).",
+    )
+    parser.add_argument(
+        "--hnsw-m",
+        type=parse_positive_int,
+        default=None,
+        help="Links per node in the hnsw graph (16 by default).",
+    )
+    parser.add_argument(
+        "--ef-construction",
+        type=parse_positive_int,
+        default=None,
+        help="Candidates explored while inserting into the hnsw graph (100 by default).",
+    )
+    parser.add_argument(
+        "--ef-search",
+        type=parse_positive_int,
+        default=None,
+        help="Candidates explored per query with the hnsw index (64 by default).",
+    )
+    parser.add_argument(
+        "--int8-scale",
+        type=str,
+        default=None,
+        choices=list(SCALE_MODES),
+        help="Quantization scale of the int8 index: per dimension or per vector.",
+    )
+    parser.add_argument(
+        "--rerank-factor",
+        type=parse_positive_int,
+        default=None,
+        help="int8 candidates reranked at full precision per result (4 by default).",
+    )
+    parser.add_argument(
+        "--binary-candidates",
+        type=parse_positive_int,
+        default=None,
+        help="Hamming-nearest candidates rescored with the binary index (256 by default).",
+    )
+    parser.add_argument(
+        "--shard-size",
+        type=parse_positive_int,
+        default=None,
+        help="Chunks per shard file with the sharded index (65536 by default).",
+    )
+    parser.add_argument(
+        "--search-workers",
+        type=parse_non_negative_int,
+        default=None,
+        help="Threads searching shards in parallel (0 uses every CPU core).",
+    )
+    args = parser.parse_args()
+    if args.batch_queries and not (args.batch_output and args.collection):
+        parser.error("--batch-queries requires --batch-output and --collection.")
+
+    return args
 
 
 def parse_positive_int(value: str) -> int:
@@ -262,16 +776,88 @@ def parse_positive_int(value: str) -> int:
     return parsed_value
 
 
+def parse_unit_float(value: str) -> float:
+    parsed_value = float(value)
+    if not 0 <= parsed_value <= 1:
+        raise argparse.ArgumentTypeError("Value must be between 0 and 1.")
+
+    return parsed_value
+
+
+def parse_non_negative_int(value: str) -> int:
+    parsed_value = int(value)
+    if parsed_value < 0:
+        raise argparse.ArgumentTypeError("Value must be 0 or greater.")
+
+    return parsed_value
+
+
 def main() -> None:
     load_dotenv()
     args = parse_arguments()
     model_name = args.model
     backend_name = args.backend
     top_k = args.top_k
+    retrieval_options.mode = args.retrieval_mode
+    retrieval_options.history = args.retrieval_history
+    retrieval_options.history_decay = args.history_decay
+    retrieval_options.mmr_lambda = args.mmr_lambda
+    retrieval_options.mmr_candidates = args.mmr_candidates
+    retrieval_options.top_documents = args.top_documents
+    collection_service.embedding_batch_size = args.embedding_batch_size
+    collection_service.ingest_workers = args.ingest_workers
+    collection_service.embedding_concurrency = args.embedding_concurrency
+    collection_service.pdf_workers = args.pdf_workers
+    collection_service.include_patterns = args.include
+    collection_service.exclude_patterns = args.exclude
+    collection_service.max_file_size = args.max_file_size * 1024 * 1024
+    collection_service.index_type = args.index
+    collection_service.index_params = {
+        param: value
+        for param, value in {
+            "block_size": args.scan_block_size,
+            "nprobe": args.nprobe,
+            "n_lists": args.ivf_lists,
+            "m": args.hnsw_m,
+            "ef_construction": args.ef_construction,
+            "ef_search": args.ef_search,
+            "scale": args.int8_scale,
+            "rerank_factor": args.rerank_factor,
+            "candidates": args.binary_candidates,
+            "shard_size": args.shard_size,
+            "workers": args.search_workers,
+        }.items()
+        if value is not None
+    }
 
     set_backend(backend_name)
+    if not args.no_embedding_cache:
+        set_embedding_cache(
+            EmbeddingCache(
+                str(collection_service.storage_path / ".cache" / "embeddings.sqlite3"),
+                max_entries=args.embedding_cache_size,
+            )
+        )
+
+    if not args.no_query_cache:
+        set_query_cache(QueryEmbeddingCache(max_entries=args.query_cache_size))
+    if args.answer_cache:
+        set_answer_cache(
+            AnswerCache(
+                str(collection_service.storage_path / ".cache" / "answers.sqlite3"),
+                max_entries=args.answer_cache_size,
+                ttl_seconds=args.answer_cache_ttl,
+                similarity_threshold=args.answer_cache_threshold,
+            )
+        )
+
+    if args.batch_queries:
+        run_batch_queries(args.batch_queries, args.batch_output, args.collection, top_k)
+        return
 
     handle_model(model_name)
+    # Jobs left queued or running by the previous session resume here.
+    get_job_queue().start()
     chat_cli(model_name, top_k)
 
 
@@ -0,0 +1,26 @@
+from minirag.indexes.base import Index as Index
+from minirag.indexes.binary import BinaryIndex
+from minirag.indexes.bm25 import BM25Index as BM25Index
+from minirag.indexes.flat import FlatIndex
+from minirag.indexes.hnsw import HNSWIndex
+from minirag.indexes.int8 import Int8Index
+from minirag.indexes.ivf import IVFIndex
+from minirag.indexes.sharded import ShardedIndex
+
+INDEXES: dict[str, type[Index]] = {
+    "flat": FlatIndex,
+    "ivf": IVFIndex,
+    "hnsw": HNSWIndex,
+    "int8": Int8Index,
+    "binary": BinaryIndex,
+    "sharded": ShardedIndex,
+}
+
+
+def get_index_class(index_type: str = "flat") -> type[Index]:
+    index_class = INDEXES.get(index_type)
+    if index_class is None:
+        raise ValueError(
+            f"Unknown index: {index_type}. Available indexes: {', '.join(INDEXES.keys())}"
+        )
+    return index_class
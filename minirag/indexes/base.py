@@ -0,0 +1,136 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, ClassVar
+
+import numpy as np
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.divide(
+        vectors,
+        norms,
+        out=np.zeros_like(vectors),
+        where=norms > 0,
+    )
+
+
+def select_top_k(scores: np.ndarray, top_k: int) -> np.ndarray:
+    if top_k <= 0 or scores.shape[0] == 0:
+        return np.empty(0, dtype=np.int64)
+
+    if top_k < scores.shape[0]:
+        candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+        # Keep every row tied with the k-th score so ties resolve by row order.
+        candidates = np.flatnonzero(scores >= scores[candidates].min())
+    else:
+        candidates = np.arange(scores.shape[0])
+
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order][:top_k]
+
+
+def inverse_row_norms(embeddings: np.ndarray, block_size: int) -> np.ndarray:
+    inverse_norms = np.zeros(embeddings.shape[0], dtype=np.float32)
+    for start in range(0, embeddings.shape[0], block_size):
+        block = np.asarray(embeddings[start : start + block_size], dtype=np.float32)
+        norms = np.sqrt(np.einsum("ij,ij->i", block, block))
+        np.divide(
+            1.0, norms, out=inverse_norms[start : start + len(block)], where=norms > 0
+        )
+    return inverse_norms
+
+
+def scan_top_k(
+    embeddings: np.ndarray,
+    inverse_norms: np.ndarray,
+    query_vectors: np.ndarray,
+    top_k: int,
+    block_size: int,
+) -> list[tuple[np.ndarray, np.ndarray]]:
+    # Walks the rows in fixed-size blocks, so extra memory is one block of
+    # scores plus the running top-k per query instead of a full score array.
+    running = [
+        (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32))
+        for _ in range(query_vectors.shape[0])
+    ]
+    for start in range(0, embeddings.shape[0], block_size):
+        block_scores = embeddings[start : start + block_size] @ query_vectors.T
+        block_scores *= inverse_norms[start : start + block_size, None]
+        for query_number, (rows, scores) in enumerate(running):
+            query_scores = block_scores[:, query_number]
+            block_rows = np.sort(select_top_k(query_scores, top_k))
+            # Candidates stay in row order so ties resolve like a full scan.
+            candidate_rows = np.concatenate([rows, block_rows + start])
+            candidate_scores = np.concatenate([scores, query_scores[block_rows]])
+            keep = np.sort(select_top_k(candidate_scores, top_k))
+            running[query_number] = (candidate_rows[keep], candidate_scores[keep])
+
+    results = []
+    for rows, scores in running:
+        order = select_top_k(scores, top_k)
+        results.append((rows[order], scores[order]))
+    return results
+
+
+def rerank_exact(
+    embeddings: np.ndarray,
+    shortlist: np.ndarray,
+    query_vector: np.ndarray,
+    top_k: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    # Sorted rows keep reads from memory-mapped embeddings sequential.
+    shortlist = np.sort(shortlist)
+    scores = normalize_rows(embeddings[shortlist]) @ query_vector
+    top_rows = select_top_k(scores, top_k)
+    return shortlist[top_rows], scores[top_rows]
+
+
+class Index(ABC):
+    name = ""
+    default_params: ClassVar[dict[str, Any]] = {}
+    supports_incremental_build = False
+
+    @classmethod
+    def filter_params(cls, params: dict[str, Any]) -> dict[str, Any]:
+        return {
+            **cls.default_params,
+            **{
+                key: value for key, value in params.items() if key in cls.default_params
+            },
+        }
+
+    @classmethod
+    @abstractmethod
+    def build(cls, embeddings: np.ndarray, **params: Any) -> "Index":
+        pass
+
+    @classmethod
+    def load(cls, directory: Path, embeddings: np.ndarray, **params: Any) -> "Index":
+        return cls.build(embeddings, **params)
+
+    def save(self, directory: Path) -> None:
+        pass
+
+    @property
+    def params(self) -> dict[str, Any]:
+        return {}
+
+    def rebuild(self, embeddings: np.ndarray) -> "Index":
+        return type(self).build(embeddings, **self.params)
+
+    @abstractmethod
+    def search(
+        self,
+        query_embedding: np.ndarray,
+        top_k: int,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        pass
+
+    def search_many(
+        self,
+        query_embeddings: np.ndarray,
+        top_k: int,
+    ) -> list[tuple[np.ndarray, np.ndarray]]:
+        return [self.search(query, top_k) for query in query_embeddings]
@@ -0,0 +1,250 @@
+import itertools
+import json
+import re
+import tempfile
+from collections import Counter
+from collections.abc import Iterable
+from contextlib import nullcontext
+from pathlib import Path
+
+import numpy as np
+
+from minirag.indexes.base import select_top_k
+
+VOCABULARY_FILE = "bm25_vocabulary.json"
+TERM_OFFSETS_FILE = "bm25_term_offsets.npy"
+POSTING_ROWS_FILE = "bm25_posting_rows.npy"
+POSTING_FREQUENCIES_FILE = "bm25_posting_frequencies.npy"
+ROW_LENGTHS_FILE = "bm25_row_lengths.npy"
+BUILD_BLOCK_SIZE = 4096
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class BM25Index:
+    name = "bm25"
+
+    def __init__(
+        self,
+        vocabulary: dict[str, int],
+        term_offsets: np.ndarray,
+        posting_rows: np.ndarray,
+        posting_frequencies: np.ndarray,
+        row_lengths: np.ndarray,
+        k1: float = 1.5,
+        b: float = 0.75,
+    ) -> None:
+        self.vocabulary = vocabulary
+        self.term_offsets = term_offsets
+        self.posting_rows = posting_rows
+        self.posting_frequencies = posting_frequencies
+        self.row_lengths = row_lengths
+        self.k1 = k1
+        self.b = b
+        self.average_length = float(row_lengths.mean()) if len(row_lengths) else 0.0
+
+    def __len__(self) -> int:
+        return int(self.row_lengths.shape[0])
+
+    @staticmethod
+    def _build_block(
+        texts: list[str], first_row: int, vocabulary: dict[str, int]
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        term_ids: list[int] = []
+        rows: list[int] = []
+        frequencies: list[int] = []
+        row_lengths = np.zeros(len(texts), dtype=np.int32)
+        for row, text in enumerate(texts):
+            tokens = tokenize(text)
+            row_lengths[row] = len(tokens)
+            for term, frequency in Counter(tokens).items():
+                term_ids.append(vocabulary.setdefault(term, len(vocabulary)))
+                rows.append(first_row + row)
+                frequencies.append(frequency)
+
+        return (
+            np.array(term_ids, dtype=np.int64),
+            np.array(rows, dtype=np.int32),
+            np.array(frequencies, dtype=np.float32),
+            row_lengths,
+        )
+
+    @classmethod
+    def build(
+        cls,
+        texts: Iterable[str],
+        directory: Path | None = None,
+        block_size: int = BUILD_BLOCK_SIZE,
+    ) -> "BM25Index":
+        # Postings are collected per block of rows. With a directory, blocks
+        # are spilled to disk and scattered into memory-mapped posting files,
+        # so memory stays at one block plus the vocabulary.
+        vocabulary: dict[str, int] = {}
+        term_counts = np.zeros(0, dtype=np.int64)
+        row_lengths: list[np.ndarray] = []
+        blocks: list[tuple[np.ndarray, np.ndarray, np.ndarray] | Path] = []
+        texts = iter(texts)
+        with (
+            tempfile.TemporaryDirectory(dir=directory)
+            if directory is not None
+            else nullcontext("")
+        ) as spill_dir:
+            first_row = 0
+            while block_texts := list(itertools.islice(texts, block_size)):
+                term_ids, rows, frequencies, lengths = cls._build_block(
+                    block_texts, first_row, vocabulary
+                )
+                first_row += len(block_texts)
+                row_lengths.append(lengths)
+                term_counts = np.pad(
+                    term_counts, (0, len(vocabulary) - len(term_counts))
+                )
+                term_counts += np.bincount(term_ids, minlength=len(vocabulary))
+                if directory is None:
+                    blocks.append((term_ids, rows, frequencies))
+                    continue
+
+                block_path = Path(spill_dir) / f"block_{len(blocks):05d}.npz"
+                np.savez(
+                    block_path, term_ids=term_ids, rows=rows, frequencies=frequencies
+                )
+                blocks.append(block_path)
+
+            term_offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+            np.cumsum(term_counts, out=term_offsets[1:])
+            posting_count = int(term_offsets[-1])
+            if directory is None:
+                posting_rows = np.empty(posting_count, dtype=np.int32)
+                posting_frequencies = np.empty(posting_count, dtype=np.float32)
+            else:
+                posting_rows = np.lib.format.open_memmap(
+                    directory / POSTING_ROWS_FILE,
+                    mode="w+",
+                    dtype=np.int32,
+                    shape=(posting_count,),
+                )
+                posting_frequencies = np.lib.format.open_memmap(
+                    directory / POSTING_FREQUENCIES_FILE,
+                    mode="w+",
+                    dtype=np.float32,
+                    shape=(posting_count,),
+                )
+
+            # Blocks arrive in row order, so filling each term's slice block by
+            # block keeps its postings sorted by row.
+            next_position = term_offsets[:-1].copy()
+            for block in blocks:
+                if isinstance(block, Path):
+                    with np.load(block) as arrays:
+                        term_ids = arrays["term_ids"]
+                        rows = arrays["rows"]
+                        frequencies = arrays["frequencies"]
+                else:
+                    term_ids, rows, frequencies = block
+                order = np.argsort(term_ids, kind="stable")
+                sorted_terms = term_ids[order]
+                block_counts = np.bincount(sorted_terms, minlength=len(vocabulary))
+                block_starts = np.cumsum(block_counts) - block_counts
+                positions = next_position[sorted_terms] + (
+                    np.arange(len(sorted_terms)) - block_starts[sorted_terms]
+                )
+                posting_rows[positions] = rows[order]
+                posting_frequencies[positions] = frequencies[order]
+                next_position += block_counts
+
+        index = cls(
+            vocabulary=vocabulary,
+            term_offsets=term_offsets,
+            posting_rows=posting_rows,
+            posting_frequencies=posting_frequencies,
+            row_lengths=(
+                np.concatenate(row_lengths)
+                if row_lengths
+                else np.zeros(0, dtype=np.int32)
+            ),
+        )
+        if directory is not None:
+            posting_rows.flush()
+            posting_frequencies.flush()
+            index._save_metadata(directory)
+        return index
+
+    def score(self, query: str, rows: np.ndarray | None = None) -> np.ndarray:
+        scores = np.zeros(len(self), dtype=np.float32)
+        allowed = None
+        if rows is not None:
+            allowed = np.zeros(len(self), dtype=bool)
+            allowed[rows] = True
+        for term in set(tokenize(query)):
+            term_id = self.vocabulary.get(term)
+            if term_id is None:
+                continue
+
+            start = int(self.term_offsets[term_id])
+            end = int(self.term_offsets[term_id + 1])
+            document_frequency = end - start
+            posting_rows = np.asarray(self.posting_rows[start:end])
+            frequencies = np.asarray(self.posting_frequencies[start:end])
+            if allowed is not None:
+                # Filtered rows are dropped before their postings are scored.
+                keep = allowed[posting_rows]
+                posting_rows = posting_rows[keep]
+                frequencies = frequencies[keep]
+            idf = np.log(
+                1 + (len(self) - document_frequency + 0.5) / (document_frequency + 0.5)
+            )
+            length_norm = self.k1 * (
+                1
+                - self.b
+                + self.b * self.row_lengths[posting_rows] / self.average_length
+            )
+            scores[posting_rows] += (
+                idf * frequencies * (self.k1 + 1) / (frequencies + length_norm)
+            )
+
+        return scores
+
+    def search(
+        self,
+        query: str,
+        top_k: int,
+        rows: np.ndarray | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        scores = self.score(query, rows)
+        matching_rows = np.flatnonzero(scores > 0)
+        top_rows = matching_rows[select_top_k(scores[matching_rows], top_k)]
+        return top_rows, scores[top_rows]
+
+    def _save_metadata(self, directory: Path) -> None:
+        terms = sorted(self.vocabulary, key=self.vocabulary.__getitem__)
+        with open(directory / VOCABULARY_FILE, "w") as f:
+            json.dump(terms, f)
+        np.save(directory / TERM_OFFSETS_FILE, self.term_offsets)
+        np.save(directory / ROW_LENGTHS_FILE, self.row_lengths)
+
+    def save(self, directory: Path) -> None:
+        self._save_metadata(directory)
+        np.save(directory / POSTING_ROWS_FILE, self.posting_rows)
+        np.save(directory / POSTING_FREQUENCIES_FILE, self.posting_frequencies)
+
+    @classmethod
+    def exists(cls, directory: Path) -> bool:
+        return (directory / VOCABULARY_FILE).exists()
+
+    @classmethod
+    def load(cls, directory: Path) -> "BM25Index":
+        with open(directory / VOCABULARY_FILE) as f:
+            terms = json.load(f)
+
+        return cls(
+            vocabulary={term: term_id for term_id, term in enumerate(terms)},
+            term_offsets=np.load(directory / TERM_OFFSETS_FILE),
+            posting_rows=np.load(directory / POSTING_ROWS_FILE, mmap_mode="r"),
+            posting_frequencies=np.load(
+                directory / POSTING_FREQUENCIES_FILE, mmap_mode="r"
+            ),
+            row_lengths=np.load(directory / ROW_LENGTHS_FILE),
+        )
@@ -0,0 +1,80 @@
+from typing import Any, ClassVar
+
+import numpy as np
+
+from minirag.indexes.base import (
+    Index,
+    inverse_row_norms,
+    normalize_rows,
+    scan_top_k,
+    select_top_k,
+)
+
+# Upper bound on query x chunk scores held in memory at once (64 MiB of float32).
+MAX_BLOCK_SCORES = 1 << 24
+
+
+class FlatIndex(Index):
+    name = "flat"
+    default_params: ClassVar[dict[str, Any]] = {"block_size": 0}
+
+    def __init__(self, embeddings: np.ndarray, block_size: int = 0) -> None:
+        self.block_size = block_size
+        if block_size:
+            # Blocked scans keep the (memory-mapped) rows as they are and only
+            # store one inverse norm per row.
+            self.vectors = embeddings
+            self.inverse_norms = inverse_row_norms(embeddings, block_size)
+        else:
+            self.vectors = normalize_rows(embeddings)
+
+    @classmethod
+    def build(cls, embeddings: np.ndarray, **params: Any) -> "FlatIndex":
+        return cls(embeddings, **cls.filter_params(params))
+
+    def __len__(self) -> int:
+        return int(self.vectors.shape[0])
+
+    @property
+    def params(self) -> dict[str, Any]:
+        return {"block_size": self.block_size}
+
+    def search(
+        self,
+        query_embedding: np.ndarray,
+        top_k: int,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        if len(self) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        if self.block_size:
+            query_vectors = normalize_rows(query_embedding)[None, :]
+            return scan_top_k(
+                self.vectors, self.inverse_norms, query_vectors, top_k, self.block_size
+            )[0]
+
+        scores = self.vectors @ normalize_rows(query_embedding)
+        rows = select_top_k(scores, top_k)
+        return rows, scores[rows]
+
+    def search_many(
+        self,
+        query_embeddings: np.ndarray,
+        top_k: int,
+    ) -> list[tuple[np.ndarray, np.ndarray]]:
+        query_vectors = normalize_rows(query_embeddings)
+        if len(self) == 0:
+            return [self.search(query, top_k) for query in query_vectors]
+        if self.block_size:
+            return scan_top_k(
+                self.vectors, self.inverse_norms, query_vectors, top_k, self.block_size
+            )
+
+        results = []
+        block_size = max(1, MAX_BLOCK_SCORES // len(self))
+        for start in range(0, query_vectors.shape[0], block_size):
+            block_scores = query_vectors[start : start + block_size] @ self.vectors.T
+            for scores in block_scores:
+                rows = select_top_k(scores, top_k)
+                results.append((rows, scores[rows]))
+        return results
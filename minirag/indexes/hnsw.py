@@ -0,0 +1,291 @@
+import heapq
+import math
+from pathlib import Path
+from typing import Any, ClassVar
+
+import numpy as np
+
+from minirag.indexes.base import Index, normalize_rows, select_top_k
+
+VECTORS_FILE = "hnsw_vectors.npy"
+LEVELS_FILE = "hnsw_levels.npy"
+BASE_NEIGHBORS_FILE = "hnsw_base_neighbors.npy"
+UPPER_OFFSETS_FILE = "hnsw_upper_offsets.npy"
+UPPER_NEIGHBORS_FILE = "hnsw_upper_neighbors.npy"
+ENTRY_POINT_FILE = "hnsw_entry_point.npy"
+NO_NEIGHBOR = -1
+
+
+class HNSWIndex(Index):
+    name = "hnsw"
+    default_params: ClassVar[dict[str, Any]] = {
+        "m": 16,
+        "ef_construction": 100,
+        "ef_search": 64,
+        "seed": 0,
+    }
+    supports_incremental_build = True
+
+    def __init__(
+        self,
+        dimension: int,
+        m: int = 16,
+        ef_construction: int = 100,
+        ef_search: int = 64,
+        seed: int = 0,
+    ) -> None:
+        self.m = m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.seed = seed
+        self.level_multiplier = 1 / math.log(max(m, 2))
+        self.count = 0
+        self.entry_point = NO_NEIGHBOR
+        self.max_level = -1
+        self.vectors = np.empty((0, dimension), dtype=np.float32)
+        self.levels = np.empty(0, dtype=np.int8)
+        # Layer 0 keeps 2*m links per node; upper layers keep m links and only
+        # exist for the few nodes promoted above layer 0.
+        self.base_neighbors = np.empty((0, 2 * m), dtype=np.int32)
+        self.upper_neighbors: dict[int, np.ndarray] = {}
+        self._rng = np.random.default_rng(seed)
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def params(self) -> dict[str, Any]:
+        return {
+            "m": self.m,
+            "ef_construction": self.ef_construction,
+            "ef_search": self.ef_search,
+            "seed": self.seed,
+        }
+
+    @classmethod
+    def build(cls, embeddings: np.ndarray, **params: Any) -> "HNSWIndex":
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        dimension = embeddings.shape[1] if embeddings.ndim == 2 else 0
+        index = cls(dimension, **cls.filter_params(params))
+        index.add(embeddings)
+        return index
+
+    def _reserve(self, count: int) -> None:
+        capacity = self.vectors.shape[0]
+        if (
+            count <= capacity
+            and self.vectors.flags.writeable
+            and self.base_neighbors.flags.writeable
+        ):
+            return
+
+        new_capacity = max(count, 2 * capacity, 64)
+        vectors = np.zeros((new_capacity, self.vectors.shape[1]), dtype=np.float32)
+        vectors[: self.count] = self.vectors[: self.count]
+        levels = np.zeros(new_capacity, dtype=np.int8)
+        levels[: self.count] = self.levels[: self.count]
+        base_neighbors = np.full(
+            (new_capacity, 2 * self.m), NO_NEIGHBOR, dtype=np.int32
+        )
+        base_neighbors[: self.count] = self.base_neighbors[: self.count]
+        self.vectors = vectors
+        self.levels = levels
+        self.base_neighbors = base_neighbors
+
+    def _neighbors(self, node: int, layer: int) -> np.ndarray:
+        if layer == 0:
+            links = self.base_neighbors[node]
+        else:
+            links = self.upper_neighbors[node][layer - 1]
+        return links[links != NO_NEIGHBOR]
+
+    def _search_layer(
+        self,
+        query_vector: np.ndarray,
+        entry_points: list[int],
+        ef: int,
+        layer: int,
+        visited: np.ndarray,
+    ) -> list[tuple[float, int]]:
+        visited[entry_points] = True
+        entry_scores = (self.vectors[entry_points] @ query_vector).tolist()
+        candidates = [(-score, node) for score, node in zip(entry_scores, entry_points)]
+        results = [(score, node) for score, node in zip(entry_scores, entry_points)]
+        heapq.heapify(candidates)
+        heapq.heapify(results)
+
+        while candidates:
+            negative_score, node = heapq.heappop(candidates)
+            if len(results) >= ef and -negative_score < results[0][0]:
+                break
+
+            neighbors = self._neighbors(node, layer)
+            neighbors = neighbors[~visited[neighbors]]
+            if neighbors.size == 0:
+                continue
+            visited[neighbors] = True
+
+            scores = self.vectors[neighbors] @ query_vector
+            for score, neighbor in zip(scores.tolist(), neighbors.tolist()):
+                if len(results) < ef or score > results[0][0]:
+                    heapq.heappush(candidates, (-score, neighbor))
+                    heapq.heappush(results, (score, neighbor))
+                    if len(results) > ef:
+                        heapq.heappop(results)
+
+        return sorted(results, reverse=True)
+
+    def _descend(self, query_vector: np.ndarray, target_level: int) -> list[int]:
+        entry_points = [self.entry_point]
+        for layer in range(self.max_level, target_level, -1):
+            visited = np.zeros(self.count, dtype=bool)
+            nearest = self._search_layer(query_vector, entry_points, 1, layer, visited)
+            entry_points = [nearest[0][1]]
+        return entry_points
+
+    def _link(self, node: int, new_neighbor: int, layer: int) -> None:
+        links = (
+            self.base_neighbors[node]
+            if layer == 0
+            else self.upper_neighbors[node][layer - 1]
+        )
+        free_slots = np.flatnonzero(links == NO_NEIGHBOR)
+        if free_slots.size:
+            links[free_slots[0]] = new_neighbor
+            return
+
+        candidates = np.append(links, new_neighbor)
+        scores = self.vectors[candidates] @ self.vectors[node]
+        links[:] = candidates[select_top_k(scores, links.shape[0])]
+
+    def _insert(self, node: int) -> None:
+        level = int(-math.log(1.0 - self._rng.random()) * self.level_multiplier)
+        self.levels[node] = level
+        if level > 0:
+            self.upper_neighbors[node] = np.full(
+                (level, self.m), NO_NEIGHBOR, dtype=np.int32
+            )
+
+        if self.entry_point == NO_NEIGHBOR:
+            self.entry_point = node
+            self.max_level = level
+            return
+
+        query_vector = self.vectors[node]
+        entry_points = self._descend(query_vector, level)
+        for layer in range(min(level, self.max_level), -1, -1):
+            visited = np.zeros(node, dtype=bool)
+            nearest = self._search_layer(
+                query_vector, entry_points, self.ef_construction, layer, visited
+            )
+            selected = [neighbor for _, neighbor in nearest[: self.m]]
+            links = (
+                self.base_neighbors[node]
+                if layer == 0
+                else self.upper_neighbors[node][layer - 1]
+            )
+            links[: len(selected)] = selected
+            for neighbor in selected:
+                self._link(neighbor, node, layer)
+            entry_points = [neighbor for _, neighbor in nearest]
+
+        if level > self.max_level:
+            self.entry_point = node
+            self.max_level = level
+
+    def add(self, embeddings: np.ndarray) -> None:
+        new_vectors = normalize_rows(embeddings)
+        if new_vectors.shape[0] == 0:
+            return
+
+        self._reserve(self.count + new_vectors.shape[0])
+        for vector in new_vectors:
+            node = self.count
+            self.vectors[node] = vector
+            self.count += 1
+            self._insert(node)
+
+    def rebuild(self, embeddings: np.ndarray) -> "HNSWIndex":
+        vectors = normalize_rows(embeddings)
+        if self.count <= vectors.shape[0] and np.allclose(
+            self.vectors[: self.count], vectors[: self.count], atol=1e-6
+        ):
+            # Rows were only appended, so insert them into the existing graph.
+            self.add(vectors[self.count :])
+            return self
+
+        return HNSWIndex.build(vectors, **self.params)
+
+    def search(
+        self,
+        query_embedding: np.ndarray,
+        top_k: int,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        if self.count == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        query_vector = normalize_rows(query_embedding)
+        entry_points = self._descend(query_vector, 0)
+        nearest = self._search_layer(
+            query_vector,
+            entry_points,
+            max(self.ef_search, top_k),
+            0,
+            np.zeros(self.count, dtype=bool),
+        )
+
+        # Order by row first so ties resolve like the flat index.
+        nearest.sort(key=lambda item: item[1])
+        rows = np.array([node for _, node in nearest], dtype=np.int64)
+        scores = np.array([score for score, _ in nearest], dtype=np.float32)
+        top_rows = select_top_k(scores, top_k)
+        return rows[top_rows], scores[top_rows]
+
+    def save(self, directory: Path) -> None:
+        upper_offsets = np.zeros(self.count + 1, dtype=np.int64)
+        np.cumsum(self.levels[: self.count], out=upper_offsets[1:])
+        upper_neighbors = [
+            self.upper_neighbors[node]
+            for node in range(self.count)
+            if node in self.upper_neighbors
+        ]
+
+        np.save(directory / VECTORS_FILE, self.vectors[: self.count])
+        np.save(directory / LEVELS_FILE, self.levels[: self.count])
+        np.save(directory / BASE_NEIGHBORS_FILE, self.base_neighbors[: self.count])
+        np.save(directory / UPPER_OFFSETS_FILE, upper_offsets)
+        np.save(
+            directory / UPPER_NEIGHBORS_FILE,
+            np.concatenate(upper_neighbors)
+            if upper_neighbors
+            else np.empty((0, self.m), dtype=np.int32),
+        )
+        np.save(
+            directory / ENTRY_POINT_FILE,
+            np.array([self.entry_point, self.max_level], dtype=np.int64),
+        )
+
+    @classmethod
+    def load(
+        cls, directory: Path, embeddings: np.ndarray, **params: Any
+    ) -> "HNSWIndex":
+        vectors = np.load(directory / VECTORS_FILE, mmap_mode="r")
+        index = cls(vectors.shape[1], **cls.filter_params(params))
+        index.vectors = vectors
+        index.levels = np.load(directory / LEVELS_FILE)
+        index.base_neighbors = np.load(directory / BASE_NEIGHBORS_FILE, mmap_mode="r")
+        index.count = int(vectors.shape[0])
+
+        upper_offsets = np.load(directory / UPPER_OFFSETS_FILE)
+        upper_neighbors = np.load(directory / UPPER_NEIGHBORS_FILE)
+        for node in np.flatnonzero(index.levels):
+            index.upper_neighbors[int(node)] = upper_neighbors[
+                upper_offsets[node] : upper_offsets[node + 1]
+            ]
+
+        index.entry_point, index.max_level = (
+            int(value) for value in np.load(directory / ENTRY_POINT_FILE)
+        )
+        # Continue the level sequence so reloaded indexes stay reproducible.
+        index._rng = np.random.default_rng([index.seed, index.count])
+        return index
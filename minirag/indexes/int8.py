@@ -0,0 +1,120 @@
+from pathlib import Path
+from typing import Any, ClassVar
+
+import numpy as np
+
+from minirag.indexes.base import Index, normalize_rows, rerank_exact, select_top_k
+
+CODES_FILE = "int8_codes.npy"
+SCALES_FILE = "int8_scales.npy"
+SCALE_MODES = ("dimension", "vector")
+SCAN_BLOCK_SIZE = 4096
+INT8_MAX = 127
+
+
+def quantize_int8(
+    vectors: np.ndarray, scale: str = "dimension"
+) -> tuple[np.ndarray, np.ndarray]:
+    if scale not in SCALE_MODES:
+        raise ValueError(
+            f"Unknown int8 scale: {scale}. Available scales: {', '.join(SCALE_MODES)}"
+        )
+
+    # Scales are kept 2-D, (1, dimension) or (rows, 1), so they broadcast
+    # against the codes and the mode can be told apart after loading.
+    axis = 0 if scale == "dimension" else 1
+    if vectors.size:
+        scales = np.abs(vectors).max(axis=axis, keepdims=True) / INT8_MAX
+    else:
+        shape = (1, vectors.shape[1]) if scale == "dimension" else (len(vectors), 1)
+        scales = np.ones(shape, dtype=np.float32)
+    scales = np.where(scales > 0, scales, 1.0).astype(np.float32)
+    codes = np.clip(np.rint(vectors / scales), -INT8_MAX, INT8_MAX)
+    return codes.astype(np.int8), scales
+
+
+class Int8Index(Index):
+    name = "int8"
+    default_params: ClassVar[dict[str, Any]] = {
+        "scale": "dimension",
+        "rerank_factor": 4,
+    }
+
+    def __init__(
+        self,
+        codes: np.ndarray,
+        scales: np.ndarray,
+        embeddings: np.ndarray | None = None,
+        scale: str = "dimension",
+        rerank_factor: int = 4,
+    ) -> None:
+        self.codes = codes
+        self.scales = scales
+        # Full-precision vectors (the collection's memory-mapped embeddings)
+        # are only read for the shortlist that gets reranked.
+        self.embeddings = embeddings
+        self.scale = scale
+        self.rerank_factor = rerank_factor
+
+    def __len__(self) -> int:
+        return int(self.codes.shape[0])
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.codes.nbytes + self.scales.nbytes)
+
+    @property
+    def params(self) -> dict[str, Any]:
+        return {"scale": self.scale, "rerank_factor": self.rerank_factor}
+
+    @classmethod
+    def build(cls, embeddings: np.ndarray, **params: Any) -> "Int8Index":
+        params = cls.filter_params(params)
+        codes, scales = quantize_int8(normalize_rows(embeddings), params["scale"])
+        return cls(codes, scales, embeddings, **params)
+
+    def approximate_scores(self, query_vector: np.ndarray) -> np.ndarray:
+        scores = np.empty(len(self), dtype=np.float32)
+        if self.scale == "dimension":
+            scaled_query = query_vector * self.scales[0]
+        for start in range(0, len(self), SCAN_BLOCK_SIZE):
+            block = self.codes[start : start + SCAN_BLOCK_SIZE].astype(np.float32)
+            if self.scale == "dimension":
+                scores[start : start + len(block)] = block @ scaled_query
+            else:
+                scores[start : start + len(block)] = (block @ query_vector) * (
+                    self.scales[start : start + len(block), 0]
+                )
+        return scores
+
+    def search(
+        self,
+        query_embedding: np.ndarray,
+        top_k: int,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        if len(self) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        query_vector = normalize_rows(query_embedding)
+        scores = self.approximate_scores(query_vector)
+        if self.embeddings is None:
+            rows = select_top_k(scores, top_k)
+            return rows, scores[rows]
+
+        shortlist = select_top_k(scores, top_k * self.rerank_factor)
+        return rerank_exact(self.embeddings, shortlist, query_vector, top_k)
+
+    def save(self, directory: Path) -> None:
+        np.save(directory / CODES_FILE, self.codes)
+        np.save(directory / SCALES_FILE, self.scales)
+
+    @classmethod
+    def load(
+        cls, directory: Path, embeddings: np.ndarray, **params: Any
+    ) -> "Int8Index":
+        codes = np.load(directory / CODES_FILE)
+        scales = np.load(directory / SCALES_FILE)
+        params = cls.filter_params(params)
+        # The stored codes fix the scale mode; only the rerank depth is tunable.
+        params["scale"] = "dimension" if scales.shape[1] == codes.shape[1] else "vector"
+        return cls(codes, scales, embeddings, **params)
@@ -0,0 +1,218 @@
+from pathlib import Path
+from typing import Any, ClassVar
+
+import numpy as np
+
+from minirag.indexes.base import Index, normalize_rows, select_top_k
+
+CENTROIDS_FILE = "ivf_centroids.npy"
+LIST_OFFSETS_FILE = "ivf_list_offsets.npy"
+LIST_IDS_FILE = "ivf_list_ids.npy"
+VECTORS_FILE = "ivf_vectors.npy"
+ASSIGN_BLOCK_SIZE = 4096
+
+
+def assign_to_centroids(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    labels = np.empty(vectors.shape[0], dtype=np.int64)
+    for start in range(0, vectors.shape[0], ASSIGN_BLOCK_SIZE):
+        block = vectors[start : start + ASSIGN_BLOCK_SIZE]
+        labels[start : start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return labels
+
+
+def train_centroids(
+    vectors: np.ndarray,
+    n_lists: int,
+    n_iter: int = 20,
+    sample_size: int = 100_000,
+    seed: int = 0,
+) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    if vectors.shape[0] > sample_size:
+        vectors = vectors[np.sort(rng.choice(vectors.shape[0], sample_size, False))]
+
+    centroids = vectors[rng.choice(vectors.shape[0], n_lists, replace=False)].copy()
+    for _ in range(n_iter):
+        labels = assign_to_centroids(vectors, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, vectors)
+        empty_lists = np.bincount(labels, minlength=n_lists) == 0
+        if empty_lists.any():
+            sums[empty_lists] = vectors[
+                rng.choice(vectors.shape[0], int(empty_lists.sum()))
+            ]
+        centroids = normalize_rows(sums)
+
+    return centroids
+
+
+class IVFIndex(Index):
+    name = "ivf"
+    default_params: ClassVar[dict[str, Any]] = {
+        "n_lists": 0,
+        "nprobe": 8,
+        "n_iter": 20,
+        "seed": 0,
+    }
+
+    def __init__(
+        self,
+        centroids: np.ndarray,
+        list_offsets: np.ndarray,
+        list_ids: np.ndarray,
+        vectors: np.ndarray,
+        nprobe: int = 8,
+        n_iter: int = 20,
+        seed: int = 0,
+    ) -> None:
+        self.centroids = centroids
+        self.list_offsets = list_offsets
+        self.list_ids = list_ids
+        self.vectors = vectors
+        self.nprobe = nprobe
+        self.n_iter = n_iter
+        self.seed = seed
+
+    def __len__(self) -> int:
+        return int(self.list_ids.shape[0])
+
+    @property
+    def n_lists(self) -> int:
+        return int(self.centroids.shape[0])
+
+    @property
+    def params(self) -> dict[str, Any]:
+        return {
+            "n_lists": self.n_lists,
+            "nprobe": self.nprobe,
+            "n_iter": self.n_iter,
+            "seed": self.seed,
+        }
+
+    @classmethod
+    def from_centroids(
+        cls,
+        centroids: np.ndarray,
+        dimension: int,
+        **params: Any,
+    ) -> "IVFIndex":
+        return cls(
+            centroids=np.asarray(centroids, dtype=np.float32),
+            list_offsets=np.zeros(centroids.shape[0] + 1, dtype=np.int64),
+            list_ids=np.empty(0, dtype=np.int64),
+            vectors=np.empty((0, dimension), dtype=np.float32),
+            nprobe=params.get("nprobe", 8),
+            n_iter=params.get("n_iter", 20),
+            seed=params.get("seed", 0),
+        )
+
+    @classmethod
+    def build(cls, embeddings: np.ndarray, **params: Any) -> "IVFIndex":
+        params = cls.filter_params(params)
+        vectors = normalize_rows(embeddings)
+        dimension = vectors.shape[1] if vectors.ndim == 2 else 0
+        n_lists = params["n_lists"] or int(np.sqrt(vectors.shape[0]))
+        n_lists = max(1, min(n_lists, vectors.shape[0])) if len(vectors) else 0
+
+        centroids = np.empty((0, dimension), dtype=np.float32)
+        if n_lists:
+            centroids = train_centroids(
+                vectors,
+                n_lists,
+                n_iter=params["n_iter"],
+                seed=params["seed"],
+            )
+
+        index = cls.from_centroids(centroids, dimension, **params)
+        index.add(vectors)
+        return index
+
+    def rebuild(self, embeddings: np.ndarray) -> "IVFIndex":
+        if self.n_lists == 0:
+            return IVFIndex.build(embeddings, **self.params)
+
+        index = IVFIndex.from_centroids(
+            self.centroids,
+            self.centroids.shape[1],
+            **self.params,
+        )
+        index.add(embeddings)
+        return index
+
+    def add(self, embeddings: np.ndarray) -> None:
+        new_vectors = normalize_rows(embeddings)
+        if new_vectors.shape[0] == 0:
+            return
+
+        list_sizes = np.diff(self.list_offsets)
+        labels = np.concatenate(
+            [
+                np.repeat(np.arange(self.n_lists), list_sizes),
+                assign_to_centroids(new_vectors, self.centroids),
+            ]
+        )
+        ids = np.concatenate(
+            [
+                np.asarray(self.list_ids),
+                np.arange(len(self), len(self) + new_vectors.shape[0]),
+            ]
+        )
+        vectors = np.concatenate([np.asarray(self.vectors), new_vectors])
+
+        order = np.argsort(labels, kind="stable")
+        self.list_ids = ids[order]
+        self.vectors = vectors[order]
+        self.list_offsets = np.zeros(self.n_lists + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(labels, minlength=self.n_lists), out=self.list_offsets[1:]
+        )
+
+    def search(
+        self,
+        query_embedding: np.ndarray,
+        top_k: int,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        if len(self) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        query_vector = normalize_rows(query_embedding)
+        probed_lists = select_top_k(self.centroids @ query_vector, self.nprobe)
+        candidate_slices = [
+            slice(int(self.list_offsets[list_id]), int(self.list_offsets[list_id + 1]))
+            for list_id in np.sort(probed_lists)
+        ]
+        candidate_ids = np.concatenate(
+            [self.list_ids[candidate_slice] for candidate_slice in candidate_slices]
+        )
+        scores = np.concatenate(
+            [
+                self.vectors[candidate_slice] @ query_vector
+                for candidate_slice in candidate_slices
+            ]
+        )
+
+        # Order candidates by row so ties resolve like the flat index.
+        row_order = np.argsort(candidate_ids, kind="stable")
+        candidate_ids = candidate_ids[row_order]
+        scores = scores[row_order]
+        top_candidates = select_top_k(scores, top_k)
+        return candidate_ids[top_candidates], scores[top_candidates]
+
+    def save(self, directory: Path) -> None:
+        np.save(directory / CENTROIDS_FILE, self.centroids)
+        np.save(directory / LIST_OFFSETS_FILE, self.list_offsets)
+        np.save(directory / LIST_IDS_FILE, self.list_ids)
+        np.save(directory / VECTORS_FILE, self.vectors)
+
+    @classmethod
+    def load(cls, directory: Path, embeddings: np.ndarray, **params: Any) -> "IVFIndex":
+        params = cls.filter_params(params)
+        return cls(
+            centroids=np.load(directory / CENTROIDS_FILE),
+            list_offsets=np.load(directory / LIST_OFFSETS_FILE),
+            list_ids=np.load(directory / LIST_IDS_FILE, mmap_mode="r"),
+            vectors=np.load(directory / VECTORS_FILE, mmap_mode="r"),
+            nprobe=params["nprobe"],
+            n_iter=params["n_iter"],
+            seed=params["seed"],
+        )
@@ -0,0 +1,131 @@
+import heapq
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, ClassVar
+
+import numpy as np
+
+from minirag.indexes.base import Index, normalize_rows, select_top_k
+
+SHARD_FILE = "shard_{:05d}.npy"
+SHARDS_DIR = "shards"
+
+
+class ShardedIndex(Index):
+    name = "sharded"
+    default_params: ClassVar[dict[str, Any]] = {"shard_size": 65536, "workers": 0}
+
+    def __init__(
+        self,
+        shards: list[np.ndarray | Path],
+        shard_size: int = 65536,
+        workers: int = 0,
+    ) -> None:
+        # Entries are arrays or paths; paths are memory-mapped on first use.
+        self.shards = shards
+        self.shard_size = shard_size
+        self.workers = workers
+        self._executor: ThreadPoolExecutor | None = None
+        # Shards still holding raw embedding rows; normalized on first use.
+        self._unnormalized: set[int] = set()
+
+    def __len__(self) -> int:
+        return sum(
+            self._shard(shard_id).shape[0] for shard_id in range(len(self.shards))
+        )
+
+    @property
+    def params(self) -> dict[str, Any]:
+        return {"shard_size": self.shard_size, "workers": self.workers}
+
+    @classmethod
+    def build(cls, embeddings: np.ndarray, **params: Any) -> "ShardedIndex":
+        params = cls.filter_params(params)
+        # Shards start as slices of the (memory-mapped) embeddings, so building
+        # and saving hold one normalized shard in memory at a time.
+        index = cls(
+            [
+                embeddings[start : start + params["shard_size"]]
+                for start in range(0, embeddings.shape[0], params["shard_size"])
+            ],
+            **params,
+        )
+        index._unnormalized = set(range(len(index.shards)))
+        return index
+
+    def _read_shard(self, shard_id: int) -> np.ndarray:
+        shard = self.shards[shard_id]
+        if isinstance(shard, Path):
+            return np.load(shard, mmap_mode="r")
+        if shard_id in self._unnormalized:
+            return normalize_rows(shard)
+        return shard
+
+    def _shard(self, shard_id: int) -> np.ndarray:
+        shard = self._read_shard(shard_id)
+        self.shards[shard_id] = shard
+        self._unnormalized.discard(shard_id)
+        return shard
+
+    def _search_shard(
+        self,
+        shard_id: int,
+        query_vector: np.ndarray,
+        top_k: int,
+    ) -> list[tuple[float, int]]:
+        scores = self._shard(shard_id) @ query_vector
+        rows = select_top_k(scores, top_k)
+        offset = shard_id * self.shard_size
+        return list(zip((-scores[rows]).tolist(), (rows + offset).tolist()))
+
+    def _map_shards(self, query_vector: np.ndarray, top_k: int):
+        if len(self.shards) == 1:
+            return [self._search_shard(0, query_vector, top_k)]
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers or os.cpu_count()
+            )
+        # NumPy releases the GIL inside the matmul, so shards score in parallel.
+        return self._executor.map(
+            lambda shard_id: self._search_shard(shard_id, query_vector, top_k),
+            range(len(self.shards)),
+        )
+
+    def search(
+        self,
+        query_embedding: np.ndarray,
+        top_k: int,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        if not self.shards or top_k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        query_vector = normalize_rows(query_embedding)
+        # Each shard result is sorted by (-score, row), so a heap merge keeps
+        # the flat index's tie order.
+        merged = list(heapq.merge(*self._map_shards(query_vector, top_k)))[:top_k]
+        rows = np.array([row for _, row in merged], dtype=np.int64)
+        scores = np.array([-score for score, _ in merged], dtype=np.float32)
+        return rows, scores
+
+    def save(self, directory: Path) -> None:
+        shards_dir = directory / SHARDS_DIR
+        shards_dir.mkdir(exist_ok=True)
+        for shard_id in range(len(self.shards)):
+            np.save(
+                shards_dir / SHARD_FILE.format(shard_id), self._read_shard(shard_id)
+            )
+
+    @classmethod
+    def load(
+        cls, directory: Path, embeddings: np.ndarray, **params: Any
+    ) -> "ShardedIndex":
+        params = cls.filter_params(params)
+        shard_paths = sorted((directory / SHARDS_DIR).glob("shard_*.npy"))
+        if not shard_paths:
+            return cls.build(embeddings, **params)
+        if len(shard_paths) > 1:
+            # Row offsets depend on the size the shards were written with.
+            params["shard_size"] = np.load(shard_paths[0], mmap_mode="r").shape[0]
+        return cls(shard_paths, **params)
@@ -1,3 +1,7 @@
 from .chat_session import ChatSession as ChatSession
 from .chat_session import SYS_PROMPT as SYS_PROMPT
 from .chunk import Chunk as Chunk
+from .collection import Collection as Collection
+from .ingestion_job import IngestionJob as IngestionJob
+from .retrieval_filter import RetrievalFilter as RetrievalFilter
+from .retrieval_options import RetrievalOptions as RetrievalOptions
@@ -10,6 +10,7 @@ SYS_PROMPT = (
     "organizer."
 )
 RETRIEVAL_HISTORY_LIMIT = 3
+DEFAULT_HISTORY_DECAY = 0.5
 
 
 def build_initial_messages() -> list[dict[str, str]]:
@@ -21,6 +22,10 @@ def build_initial_messages() -> list[dict[str, str]]:
 @dataclass
 class ChatSession:
     messages: list[dict[str, str]] = field(default_factory=build_initial_messages)
+    # Embedding of each user message, computed once and reused on later turns.
+    query_embeddings: dict[str, list[float]] = field(default_factory=dict)
+    answer_cache_hits: int = 0
+    answer_cache_misses: int = 0
 
     def add_exchange(self, user_query: str, model_response: str) -> None:
         self.messages.extend(
@@ -32,12 +37,16 @@ class ChatSession:
 
     def clear(self) -> None:
         self.messages = build_initial_messages()
+        self.query_embeddings = {}
 
-    def build_retrieval_query(self, query: str) -> str:
-        previous_user_messages = [
+    def recent_user_messages(self) -> list[str]:
+        return [
             message["content"] for message in self.messages if message["role"] == "user"
         ][-RETRIEVAL_HISTORY_LIMIT:]
 
+    def build_retrieval_query(self, query: str) -> str:
+        previous_user_messages = self.recent_user_messages()
+
         if not previous_user_messages:
             return query
 
@@ -1,6 +1,17 @@
 from dataclasses import dataclass
 
 
+def build_chunk_id(
+    document_name: str,
+    chunk_index: int,
+    page_number: int | None = None,
+) -> str:
+    if page_number is None:
+        return f"{document_name}#chunk-{chunk_index}"
+
+    return f"{document_name}#page-{page_number}-chunk-{chunk_index}"
+
+
 @dataclass
 class Chunk:
     document_name: str
@@ -0,0 +1,319 @@
+import json
+import os
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from minirag.indexes.base import Index, normalize_rows
+from minirag.indexes.bm25 import BM25Index
+from minirag.models.chunk import Chunk, build_chunk_id
+from minirag.models.retrieval_filter import RetrievalFilter
+
+FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+EMBEDDINGS_FILE = "embeddings.npy"
+DOCUMENT_IDS_FILE = "document_ids.npy"
+CHUNK_INDICES_FILE = "chunk_indices.npy"
+PAGE_NUMBERS_FILE = "page_numbers.npy"
+TEXT_OFFSETS_FILE = "text_offsets.npy"
+TEXT_DATA_FILE = "text_data.npy"
+DOCUMENT_CENTROIDS_FILE = "document_centroids.npy"
+CENTROID_BLOCK_SIZE = 4096
+TEXT_BLOCK_SIZE = 4096
+NO_PAGE = -1
+
+
+@dataclass(eq=False)
+class Collection(Sequence[Chunk]):
+    documents: list[str]
+    embeddings: np.ndarray
+    document_ids: np.ndarray
+    chunk_indices: np.ndarray
+    page_numbers: np.ndarray
+    text_offsets: np.ndarray
+    text_data: np.ndarray
+    name: str = ""
+    path: Path | None = None
+    manifest: dict = field(default_factory=dict)
+    index: Index | None = field(default=None, repr=False)
+    lexical_index: BM25Index | None = field(default=None, repr=False)
+    document_centroids: np.ndarray | None = field(default=None, repr=False)
+    # Rows grouped by document (CSR offsets and rows), built on first filter.
+    _document_rows: tuple[np.ndarray, np.ndarray] | None = field(
+        default=None, init=False, repr=False
+    )
+
+    def __len__(self) -> int:
+        return int(self.document_ids.shape[0])
+
+    def __getitem__(self, index: int) -> Chunk:  # type: ignore[override]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Collection index out of range")
+
+        return self.get_chunk(index)
+
+    @property
+    def dimension(self) -> int:
+        return int(self.embeddings.shape[1]) if self.embeddings.ndim == 2 else 0
+
+    def get_text(self, index: int) -> str:
+        start = int(self.text_offsets[index])
+        end = int(self.text_offsets[index + 1])
+        return bytes(self.text_data[start:end]).decode("utf-8")
+
+    def get_texts(self) -> list[str]:
+        return [self.get_text(index) for index in range(len(self))]
+
+    def iter_texts(self, block_size: int = TEXT_BLOCK_SIZE) -> Iterator[str]:
+        # Reads offsets and text bytes one block of rows at a time, so
+        # memory-mapped columns are never loaded whole.
+        for start in range(0, len(self), block_size):
+            offsets = np.asarray(self.text_offsets[start : start + block_size + 1])
+            text_data = bytes(self.text_data[offsets[0] : offsets[-1]])
+            offsets = offsets - offsets[0]
+            for row in range(len(offsets) - 1):
+                yield text_data[offsets[row] : offsets[row + 1]].decode("utf-8")
+
+    def get_page_number(self, index: int) -> int | None:
+        page_number = int(self.page_numbers[index])
+        return None if page_number == NO_PAGE else page_number
+
+    def get_document_name(self, index: int) -> str:
+        return self.documents[int(self.document_ids[index])]
+
+    def get_document_rows(self, document_id: int) -> np.ndarray:
+        if self._document_rows is None:
+            document_ids = np.asarray(self.document_ids)
+            offsets = np.zeros(len(self.documents) + 1, dtype=np.int64)
+            np.cumsum(
+                np.bincount(document_ids, minlength=len(self.documents)),
+                out=offsets[1:],
+            )
+            self._document_rows = (offsets, np.argsort(document_ids, kind="stable"))
+
+        offsets, rows = self._document_rows
+        return rows[offsets[document_id] : offsets[document_id + 1]]
+
+    def get_document_centroids(self) -> np.ndarray:
+        if self.document_centroids is None:
+            # Mean of each document's unit-normalized chunk embeddings.
+            sums = np.zeros((len(self.documents), self.dimension), dtype=np.float32)
+            for start in range(0, len(self), CENTROID_BLOCK_SIZE):
+                np.add.at(
+                    sums,
+                    np.asarray(self.document_ids[start : start + CENTROID_BLOCK_SIZE]),
+                    normalize_rows(
+                        self.embeddings[start : start + CENTROID_BLOCK_SIZE]
+                    ),
+                )
+            self.document_centroids = normalize_rows(sums)
+
+        return self.document_centroids
+
+    def filter_rows(self, retrieval_filter: RetrievalFilter) -> np.ndarray:
+        if retrieval_filter.documents:
+            rows = np.concatenate(
+                [
+                    self.get_document_rows(document_id)
+                    for document_id, document_name in enumerate(self.documents)
+                    if retrieval_filter.matches_document(document_name)
+                ]
+                or [np.empty(0, dtype=np.int64)]
+            )
+            rows.sort()
+        else:
+            rows = np.arange(len(self), dtype=np.int64)
+
+        if retrieval_filter.pages is not None:
+            first_page, last_page = retrieval_filter.pages
+            page_numbers = np.asarray(self.page_numbers)[rows]
+            rows = rows[(page_numbers >= first_page) & (page_numbers <= last_page)]
+
+        return rows
+
+    def get_chunk(self, index: int) -> Chunk:
+        document_name = self.get_document_name(index)
+        chunk_index = int(self.chunk_indices[index])
+        page_number = self.get_page_number(index)
+        return Chunk(
+            document_name=document_name,
+            text=self.get_text(index),
+            embedding=self.embeddings[index].tolist(),
+            chunk_id=build_chunk_id(document_name, chunk_index, page_number),
+            chunk_index=chunk_index,
+            page_number=page_number,
+        )
+
+    @classmethod
+    def from_chunks(cls, chunks: list[Chunk], name: str = "") -> "Collection":
+        documents: list[str] = []
+        document_lookup: dict[str, int] = {}
+        document_ids = np.empty(len(chunks), dtype=np.int32)
+        chunk_indices = np.empty(len(chunks), dtype=np.int32)
+        page_numbers = np.empty(len(chunks), dtype=np.int32)
+        text_offsets = np.zeros(len(chunks) + 1, dtype=np.int64)
+        encoded_texts = []
+
+        for row, chunk in enumerate(chunks):
+            if chunk.document_name not in document_lookup:
+                document_lookup[chunk.document_name] = len(documents)
+                documents.append(chunk.document_name)
+            document_ids[row] = document_lookup[chunk.document_name]
+            chunk_indices[row] = chunk.chunk_index
+            page_numbers[row] = (
+                NO_PAGE if chunk.page_number is None else chunk.page_number
+            )
+            encoded_text = chunk.text.encode("utf-8")
+            encoded_texts.append(encoded_text)
+            text_offsets[row + 1] = text_offsets[row] + len(encoded_text)
+
+        if chunks:
+            embeddings = np.asarray(
+                [chunk.embedding for chunk in chunks], dtype=np.float32
+            )
+        else:
+            embeddings = np.zeros((0, 0), dtype=np.float32)
+
+        return cls(
+            documents=documents,
+            embeddings=embeddings,
+            document_ids=document_ids,
+            chunk_indices=chunk_indices,
+            page_numbers=page_numbers,
+            text_offsets=text_offsets,
+            text_data=np.frombuffer(b"".join(encoded_texts), dtype=np.uint8),
+            name=name,
+        )
+
+    def take(self, rows: np.ndarray) -> "Collection":
+        rows = np.asarray(rows, dtype=np.int64)
+        used_documents, document_ids = np.unique(
+            np.asarray(self.document_ids)[rows], return_inverse=True
+        )
+        starts = np.asarray(self.text_offsets)[rows]
+        lengths = np.asarray(self.text_offsets)[rows + 1] - starts
+        text_offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=text_offsets[1:])
+        text_positions = np.repeat(starts - text_offsets[:-1], lengths) + np.arange(
+            text_offsets[-1]
+        )
+
+        return Collection(
+            documents=[self.documents[int(doc_id)] for doc_id in used_documents],
+            embeddings=np.asarray(self.embeddings)[rows]
+            if len(rows)
+            else np.zeros((0, self.dimension), dtype=np.float32),
+            document_ids=document_ids.astype(np.int32),
+            chunk_indices=np.asarray(self.chunk_indices)[rows],
+            page_numbers=np.asarray(self.page_numbers)[rows],
+            text_offsets=text_offsets,
+            text_data=np.asarray(self.text_data)[text_positions],
+            name=self.name,
+            manifest=dict(self.manifest),
+        )
+
+    @classmethod
+    def concatenate(cls, collections: list["Collection"]) -> "Collection":
+        documents: list[str] = []
+        document_lookup: dict[str, int] = {}
+        document_ids = []
+        text_offsets = [np.zeros(1, dtype=np.int64)]
+        text_size = 0
+
+        for collection in collections:
+            remap = np.empty(len(collection.documents), dtype=np.int32)
+            for doc_id, document_name in enumerate(collection.documents):
+                if document_name not in document_lookup:
+                    document_lookup[document_name] = len(documents)
+                    documents.append(document_name)
+                remap[doc_id] = document_lookup[document_name]
+            document_ids.append(remap[np.asarray(collection.document_ids)])
+            text_offsets.append(np.asarray(collection.text_offsets)[1:] + text_size)
+            text_size += int(collection.text_offsets[-1])
+
+        non_empty = [collection for collection in collections if len(collection)]
+        if non_empty:
+            embeddings = np.concatenate(
+                [np.asarray(collection.embeddings) for collection in non_empty]
+            ).astype(np.float32, copy=False)
+        else:
+            embeddings = np.zeros((0, 0), dtype=np.float32)
+
+        return cls(
+            documents=documents,
+            embeddings=embeddings,
+            document_ids=np.concatenate(document_ids).astype(np.int32),
+            chunk_indices=np.concatenate(
+                [np.asarray(collection.chunk_indices) for collection in collections]
+            ).astype(np.int32),
+            page_numbers=np.concatenate(
+                [np.asarray(collection.page_numbers) for collection in collections]
+            ).astype(np.int32),
+            text_offsets=np.concatenate(text_offsets),
+            text_data=np.concatenate(
+                [np.asarray(collection.text_data) for collection in collections]
+            ).astype(np.uint8),
+            name=collections[0].name if collections else "",
+            manifest=dict(collections[0].manifest) if collections else {},
+        )
+
+    def save(self, directory: Path) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        np.save(directory / EMBEDDINGS_FILE, np.ascontiguousarray(self.embeddings))
+        np.save(directory / DOCUMENT_IDS_FILE, self.document_ids)
+        np.save(directory / CHUNK_INDICES_FILE, self.chunk_indices)
+        np.save(directory / PAGE_NUMBERS_FILE, self.page_numbers)
+        np.save(directory / TEXT_OFFSETS_FILE, self.text_offsets)
+        np.save(directory / TEXT_DATA_FILE, self.text_data)
+        self.save_metadata(directory)
+
+    def save_metadata(self, directory: Path) -> None:
+        np.save(directory / DOCUMENT_CENTROIDS_FILE, self.get_document_centroids())
+        self.save_manifest(directory)
+
+    def save_manifest(self, directory: Path) -> None:
+        self.manifest = {
+            **self.manifest,
+            "format_version": FORMAT_VERSION,
+            "count": len(self),
+            "dimension": self.dimension,
+            "documents": self.documents,
+        }
+        manifest_path = directory / MANIFEST_FILE
+        staging_path = manifest_path.with_suffix(".json.tmp")
+        with open(staging_path, "w") as f:
+            json.dump(self.manifest, f)
+        os.replace(staging_path, manifest_path)
+
+    @classmethod
+    def load(cls, directory: Path, name: str = "") -> "Collection":
+        with open(directory / MANIFEST_FILE) as f:
+            manifest = json.load(f)
+
+        return cls.load_columns(directory, name, manifest)
+
+    @classmethod
+    def load_columns(
+        cls, directory: Path, name: str = "", manifest: dict | None = None
+    ) -> "Collection":
+        manifest = manifest or {}
+        return cls(
+            documents=list(manifest["documents"]),
+            embeddings=np.load(directory / EMBEDDINGS_FILE, mmap_mode="r"),
+            document_ids=np.load(directory / DOCUMENT_IDS_FILE, mmap_mode="r"),
+            chunk_indices=np.load(directory / CHUNK_INDICES_FILE, mmap_mode="r"),
+            page_numbers=np.load(directory / PAGE_NUMBERS_FILE, mmap_mode="r"),
+            text_offsets=np.load(directory / TEXT_OFFSETS_FILE, mmap_mode="r"),
+            text_data=np.load(directory / TEXT_DATA_FILE, mmap_mode="r"),
+            name=name,
+            path=directory,
+            manifest=manifest,
+            # Collections saved before centroids existed compute them on demand.
+            document_centroids=np.load(centroids_path)
+            if (centroids_path := directory / DOCUMENT_CENTROIDS_FILE).exists()
+            else None,
+        )
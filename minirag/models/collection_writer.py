@@ -0,0 +1,180 @@
+from pathlib import Path
+from typing import BinaryIO
+
+import numpy as np
+
+from minirag.models.chunk import Chunk
+from minirag.models.collection import (
+    CHUNK_INDICES_FILE,
+    DOCUMENT_IDS_FILE,
+    EMBEDDINGS_FILE,
+    PAGE_NUMBERS_FILE,
+    TEXT_DATA_FILE,
+    TEXT_OFFSETS_FILE,
+    Collection,
+)
+
+DEFAULT_WRITE_BATCH_SIZE = 1024
+HEADER_SIZE = 128
+COLUMN_DTYPES = {
+    EMBEDDINGS_FILE: np.float32,
+    DOCUMENT_IDS_FILE: np.int32,
+    CHUNK_INDICES_FILE: np.int32,
+    PAGE_NUMBERS_FILE: np.int32,
+    TEXT_OFFSETS_FILE: np.int64,
+    TEXT_DATA_FILE: np.uint8,
+}
+
+
+class CollectionWriter:
+    def __init__(
+        self,
+        directory: Path,
+        name: str = "",
+        batch_size: int = DEFAULT_WRITE_BATCH_SIZE,
+        checkpoint: dict | None = None,
+    ) -> None:
+        self.directory = directory
+        self.name = name
+        self.batch_size = batch_size
+        checkpoint = checkpoint or {}
+        self.documents: list[str] = list(checkpoint.get("documents", []))
+        self.count = checkpoint.get("count", 0)
+        self.dimension = checkpoint.get("dimension", 0)
+        self.text_size = checkpoint.get("text_size", 0)
+        self._document_lookup = {
+            document_name: doc_id for doc_id, document_name in enumerate(self.documents)
+        }
+        self._pending: list[Chunk] = []
+        self.directory.mkdir(parents=True, exist_ok=True)
+        mode = "r+b" if checkpoint else "wb"
+        # The column files stay open across appends; finalize and close
+        # release them.
+        self._files: dict[str, BinaryIO] = {
+            file_name: open(directory / file_name, mode)  # noqa: SIM115
+            for file_name in COLUMN_DTYPES
+        }
+        if checkpoint:
+            # Drop rows written after the checkpoint and append from there.
+            for file_name, size in self._file_sizes().items():
+                self._files[file_name].truncate(size)
+                self._files[file_name].seek(size)
+            return
+
+        # Rows are appended after a placeholder header that finalize rewrites
+        # in place with the final shape.
+        self._write_headers()
+        self._files[TEXT_OFFSETS_FILE].write(np.zeros(1, dtype=np.int64).tobytes())
+
+    def __len__(self) -> int:
+        return self.count + len(self._pending)
+
+    def _shapes(self) -> dict[str, tuple[int, ...]]:
+        return {
+            EMBEDDINGS_FILE: (self.count, self.dimension),
+            DOCUMENT_IDS_FILE: (self.count,),
+            CHUNK_INDICES_FILE: (self.count,),
+            PAGE_NUMBERS_FILE: (self.count,),
+            TEXT_OFFSETS_FILE: (self.count + 1,),
+            TEXT_DATA_FILE: (self.text_size,),
+        }
+
+    def _file_sizes(self) -> dict[str, int]:
+        return {
+            file_name: HEADER_SIZE
+            + int(np.prod(shape)) * np.dtype(COLUMN_DTYPES[file_name]).itemsize
+            for file_name, shape in self._shapes().items()
+        }
+
+    def _write_headers(self) -> None:
+        for file_name, shape in self._shapes().items():
+            file = self._files[file_name]
+            position = file.tell()
+            file.seek(0)
+            np.lib.format.write_array_header_1_0(
+                file,
+                {
+                    "descr": np.lib.format.dtype_to_descr(
+                        np.dtype(COLUMN_DTYPES[file_name])
+                    ),
+                    "fortran_order": False,
+                    "shape": shape,
+                },
+            )
+            # NumPy pads headers to 128 bytes for any realistic shape, so the
+            # final header fits in the placeholder.
+            if file.tell() != HEADER_SIZE:
+                raise ValueError(f"Unexpected {file_name} header size {file.tell()}")
+            file.seek(max(position, HEADER_SIZE))
+
+    def append(self, chunks: list[Chunk]) -> None:
+        self._pending.extend(chunks)
+        while len(self._pending) >= self.batch_size:
+            self._write(Collection.from_chunks(self._pending[: self.batch_size]))
+            del self._pending[: self.batch_size]
+
+    def append_collection(self, collection: Collection) -> None:
+        self.flush()
+        self._write(collection)
+
+    def flush(self) -> None:
+        if self._pending:
+            self._write(Collection.from_chunks(self._pending))
+            self._pending = []
+
+    def _write(self, batch: Collection) -> None:
+        if not len(batch):
+            return
+        if not self.dimension:
+            self.dimension = batch.dimension
+        elif batch.dimension != self.dimension:
+            raise ValueError(
+                f"Embedding dimension {batch.dimension} does not match "
+                f"the collection dimension {self.dimension}"
+            )
+
+        remap = np.empty(len(batch.documents), dtype=np.int32)
+        for doc_id, document_name in enumerate(batch.documents):
+            if document_name not in self._document_lookup:
+                self._document_lookup[document_name] = len(self.documents)
+                self.documents.append(document_name)
+            remap[doc_id] = self._document_lookup[document_name]
+
+        columns = {
+            EMBEDDINGS_FILE: batch.embeddings,
+            DOCUMENT_IDS_FILE: remap[np.asarray(batch.document_ids)],
+            CHUNK_INDICES_FILE: batch.chunk_indices,
+            PAGE_NUMBERS_FILE: batch.page_numbers,
+            TEXT_OFFSETS_FILE: np.asarray(batch.text_offsets)[1:] + self.text_size,
+            TEXT_DATA_FILE: batch.text_data,
+        }
+        for file_name, values in columns.items():
+            self._files[file_name].write(
+                np.ascontiguousarray(values, dtype=COLUMN_DTYPES[file_name]).tobytes()
+            )
+        self.count += len(batch)
+        self.text_size += int(batch.text_offsets[-1])
+
+    def checkpoint(self) -> dict:
+        self.flush()
+        for file in self._files.values():
+            file.flush()
+        return {
+            "count": self.count,
+            "dimension": self.dimension,
+            "text_size": self.text_size,
+        }
+
+    def finalize(self, manifest: dict | None = None) -> Collection:
+        self.flush()
+        self._write_headers()
+        self.close()
+        return Collection.load_columns(
+            self.directory,
+            self.name,
+            {**(manifest or {}), "documents": self.documents},
+        )
+
+    def close(self) -> None:
+        for file in self._files.values():
+            file.close()
@@ -0,0 +1,51 @@
+import time
+from dataclasses import dataclass, field
+
+
+@dataclass
+class IngestionJob:
+    job_id: str
+    collection_name: str
+    doc_paths: list[str]
+    status: str = "queued"
+    documents_total: int = 0
+    documents_done: int = 0
+    chunks_done: int = 0
+    # Progress already on disk when this run started (resumed checkpoints).
+    documents_resumed: int = 0
+    chunks_resumed: int = 0
+    submitted_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    error: str = ""
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed", "cancelled")
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    @property
+    def documents_per_second(self) -> float:
+        elapsed = self.elapsed
+        if elapsed <= 0:
+            return 0.0
+        return (self.documents_done - self.documents_resumed) / elapsed
+
+    @property
+    def chunks_per_second(self) -> float:
+        elapsed = self.elapsed
+        if elapsed <= 0:
+            return 0.0
+        return (self.chunks_done - self.chunks_resumed) / elapsed
+
+    @property
+    def eta(self) -> float | None:
+        rate = self.documents_per_second
+        if self.status != "running" or rate <= 0:
+            return None
+        return (self.documents_total - self.documents_done) / rate
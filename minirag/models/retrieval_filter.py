@@ -0,0 +1,26 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+@dataclass
+class RetrievalFilter:
+    documents: list[str] = field(default_factory=list)
+    pages: tuple[int, int] | None = None
+
+    def __bool__(self) -> bool:
+        return bool(self.documents) or self.pages is not None
+
+    def matches_document(self, document_name: str) -> bool:
+        if not self.documents:
+            return True
+
+        return any(
+            document in (document_name, Path(document_name).name)
+            for document in self.documents
+        )
+
+    def matches_page(self, page_number: int | None) -> bool:
+        if self.pages is None:
+            return True
+
+        return page_number is not None and self.pages[0] <= page_number <= self.pages[1]
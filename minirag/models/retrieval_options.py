@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+
+from minirag.models.chat_session import DEFAULT_HISTORY_DECAY
+
+HISTORY_MODES = ("text", "vector")
+DEFAULT_MMR_CANDIDATES = 20
+DEFAULT_TOP_DOCUMENTS = 10
+
+
+@dataclass
+class RetrievalOptions:
+    mode: str = "dense"
+    history: str = "text"
+    history_decay: float = DEFAULT_HISTORY_DECAY
+    mmr_lambda: float | None = None
+    mmr_candidates: int = DEFAULT_MMR_CANDIDATES
+    top_documents: int = DEFAULT_TOP_DOCUMENTS
@@ -1,60 +1,431 @@
+import itertools
+import json
 import os
+import threading
+from collections import deque
+from contextlib import closing
+from collections.abc import Callable, Iterable, Iterator
+import shutil
+import tempfile
 import numpy as np
 from pathlib import Path
 
-from minirag.models import Chunk
+from minirag.indexes import BM25Index, FlatIndex, Index, get_index_class
+from minirag.models import Chunk, Collection
+from minirag.models.collection import MANIFEST_FILE
+from minirag.models.collection_writer import CollectionWriter
+from minirag.services.discovery_service import DEFAULT_HASH_WORKERS, DiscoveryService
 from minirag.services.document_service import DocumentService
+from minirag.services.ingestion_service import (
+    DEFAULT_EMBEDDING_CONCURRENCY,
+    IngestionPipeline,
+)
+from minirag.services.rag_service import DEFAULT_EMBEDDING_BATCH_SIZE
+
+INGESTION_JOURNAL_FILE = "ingestion_journal.jsonl"
+
+
+class IngestionCancelled(Exception):
+    pass
 
 
 class CollectionService:
     def __init__(
         self,
         storage_path: str = "collections",
+        embedding_batch_size: int = DEFAULT_EMBEDDING_BATCH_SIZE,
+        ingest_workers: int = 0,
+        embedding_concurrency: int = DEFAULT_EMBEDDING_CONCURRENCY,
+        index_type: str = "flat",
+        index_params: dict | None = None,
+        include_patterns: list[str] | None = None,
+        exclude_patterns: list[str] | None = None,
+        max_file_size: int = 0,
+        hash_workers: int = DEFAULT_HASH_WORKERS,
+        pdf_workers: int = 0,
     ) -> None:
         self.storage_path = Path(storage_path)
-        self.active_collection: list[Chunk] | None = None
+        self.embedding_batch_size = embedding_batch_size
+        self.ingest_workers = ingest_workers
+        self.embedding_concurrency = embedding_concurrency
+        self.index_type = index_type
+        self.index_params = index_params or {}
+        self.include_patterns = include_patterns or []
+        self.exclude_patterns = exclude_patterns or []
+        self.max_file_size = max_file_size
+        self.hash_workers = hash_workers
+        self.pdf_workers = pdf_workers
+        self.active_collection: Collection | None = None
+
+    def _collection_dir(self, collection_name: str) -> Path:
+        return self.storage_path / collection_name
+
+    def _checkpoint_dir(self, collection_name: str) -> Path:
+        return self.storage_path / f".{collection_name}.partial"
+
+    def _legacy_collection_path(self, collection_name: str) -> Path:
+        return self.storage_path / f"{collection_name}.npy"
+
+    def _discovery_options(self) -> dict:
+        return {
+            "include": self.include_patterns,
+            "exclude": self.exclude_patterns,
+            "max_file_size": self.max_file_size,
+        }
+
+    def find_documents(self, doc_paths: list[str]) -> list[str]:
+        return DiscoveryService.find_documents(doc_paths, **self._discovery_options())
+
+    def _iter_processed_documents(
+        self, doc_paths: Iterable[str]
+    ) -> Iterator[list[Chunk]]:
+        if self.ingest_workers > 0:
+            pipeline = IngestionPipeline(
+                read_workers=self.ingest_workers,
+                embedding_concurrency=self.embedding_concurrency,
+                batch_size=self.embedding_batch_size,
+            )
+            yield from pipeline.iter_documents(list(doc_paths))
+            return
 
-    def _process_folder(self, folder_path: str) -> list[Chunk]:
-        doc_paths = [
-            os.path.join(folder_path, f)
-            for f in os.listdir(folder_path)
-            if f.endswith(".txt")
-        ]
-        chunks = []
         for doc_path in doc_paths:
-            doc_chunks = DocumentService.process_document(str(doc_path))
-            chunks.extend(doc_chunks)
-        return chunks
+            yield DocumentService.process_document(
+                doc_path, self.embedding_batch_size, self.pdf_workers
+            )
 
     def _store_embeddings(
         self,
         doc_chunks: list[Chunk],
         collection_name: str,
     ) -> None:
+        self._store_collection(
+            Collection.from_chunks(doc_chunks, collection_name),
+            collection_name,
+        )
+
+    def _build_index(
+        self,
+        collection: Collection,
+        previous_index: Index | None = None,
+    ) -> Index | None:
+        if previous_index is not None:
+            return previous_index.rebuild(collection.embeddings)
+
+        if self.index_type == "flat":
+            return None
+
+        index_class = get_index_class(self.index_type)
+        return index_class.build(collection.embeddings, **self.index_params)
 
-        records_np = np.array(doc_chunks)
+    def _load_index(self, collection: Collection) -> Index | None:
+        index_manifest = collection.manifest.get("index")
+        if index_manifest is None or collection.path is None:
+            return None
+
+        index_class = get_index_class(index_manifest["type"])
+        params = {**index_manifest.get("params", {}), **self.index_params}
+        return index_class.load(collection.path, collection.embeddings, **params)
+
+    def _resume_from_journal(
+        self,
+        journal_path: Path,
+        doc_paths: Iterator[str],
+        files: dict[str, dict],
+    ) -> tuple[int, dict | None, Iterator[str]]:
+        entries: list[tuple[dict, int]] = []
+        if journal_path.exists():
+            with open(journal_path, "rb") as f:
+                journal_size = 0
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        break
+                    journal_size += len(line)
+                    entries.append((entry, journal_size))
+
+        done = 0
+        checkpoint: dict | None = None
+        documents: list[str] = []
+        pending_paths: Iterator[str] = iter(())
+        for doc_path in doc_paths:
+            # Rows are contiguous, so only an unchanged prefix of the inputs
+            # can be reused.
+            if (
+                done == len(entries)
+                or entries[done][0]["path"] != doc_path
+                or entries[done][0]["sha256"] != files[doc_path]["sha256"]
+            ):
+                pending_paths = itertools.chain([doc_path], doc_paths)
+                break
+            documents.extend(entries[done][0]["documents"])
+            checkpoint = {**entries[done][0]["checkpoint"], "documents": documents}
+            done += 1
+
+        if checkpoint is not None:
+            # Entries past the reusable prefix are rewritten by this run.
+            with open(journal_path, "r+b") as f:
+                f.truncate(entries[done - 1][1])
+        return done, checkpoint, pending_paths
+
+    def _make_staging_dir(self, collection_name: str) -> Path:
         if not os.path.exists(self.storage_path):
             os.makedirs(self.storage_path)
-        np.save(f"{self.storage_path}/{collection_name}.npy", records_np)
+
+        return Path(
+            tempfile.mkdtemp(prefix=f".{collection_name}-", dir=self.storage_path)
+        )
+
+    def _store_collection(
+        self,
+        collection: Collection,
+        collection_name: str,
+        previous_index: Index | None = None,
+        index: Index | None = None,
+        staging_dir: Path | None = None,
+    ) -> None:
+        # Streamed collections arrive with their columns already in staging_dir.
+        streamed = staging_dir is not None
+        if staging_dir is None:
+            staging_dir = self._make_staging_dir(collection_name)
+        try:
+            if index is None:
+                index = self._build_index(collection, previous_index)
+            collection.manifest.pop("index", None)
+            if index is not None:
+                index.save(staging_dir)
+                collection.manifest["index"] = {
+                    "type": index.name,
+                    "params": index.params,
+                }
+            BM25Index.build(collection.iter_texts(), staging_dir)
+            if streamed:
+                collection.save_metadata(staging_dir)
+            else:
+                collection.save(staging_dir)
+            self._replace_collection_dir(staging_dir, collection_name)
+        except BaseException:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            raise
+
+    def _replace_collection_dir(self, staging_dir: Path, collection_name: str) -> None:
+        collection_dir = self._collection_dir(collection_name)
+        previous_dir = self.storage_path / f".{collection_name}.previous"
+        if previous_dir.exists():
+            shutil.rmtree(previous_dir)
+        if collection_dir.exists():
+            os.replace(collection_dir, previous_dir)
+
+        os.replace(staging_dir, collection_dir)
+        shutil.rmtree(previous_dir, ignore_errors=True)
 
     def create_collection(
         self,
         doc_paths: list[str],
         collection_name: str,
+        progress: Callable[[int, int, int], None] | None = None,
+        cancel_event: threading.Event | None = None,
     ) -> None:
         print(f"Creating collection: {collection_name}...")
-        records: list[Chunk] = []
+        discovery = self._discovery_options()
+        expanded_paths = self.find_documents(doc_paths)
+        if not expanded_paths:
+            raise ValueError(f"No documents found in {', '.join(doc_paths)}")
+        files: dict[str, dict] = {}
 
-        for doc_path in doc_paths:
-            if os.path.isdir(doc_path):
-                doc_chunks = self._process_folder(doc_path)
-            else:
-                doc_chunks = DocumentService.process_document(doc_path)
-            records.extend(doc_chunks)
+        def discovered_paths() -> Iterator[str]:
+            # Hashing and duplicate detection run ahead of the embedding loop.
+            for doc_path, fingerprint in DiscoveryService.iter_unique_documents(
+                expanded_paths, workers=self.hash_workers
+            ):
+                files[doc_path] = fingerprint
+                yield doc_path
+
+        index_class = get_index_class(self.index_type)
+        index: Index | None = None
+        checkpoint_dir = self._checkpoint_dir(collection_name)
+        journal_path = checkpoint_dir / INGESTION_JOURNAL_FILE
+        done, checkpoint, pending_paths = self._resume_from_journal(
+            journal_path, discovered_paths(), files
+        )
+        if checkpoint is None:
+            shutil.rmtree(checkpoint_dir, ignore_errors=True)
+        else:
+            print(
+                f"Resuming from checkpoint: {done} of {len(expanded_paths)} "
+                "documents already ingested"
+            )
+        writer = CollectionWriter(
+            checkpoint_dir, collection_name, checkpoint=checkpoint
+        )
+        if progress is not None:
+            progress(done, len(expanded_paths), writer.count)
+        queued_paths: deque[str] = deque()
+
+        def queue_paths() -> Iterator[str]:
+            for doc_path in pending_paths:
+                queued_paths.append(doc_path)
+                yield doc_path
+
+        try:
+            with (
+                open(journal_path, "a") as journal,
+                # Closing stops the read-ahead as soon as ingestion is stopped.
+                closing(self._iter_processed_documents(queue_paths())) as documents,
+            ):
+                for doc_chunks in documents:
+                    doc_path = queued_paths.popleft()
+                    # Chunks go to disk in fixed-size batches as documents finish.
+                    known_documents = len(writer.documents)
+                    writer.append(doc_chunks)
+                    # The checkpoint flushes buffered rows, which registers
+                    # their documents with the writer.
+                    document_checkpoint = writer.checkpoint()
+                    journal.write(
+                        json.dumps(
+                            {
+                                "path": doc_path,
+                                "sha256": files[doc_path]["sha256"],
+                                "documents": writer.documents[known_documents:],
+                                "checkpoint": document_checkpoint,
+                            }
+                        )
+                        + "\n"
+                    )
+                    journal.flush()
+                    done += 1
+                    if progress is not None:
+                        progress(done, len(expanded_paths), writer.count)
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise IngestionCancelled(collection_name)
+                    if (
+                        checkpoint
+                        or not doc_chunks
+                        or not index_class.supports_incremental_build
+                    ):
+                        continue
+
+                    # Grow the graph while the next documents are still being
+                    # embedded.
+                    embeddings = np.array(
+                        [chunk.embedding for chunk in doc_chunks], dtype=np.float32
+                    )
+                    if index is None:
+                        index = index_class.build(embeddings, **self.index_params)
+                    else:
+                        index.add(embeddings)
 
-        self._store_embeddings(records, collection_name)
+            if progress is not None:
+                # Duplicates are only known once every file is hashed.
+                progress(done, done, writer.count)
+            collection = writer.finalize(
+                {"sources": doc_paths, "files": files, "discovery": discovery}
+            )
+        except BaseException:
+            writer.close()
+            print(
+                f"Ingestion of {collection_name} stopped. Run /add with the same "
+                "documents and collection name to resume from the last checkpoint."
+            )
+            raise
+
+        os.remove(journal_path)
+        self._store_collection(
+            collection, collection_name, index=index, staging_dir=checkpoint_dir
+        )
         print(f"Collection {collection_name} created")
 
+    def update_collection(
+        self,
+        collection_name: str,
+        doc_paths: list[str] | None = None,
+    ) -> None:
+        collection_dir = self._collection_dir(collection_name)
+        if (
+            not collection_dir.exists()
+            and self._legacy_collection_path(collection_name).exists()
+        ):
+            self.migrate_collection(collection_name)
+        if not collection_dir.exists():
+            print(f"Collection {collection_name} not found")
+            return
+
+        collection = Collection.load(collection_dir, collection_name)
+        previous_index = self._load_index(collection)
+        sources = (
+            doc_paths
+            or collection.manifest.get("sources")
+            or list(collection.documents)
+        )
+        previous_files: dict[str, dict] = collection.manifest.get("files", {})
+        expanded_paths = DiscoveryService.find_documents(
+            [doc_path for doc_path in sources if os.path.exists(doc_path)],
+            **collection.manifest.get("discovery", self._discovery_options()),
+        )
+        files = dict(
+            DiscoveryService.iter_unique_documents(
+                expanded_paths, previous_files, self.hash_workers
+            )
+        )
+
+        changed_paths = [
+            doc_path
+            for doc_path, fingerprint in files.items()
+            if previous_files.get(doc_path, {}).get("sha256") != fingerprint["sha256"]
+        ]
+        removed_paths = (set(collection.documents) | set(previous_files)) - set(files)
+        print(
+            f"Updating collection: {collection_name} "
+            f"({len(changed_paths)} new or changed, {len(removed_paths)} removed)..."
+        )
+
+        stale_paths = removed_paths | set(changed_paths)
+        stale_documents = [
+            doc_id
+            for doc_id, document_name in enumerate(collection.documents)
+            if document_name in stale_paths
+        ]
+        if not changed_paths and not stale_documents:
+            collection.manifest.update({"sources": sources, "files": files})
+            collection.save_manifest(collection_dir)
+            print(f"Collection {collection_name} is up to date")
+            return
+
+        kept_rows = np.flatnonzero(
+            ~np.isin(np.asarray(collection.document_ids), stale_documents)
+        )
+        staging_dir = self._make_staging_dir(collection_name)
+        writer = CollectionWriter(staging_dir, collection_name)
+        try:
+            # Kept rows are copied block by block from the memory-mapped
+            # collection, then changed documents are appended as they finish.
+            for start in range(0, len(kept_rows), writer.batch_size):
+                writer.append_collection(
+                    collection.take(kept_rows[start : start + writer.batch_size])
+                )
+            for doc_chunks in self._iter_processed_documents(changed_paths):
+                writer.append(doc_chunks)
+            updated_collection = writer.finalize(
+                {**collection.manifest, "sources": sources, "files": files}
+            )
+        except BaseException:
+            writer.close()
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            raise
+
+        self._store_collection(
+            updated_collection,
+            collection_name,
+            previous_index,
+            staging_dir=staging_dir,
+        )
+        if (
+            self.active_collection is not None
+            and self.active_collection.name == collection_name
+        ):
+            self.load_collection(collection_name)
+        print(f"Collection {collection_name} updated")
+
     def _hydrate_chunk_metadata(self, records: list[Chunk]) -> list[Chunk]:
         for chunk_index, record in enumerate(records):
             if "chunk_index" not in record.__dict__:
@@ -70,17 +441,50 @@ class CollectionService:
 
         return records
 
+    def migrate_collection(self, collection_name: str) -> None:
+        legacy_path = self._legacy_collection_path(collection_name)
+        records = np.load(legacy_path, allow_pickle=True)
+        chunks = self._hydrate_chunk_metadata(records.tolist())
+        self._store_collection(
+            Collection.from_chunks(chunks, collection_name),
+            collection_name,
+        )
+        os.remove(legacy_path)
+        print(f"Collection {collection_name} migrated to the columnar format")
+
     def load_collection(self, collection_name: str) -> None:
         try:
-            collection_path = f"{self.storage_path}/{collection_name}.npy"
-            records = np.load(collection_path, allow_pickle=True)
-            self.active_collection = self._hydrate_chunk_metadata(records.tolist())
+            collection_dir = self._collection_dir(collection_name)
+            if (
+                not collection_dir.exists()
+                and self._legacy_collection_path(collection_name).exists()
+            ):
+                self.migrate_collection(collection_name)
+
+            collection = Collection.load(collection_dir, collection_name)
+            collection.index = self._load_index(collection)
+            if collection.index is None and self.index_params.get("block_size"):
+                # Exact search streams the memory-mapped rows block by block.
+                collection.index = FlatIndex.build(
+                    collection.embeddings, **self.index_params
+                )
+            if BM25Index.exists(collection_dir):
+                collection.lexical_index = BM25Index.load(collection_dir)
+            self.active_collection = collection
             print(f"Collection {collection_name} loaded")
         except FileNotFoundError:
             print(f"Collection {collection_name} not found")
 
     def list_collections(self) -> None:
-        collections = [f.split(".")[0] for f in os.listdir(self.storage_path)]
+        collections = []
+        for entry in sorted(os.listdir(self.storage_path)):
+            entry_path = self.storage_path / entry
+            if entry.startswith("."):
+                continue
+            if entry_path.is_dir() and (entry_path / MANIFEST_FILE).exists():
+                collections.append(entry)
+            elif entry.endswith(".npy") and entry_path.is_file():
+                collections.append(entry.removesuffix(".npy"))
 
         print("Available collections:")
         print(collections)
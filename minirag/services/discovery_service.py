@@ -0,0 +1,129 @@
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatch
+
+from minirag.services.document_service import DocumentService
+
+SUPPORTED_EXTENSIONS = (".txt", ".pdf")
+DEFAULT_HASH_WORKERS = 4
+
+
+class DiscoveryService:
+    @staticmethod
+    def matches_patterns(relative_path: str, patterns: Iterable[str]) -> bool:
+        name = os.path.basename(relative_path)
+        return any(
+            fnmatch(relative_path, pattern) or fnmatch(name, pattern)
+            for pattern in patterns
+        )
+
+    @staticmethod
+    def is_candidate(
+        relative_path: str,
+        size: int,
+        include: list[str],
+        exclude: list[str],
+        max_file_size: int = 0,
+    ) -> bool:
+        if include:
+            if not DiscoveryService.matches_patterns(relative_path, include):
+                return False
+        elif not relative_path.lower().endswith(SUPPORTED_EXTENSIONS):
+            return False
+
+        if DiscoveryService.matches_patterns(relative_path, exclude):
+            return False
+        return not max_file_size or size <= max_file_size
+
+    @staticmethod
+    def walk_directory(
+        root: str,
+        include: list[str],
+        exclude: list[str],
+        max_file_size: int = 0,
+    ) -> Iterator[str]:
+        # Depth-first with sorted entries, so the order is stable across runs.
+        pending = [root]
+        while pending:
+            directory = pending.pop()
+            try:
+                with os.scandir(directory) as scanner:
+                    entries = sorted(scanner, key=lambda entry: entry.name)
+            except OSError as e:
+                print(f"Skipping unreadable directory: {directory} ({e})")
+                continue
+
+            subdirectories = []
+            for entry in entries:
+                relative_path = os.path.relpath(entry.path, root)
+                if entry.is_dir(follow_symlinks=False):
+                    if not DiscoveryService.matches_patterns(relative_path, exclude):
+                        subdirectories.append(entry.path)
+                elif entry.is_file() and DiscoveryService.is_candidate(
+                    relative_path,
+                    entry.stat().st_size,
+                    include,
+                    exclude,
+                    max_file_size,
+                ):
+                    yield entry.path
+            pending.extend(reversed(subdirectories))
+
+    @staticmethod
+    def find_documents(
+        doc_paths: list[str],
+        include: list[str] | None = None,
+        exclude: list[str] | None = None,
+        max_file_size: int = 0,
+    ) -> list[str]:
+        found = []
+        for doc_path in doc_paths:
+            if os.path.isdir(doc_path):
+                found.extend(
+                    DiscoveryService.walk_directory(
+                        doc_path, include or [], exclude or [], max_file_size
+                    )
+                )
+            else:
+                # Files named explicitly are always ingested.
+                found.append(doc_path)
+
+        return list(dict.fromkeys(found))
+
+    @staticmethod
+    def fingerprint_document(doc_path: str, previous: dict | None) -> dict | None:
+        try:
+            return DocumentService.fingerprint_document(doc_path, previous)
+        except OSError as e:
+            print(f"Skipping unreadable document: {doc_path} ({e})")
+            return None
+
+    @staticmethod
+    def iter_unique_documents(
+        doc_paths: list[str],
+        previous_files: dict[str, dict] | None = None,
+        workers: int = DEFAULT_HASH_WORKERS,
+    ) -> Iterator[tuple[str, dict]]:
+        previous_files = previous_files or {}
+        seen: dict[str, str] = {}
+        # Files are hashed ahead on worker threads while the caller processes
+        # the documents already yielded.
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            fingerprints = executor.map(
+                lambda doc_path: DiscoveryService.fingerprint_document(
+                    doc_path, previous_files.get(doc_path)
+                ),
+                doc_paths,
+            )
+            for doc_path, fingerprint in zip(doc_paths, fingerprints):
+                if fingerprint is None:
+                    continue
+                original_path = seen.setdefault(fingerprint["sha256"], doc_path)
+                if original_path != doc_path:
+                    print(f"Skipping {doc_path}: same content as {original_path}")
+                    continue
+                yield doc_path, fingerprint
+        finally:
+            executor.shutdown(cancel_futures=True)
@@ -1,9 +1,18 @@
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
 import fitz
 
 from minirag.models import Chunk
-from minirag.services.rag_service import RagService
+from minirag.models.chunk import build_chunk_id
+from minirag.services.rag_service import DEFAULT_EMBEDDING_BATCH_SIZE, RagService
 from minirag.utils.stats_utils import track_stats
 
+PARALLEL_PDF_MIN_PAGES = 64
+MIN_PAGES_PER_RANGE = 8
+
 
 class DocumentService:
     @staticmethod
@@ -30,12 +39,40 @@ class DocumentService:
         return "\n".join([page_text for _, page_text in pages]) + "\n"
 
     @staticmethod
-    def read_pdf_pages(doc_path: str) -> list[tuple[int | None, str]]:
+    def read_pdf_page_range(
+        doc_path: str, start: int, end: int
+    ) -> list[tuple[int | None, str]]:
+        with fitz.open(doc_path) as doc:
+            return [
+                (page_index + 1, doc[page_index].get_text().strip())
+                for page_index in range(start, end)
+            ]
+
+    @staticmethod
+    def read_pdf_pages(
+        doc_path: str,
+        workers: int = 0,
+    ) -> list[tuple[int | None, str]]:
         try:
             with fitz.open(doc_path) as doc:
-                pages = []
-                for page_index, page in enumerate(doc, start=1):
-                    pages.append((page_index, page.get_text().strip()))
+                page_count = len(doc)
+                if workers <= 1 or page_count < PARALLEL_PDF_MIN_PAGES:
+                    pages = []
+                    for page_index, page in enumerate(doc, start=1):
+                        pages.append((page_index, page.get_text().strip()))
+                    return pages
+
+            # Two ranges per worker even out pages that are slower to extract.
+            range_size = max(MIN_PAGES_PER_RANGE, -(-page_count // (workers * 2)))
+            starts = range(0, page_count, range_size)
+            ends = [min(start + range_size, page_count) for start in starts]
+            pages = []
+            with ProcessPoolExecutor(max_workers=min(workers, len(starts))) as executor:
+                # Each worker opens the document itself; map keeps page order.
+                for range_pages in executor.map(
+                    DocumentService.read_pdf_page_range, repeat(doc_path), starts, ends
+                ):
+                    pages.extend(range_pages)
             return pages
         except FileNotFoundError:
             print(f"PDF file not found: {doc_path}")
@@ -46,9 +83,12 @@ class DocumentService:
             return []
 
     @staticmethod
-    def read_document_pages(doc_path: str) -> list[tuple[int | None, str]]:
+    def read_document_pages(
+        doc_path: str,
+        pdf_workers: int = 0,
+    ) -> list[tuple[int | None, str]]:
         if doc_path.lower().endswith(".pdf"):
-            return DocumentService.read_pdf_pages(doc_path)
+            return DocumentService.read_pdf_pages(doc_path, pdf_workers)
 
         doc_text = DocumentService.read_document(doc_path)
         if not doc_text:
@@ -56,43 +96,94 @@ class DocumentService:
 
         return [(None, doc_text)]
 
+    @staticmethod
+    def hash_document(doc_path: str) -> str:
+        digest = hashlib.sha256()
+        with open(doc_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def fingerprint_document(
+        doc_path: str,
+        previous: dict | None = None,
+    ) -> dict:
+        stat = os.stat(doc_path)
+        if (
+            previous is not None
+            and previous.get("size") == stat.st_size
+            and previous.get("mtime") == stat.st_mtime
+        ):
+            return previous
+
+        return {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "sha256": DocumentService.hash_document(doc_path),
+        }
+
     @staticmethod
     def build_chunk_id(
         doc_path: str,
         chunk_index: int,
         page_number: int | None = None,
     ) -> str:
-        if page_number is None:
-            return f"{doc_path}#chunk-{chunk_index}"
-
-        return f"{doc_path}#page-{page_number}-chunk-{chunk_index}"
+        return build_chunk_id(doc_path, chunk_index, page_number)
 
     @staticmethod
-    @track_stats
-    def process_document(doc_path: str) -> list[Chunk]:
+    def split_pages(
+        pages: list[tuple[int | None, str]],
+    ) -> list[tuple[int | None, str]]:
         splitter = RagService.get_splitter()
+        page_chunks = []
+
+        for page_number, page_text in pages:
+            for chunk_text in splitter.split_text(page_text):
+                page_chunks.append((page_number, chunk_text))
+
+        return page_chunks
+
+    @staticmethod
+    def build_chunks(
+        doc_path: str,
+        page_chunks: list[tuple[int | None, str]],
+        embeddings: list[list[float]],
+    ) -> list[Chunk]:
         chunks = []
-        chunk_index = 0
-
-        for page_number, page_text in DocumentService.read_document_pages(doc_path):
-            text_chunks = splitter.split_text(page_text)
-
-            for chunk_text in text_chunks:
-                emb = RagService.generate_embeddings(chunk_text)
-                chunks.append(
-                    Chunk(
-                        document_name=doc_path,
-                        text=chunk_text,
-                        embedding=emb,
-                        chunk_id=DocumentService.build_chunk_id(
-                            doc_path,
-                            chunk_index,
-                            page_number,
-                        ),
-                        chunk_index=chunk_index,
-                        page_number=page_number,
-                    )
+        for chunk_index, ((page_number, chunk_text), emb) in enumerate(
+            zip(page_chunks, embeddings)
+        ):
+            chunks.append(
+                Chunk(
+                    document_name=doc_path,
+                    text=chunk_text,
+                    embedding=emb,
+                    chunk_id=DocumentService.build_chunk_id(
+                        doc_path,
+                        chunk_index,
+                        page_number,
+                    ),
+                    chunk_index=chunk_index,
+                    page_number=page_number,
                 )
-                chunk_index += 1
+            )
 
         return chunks
+
+    @staticmethod
+    @track_stats
+    def process_document(
+        doc_path: str,
+        batch_size: int = DEFAULT_EMBEDDING_BATCH_SIZE,
+        pdf_workers: int = 0,
+    ) -> list[Chunk]:
+        page_chunks = DocumentService.split_pages(
+            DocumentService.read_document_pages(doc_path, pdf_workers)
+        )
+        embeddings = RagService.generate_embeddings_batch(
+            [chunk_text for _, chunk_text in page_chunks],
+            batch_size=batch_size,
+        )
+
+        return DocumentService.build_chunks(doc_path, page_chunks, embeddings)
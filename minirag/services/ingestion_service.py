@@ -0,0 +1,158 @@
+import queue
+import threading
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from minirag.models import Chunk
+from minirag.services.document_service import DocumentService
+from minirag.services.rag_service import DEFAULT_EMBEDDING_BATCH_SIZE, RagService
+
+DEFAULT_READ_WORKERS = 4
+DEFAULT_EMBEDDING_CONCURRENCY = 4
+DEFAULT_QUEUE_SIZE = 16
+# Documents parsed ahead of the embedders, per read worker.
+READ_AHEAD_PER_WORKER = 2
+
+_STOP = None
+
+
+class IngestionPipeline:
+    def __init__(
+        self,
+        read_workers: int = DEFAULT_READ_WORKERS,
+        embedding_concurrency: int = DEFAULT_EMBEDDING_CONCURRENCY,
+        batch_size: int = DEFAULT_EMBEDDING_BATCH_SIZE,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ) -> None:
+        self.read_workers = read_workers
+        self.embedding_concurrency = embedding_concurrency
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+
+    def _embed_batches(
+        self,
+        batches: queue.Queue,
+        embeddings: dict[tuple[int, int], list[list[float]]],
+        errors: list[Exception],
+        stop: threading.Event,
+    ) -> None:
+        while True:
+            batch = batches.get()
+            if batch is _STOP:
+                return
+
+            doc_number, batch_number, texts = batch
+            if errors or stop.is_set():
+                # Keep draining so the producer never blocks on a full queue.
+                continue
+            try:
+                embeddings[(doc_number, batch_number)] = (
+                    RagService.generate_embeddings_batch(
+                        texts, batch_size=self.batch_size
+                    )
+                )
+            except Exception as e:  # noqa: BLE001
+                # Any failure is handed to the consumer thread and re-raised there.
+                errors.append(e)
+
+    def iter_documents(self, doc_paths: list[str]) -> Iterator[list[Chunk]]:
+        batches: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        embeddings: dict[tuple[int, int], list[list[float]]] = {}
+        errors: list[Exception] = []
+        stop = threading.Event()
+        split_documents: list[list[tuple[int | None, str]]] = []
+        next_document = 0
+
+        def completed_documents() -> Iterator[list[Chunk]]:
+            nonlocal next_document
+            while next_document < len(split_documents):
+                page_chunks = split_documents[next_document]
+                batch_keys = [
+                    (next_document, batch_number)
+                    for batch_number in range(
+                        (len(page_chunks) + self.batch_size - 1) // self.batch_size
+                    )
+                ]
+                if not all(batch_key in embeddings for batch_key in batch_keys):
+                    return
+
+                doc_embeddings = []
+                for batch_key in batch_keys:
+                    doc_embeddings.extend(embeddings.pop(batch_key))
+                yield DocumentService.build_chunks(
+                    doc_paths[next_document], page_chunks, doc_embeddings
+                )
+                split_documents[next_document] = []
+                next_document += 1
+
+        embedders = [
+            threading.Thread(
+                target=self._embed_batches,
+                args=(batches, embeddings, errors, stop),
+                daemon=True,
+            )
+            for _ in range(self.embedding_concurrency)
+        ]
+        for embedder in embedders:
+            embedder.start()
+
+        executor = ProcessPoolExecutor(max_workers=self.read_workers)
+        # Only a bounded window of documents is submitted, so stopping early
+        # does not wait for every remaining document to be parsed.
+        pending_reads: deque[Future] = deque()
+        remaining_paths = iter(doc_paths)
+
+        def submit_reads() -> None:
+            while len(pending_reads) < READ_AHEAD_PER_WORKER * self.read_workers:
+                doc_path = next(remaining_paths, None)
+                if doc_path is None:
+                    return
+                pending_reads.append(
+                    executor.submit(DocumentService.read_document_pages, doc_path)
+                )
+
+        finished = False
+        try:
+            submit_reads()
+            doc_number = 0
+            while pending_reads:
+                pages = pending_reads.popleft().result()
+                submit_reads()
+                page_chunks = DocumentService.split_pages(pages)
+                split_documents.append(page_chunks)
+                for batch_number, start in enumerate(
+                    range(0, len(page_chunks), self.batch_size)
+                ):
+                    texts = [
+                        chunk_text
+                        for _, chunk_text in page_chunks[
+                            start : start + self.batch_size
+                        ]
+                    ]
+                    batches.put((doc_number, batch_number, texts))
+                doc_number += 1
+                if errors:
+                    break
+                yield from completed_documents()
+            finished = not errors
+        finally:
+            executor.shutdown(cancel_futures=True)
+            if not finished:
+                # Stopped early; batches still queued are dropped unembedded.
+                stop.set()
+            for _ in embedders:
+                batches.put(_STOP)
+            for embedder in embedders:
+                embedder.join()
+
+        if errors:
+            raise errors[0]
+
+        yield from completed_documents()
+
+    def run(self, doc_paths: list[str]) -> list[Chunk]:
+        chunks = []
+        for doc_chunks in self.iter_documents(doc_paths):
+            chunks.extend(doc_chunks)
+        return chunks
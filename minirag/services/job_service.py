@@ -0,0 +1,143 @@
+import json
+import os
+import threading
+import time
+import uuid
+from dataclasses import asdict
+
+from minirag.models import IngestionJob
+from minirag.services.collection_service import CollectionService, IngestionCancelled
+
+JOBS_DIR = ".jobs"
+JOBS_FILE = "jobs.json"
+
+
+class IngestionJobQueue:
+    def __init__(self, collection_service: CollectionService) -> None:
+        self.collection_service = collection_service
+        self.path = collection_service.storage_path / JOBS_DIR / JOBS_FILE
+        self.jobs: list[IngestionJob] = self._load_jobs()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._cancel_events: dict[str, threading.Event] = {}
+        self._worker: threading.Thread | None = None
+
+    def _load_jobs(self) -> list[IngestionJob]:
+        if not self.path.exists():
+            return []
+
+        with open(self.path) as f:
+            jobs = [IngestionJob(**job) for job in json.load(f)]
+        for job in jobs:
+            if job.status == "running":
+                # Interrupted by the previous session; resumes from its checkpoint.
+                job.status = "queued"
+        return jobs
+
+    def _save_jobs(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        staging_path = self.path.with_suffix(".json.tmp")
+        with open(staging_path, "w") as f:
+            json.dump([asdict(job) for job in self.jobs], f)
+        os.replace(staging_path, self.path)
+
+    def start(self) -> None:
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, daemon=True)
+            self._worker.start()
+        self._wakeup.set()
+
+    def submit(self, doc_paths: list[str], collection_name: str) -> IngestionJob:
+        if not collection_name:
+            raise ValueError("Collection name cannot be empty")
+        if not doc_paths:
+            raise ValueError("No documents to add")
+
+        job = IngestionJob(uuid.uuid4().hex[:8], collection_name, doc_paths)
+        with self._lock:
+            self.jobs.append(job)
+            self._save_jobs()
+        self.start()
+        return job
+
+    def get_job(self, job_id: str) -> IngestionJob | None:
+        return next((job for job in self.jobs if job.job_id == job_id), None)
+
+    def cancel(self, job_id: str) -> bool:
+        with self._lock:
+            job = self.get_job(job_id)
+            if job is None or job.finished:
+                return False
+            if job.status == "queued":
+                job.status = "cancelled"
+                job.finished_at = time.time()
+                self._save_jobs()
+            elif job_id in self._cancel_events:
+                # The worker stops after the document in progress.
+                self._cancel_events[job_id].set()
+        return True
+
+    def _next_job(self) -> IngestionJob | None:
+        with self._lock:
+            job = next((job for job in self.jobs if job.status == "queued"), None)
+            if job is not None:
+                job.status = "running"
+                job.started_at = time.time()
+                job.finished_at = None
+                job.error = ""
+                self._cancel_events[job.job_id] = threading.Event()
+                self._save_jobs()
+        return job
+
+    def _run(self) -> None:
+        while True:
+            job = self._next_job()
+            if job is None:
+                self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+            self.run_job(job)
+
+    def run_job(self, job: IngestionJob) -> None:
+        first_report = True
+
+        def update_progress(documents_done: int, documents_total: int, chunks: int):
+            nonlocal first_report
+            if first_report:
+                # The first report is the progress restored from a checkpoint.
+                job.documents_resumed = documents_done
+                job.chunks_resumed = chunks
+                first_report = False
+            job.documents_total = documents_total
+            job.documents_done = documents_done
+            job.chunks_done = chunks
+            with self._lock:
+                self._save_jobs()
+
+        status, error = "done", ""
+        try:
+            self.collection_service.create_collection(
+                job.doc_paths,
+                job.collection_name,
+                progress=update_progress,
+                cancel_event=self._cancel_events[job.job_id],
+            )
+            active_collection = self.collection_service.active_collection
+            if (
+                active_collection is not None
+                and active_collection.name == job.collection_name
+            ):
+                # The new files are already in place; swap the loaded copy.
+                self.collection_service.load_collection(job.collection_name)
+        except IngestionCancelled:
+            status = "cancelled"
+        except Exception as e:  # noqa: BLE001
+            # A failed job is recorded and must not stop the worker thread.
+            status, error = "failed", str(e)
+
+        with self._lock:
+            job.status = status
+            job.error = error
+            job.finished_at = time.time()
+            self._cancel_events.pop(job.job_id, None)
+            self._save_jobs()
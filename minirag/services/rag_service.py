@@ -1,12 +1,31 @@
+from typing import cast
+
 import numpy as np
 
 from minirag.utils.stats_utils import track_stats
-from minirag.models import Chunk
-from minirag.utils.backend_manager import get_backend_instance
+from minirag.indexes import BM25Index, FlatIndex, Index
+from minirag.indexes.base import normalize_rows, select_top_k
+from minirag.models import Chunk, Collection, RetrievalFilter
+from minirag.models.retrieval_options import (
+    DEFAULT_MMR_CANDIDATES,
+    DEFAULT_TOP_DOCUMENTS,
+)
+from minirag.utils.backend_manager import get_backend_instance, get_backend_name
+from minirag.utils.embedding_cache import get_embedding_cache
+from minirag.utils.query_cache import get_query_cache
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
+DEFAULT_EMBEDDING_BATCH_SIZE = 32
+RETRIEVAL_MODES = ("dense", "lexical", "hybrid", "hierarchical")
+HYBRID_CANDIDATES = 50
+RRF_K = 60
+
 
 class RagService:
+    last_index_name = ""
+    # Embedding of the last retrieval query, or None for lexical retrieval.
+    last_query_embedding: list[float] | None = None
+
     @staticmethod
     def get_splitter(
         chunk_size: int = 500, chunk_overlap: int = 20
@@ -22,7 +41,61 @@ class RagService:
         model_name: str = "",
     ) -> list[float]:
         backend = get_backend_instance()
-        return backend.generate_embeddings(src_text, model_name)
+        cache = get_embedding_cache()
+        if cache is None:
+            return backend.generate_embeddings(src_text, model_name)
+
+        backend_name = get_backend_name()
+        embedding = cache.get(backend_name, model_name, src_text)
+        if embedding is None:
+            embedding = backend.generate_embeddings(src_text, model_name)
+            cache.put(backend_name, model_name, src_text, embedding)
+        return embedding
+
+    @staticmethod
+    def embed_query(query: str) -> list[float]:
+        cache = get_query_cache()
+        if cache is None:
+            return RagService.generate_embeddings(query)
+
+        # Keyed by the model the backend resolves to, so switching models
+        # never returns vectors from another embedding space.
+        backend_name = get_backend_name()
+        model_name = get_backend_instance().get_embedding_model()
+        embedding = cache.get(backend_name, model_name, query)
+        if embedding is None:
+            embedding = RagService.generate_embeddings(query, model_name)
+            cache.put(backend_name, model_name, query, embedding)
+        return embedding
+
+    @staticmethod
+    def generate_embeddings_batch(
+        src_texts: list[str],
+        model_name: str = "",
+        batch_size: int = DEFAULT_EMBEDDING_BATCH_SIZE,
+    ) -> list[list[float]]:
+        backend = get_backend_instance()
+        cache = get_embedding_cache()
+        backend_name = get_backend_name()
+        if cache is None:
+            embeddings: list[list[float] | None] = [None] * len(src_texts)
+        else:
+            embeddings = cache.get_many(backend_name, model_name, src_texts)
+
+        missing_rows = [row for row, emb in enumerate(embeddings) if emb is None]
+        for start in range(0, len(missing_rows), batch_size):
+            batch_rows = missing_rows[start : start + batch_size]
+            batch_texts = [src_texts[row] for row in batch_rows]
+            batch_embeddings = backend.generate_embeddings_batch(
+                batch_texts,
+                model_name,
+            )
+            if cache is not None:
+                cache.put_many(backend_name, model_name, batch_texts, batch_embeddings)
+            for row, emb in zip(batch_rows, batch_embeddings):
+                embeddings[row] = emb
+
+        return cast(list[list[float]], embeddings)
 
     @staticmethod
     def cosine_similarity(
@@ -39,34 +112,332 @@ class RagService:
 
         return float(np.dot(left_vector, right_vector) / (left_norm * right_norm))
 
+    @staticmethod
+    def get_index(collection: list[Chunk] | Collection) -> Index:
+        if isinstance(collection, Collection):
+            if collection.index is None:
+                collection.index = FlatIndex(collection.embeddings)
+            return collection.index
+
+        return FlatIndex(
+            np.array([record.embedding for record in collection], dtype=np.float32)
+        )
+
+    @staticmethod
+    def get_lexical_index(collection: list[Chunk] | Collection) -> BM25Index:
+        if isinstance(collection, Collection):
+            if collection.lexical_index is None:
+                collection.lexical_index = BM25Index.build(collection.iter_texts())
+            return collection.lexical_index
+
+        return BM25Index.build([record.text for record in collection])
+
+    @staticmethod
+    def search_dense(
+        query: str,
+        collection: list[Chunk] | Collection,
+        top_k: int,
+        query_embedding: list[float] | None = None,
+        rows: np.ndarray | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        query_emb = query_embedding
+        if query_emb is None:
+            query_emb = RagService.embed_query(query)
+        if rows is not None:
+            # Only the filtered rows are read and scored, exactly.
+            vectors = normalize_rows(RagService.get_embeddings(collection, rows))
+            scores = vectors @ normalize_rows(query_emb)
+            top_rows = select_top_k(scores, top_k)
+            RagService.last_index_name = "filtered flat"
+            return rows[top_rows], scores[top_rows]
+
+        index = RagService.get_index(collection)
+        RagService.last_index_name = index.name
+        return index.search(np.asarray(query_emb, dtype=np.float32), top_k)
+
+    @staticmethod
+    def search_lexical(
+        query: str,
+        collection: list[Chunk] | Collection,
+        top_k: int,
+        rows: np.ndarray | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        index = RagService.get_lexical_index(collection)
+        RagService.last_index_name = index.name
+        return index.search(query, top_k, rows)
+
+    @staticmethod
+    def search_hybrid(
+        query: str,
+        collection: list[Chunk] | Collection,
+        top_k: int,
+        query_embedding: list[float] | None = None,
+        rows: np.ndarray | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        candidates = max(top_k, HYBRID_CANDIDATES)
+        dense_rows, _ = RagService.search_dense(
+            query, collection, candidates, query_embedding, rows
+        )
+        dense_index_name = RagService.last_index_name
+        lexical_rows, _ = RagService.search_lexical(query, collection, candidates, rows)
+        RagService.last_index_name = f"{dense_index_name}+bm25"
+        return RagService.fuse_rankings(dense_rows, lexical_rows, top_k)
+
+    @staticmethod
+    def search_hierarchical(
+        query: str,
+        collection: list[Chunk] | Collection,
+        top_k: int,
+        query_embedding: list[float] | None = None,
+        rows: np.ndarray | None = None,
+        top_documents: int = DEFAULT_TOP_DOCUMENTS,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        if not isinstance(collection, Collection):
+            collection = Collection.from_chunks(collection, "")
+        query_emb = query_embedding
+        if query_emb is None:
+            query_emb = RagService.embed_query(query)
+
+        # Stage one ranks documents by centroid, stage two scores only the
+        # chunks of the closest documents.
+        centroid_scores = collection.get_document_centroids() @ normalize_rows(
+            query_emb
+        )
+        if rows is not None:
+            allowed = np.zeros(len(centroid_scores), dtype=bool)
+            allowed[np.asarray(collection.document_ids)[rows]] = True
+            centroid_scores[~allowed] = -np.inf
+        documents = select_top_k(centroid_scores, top_documents)
+        documents = documents[np.isfinite(centroid_scores[documents])]
+        candidate_rows = np.sort(
+            np.concatenate(
+                [collection.get_document_rows(int(doc_id)) for doc_id in documents]
+            )
+            if len(documents)
+            else np.empty(0, dtype=np.int64)
+        )
+        if rows is not None:
+            candidate_rows = np.intersect1d(candidate_rows, rows)
+
+        result = RagService.search_dense(
+            query, collection, top_k, query_emb, candidate_rows
+        )
+        RagService.last_index_name = "hierarchical"
+        return result
+
+    @staticmethod
+    def fuse_rankings(
+        dense_rows: np.ndarray,
+        lexical_rows: np.ndarray,
+        top_k: int,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        # Reciprocal-rank fusion: each ranking contributes 1 / (RRF_K + rank).
+        ranked_rows = np.concatenate([dense_rows, lexical_rows])
+        rank_scores = np.concatenate(
+            [
+                1.0 / (RRF_K + np.arange(1, len(dense_rows) + 1)),
+                1.0 / (RRF_K + np.arange(1, len(lexical_rows) + 1)),
+            ]
+        )
+        rows, positions = np.unique(ranked_rows, return_inverse=True)
+        scores = np.bincount(positions, weights=rank_scores).astype(np.float32)
+        top_rows = select_top_k(scores, top_k)
+        return rows[top_rows], scores[top_rows]
+
+    @staticmethod
+    def get_records(
+        collection: list[Chunk] | Collection,
+        rows: np.ndarray,
+        scores: np.ndarray,
+    ) -> list[Chunk]:
+        top_records = []
+        for row, score in zip(rows, scores):
+            record = collection[int(row)]
+            record.similarity = float(score)
+            top_records.append(record)
+
+        return top_records
+
     @staticmethod
     def retrieve_chunks(
         query: str,
-        collection: list[Chunk],
+        collection: list[Chunk] | Collection,
         top_k: int = 5,
+        mode: str = "dense",
+        query_embedding: list[float] | None = None,
+        mmr_lambda: float | None = None,
+        mmr_candidates: int = DEFAULT_MMR_CANDIDATES,
+        retrieval_filter: RetrievalFilter | None = None,
+        top_documents: int = DEFAULT_TOP_DOCUMENTS,
     ) -> list[Chunk]:
-        query_emb = RagService.generate_embeddings(query)
-        scored_records = []
-        for index, record in enumerate(collection):
-            record.similarity = RagService.cosine_similarity(
-                record.embedding, query_emb
+        RagService.last_query_embedding = None
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(
+                f"Unknown retrieval mode: {mode}. "
+                f"Available modes: {', '.join(RETRIEVAL_MODES)}"
+            )
+        if len(collection) == 0:
+            return []
+
+        rows = None
+        if retrieval_filter:
+            rows = RagService.get_filtered_rows(collection, retrieval_filter)
+            if len(rows) == 0:
+                return []
+
+        search_k = top_k if mmr_lambda is None else max(top_k, mmr_candidates)
+        if mode != "lexical" and query_embedding is None:
+            query_embedding = RagService.embed_query(query)
+        RagService.last_query_embedding = query_embedding
+
+        if mode == "lexical":
+            rows, scores = RagService.search_lexical(query, collection, search_k, rows)
+        elif mode == "hybrid":
+            rows, scores = RagService.search_hybrid(
+                query, collection, search_k, query_embedding, rows
+            )
+        elif mode == "dense":
+            rows, scores = RagService.search_dense(
+                query, collection, search_k, query_embedding, rows
+            )
+        else:
+            rows, scores = RagService.search_hierarchical(
+                query, collection, search_k, query_embedding, rows, top_documents
             )
-            scored_records.append((index, record))
 
-        top_records = sorted(
-            scored_records,
-            key=lambda item: item[1].similarity,
-            reverse=True,
-        )[:top_k]
+        if mmr_lambda is not None and len(rows) > top_k:
+            candidate_vectors = normalize_rows(
+                RagService.get_embeddings(collection, rows)
+            )
+            if query_embedding is None:
+                # Lexical scores have no fixed scale, so relevance is relative.
+                relevance = scores / max(float(scores.max()), 1e-12)
+            else:
+                relevance = candidate_vectors @ normalize_rows(query_embedding)
+            selected = RagService.select_mmr(
+                candidate_vectors, relevance, top_k, mmr_lambda
+            )
+            rows, scores = rows[selected], scores[selected]
+
+        return RagService.get_records(collection, rows, scores)
+
+    @staticmethod
+    def get_filtered_rows(
+        collection: list[Chunk] | Collection,
+        retrieval_filter: RetrievalFilter,
+    ) -> np.ndarray:
+        if isinstance(collection, Collection):
+            return collection.filter_rows(retrieval_filter)
+
+        return np.array(
+            [
+                row
+                for row, record in enumerate(collection)
+                if retrieval_filter.matches_document(record.document_name)
+                and retrieval_filter.matches_page(record.page_number)
+            ],
+            dtype=np.int64,
+        )
+
+    @staticmethod
+    def get_embeddings(
+        collection: list[Chunk] | Collection,
+        rows: np.ndarray,
+    ) -> np.ndarray:
+        if isinstance(collection, Collection):
+            return np.asarray(collection.embeddings[rows], dtype=np.float32)
+
+        return np.array(
+            [collection[int(row)].embedding for row in rows], dtype=np.float32
+        )
+
+    @staticmethod
+    def select_mmr(
+        candidate_vectors: np.ndarray,
+        relevance: np.ndarray,
+        top_k: int,
+        mmr_lambda: float,
+    ) -> np.ndarray:
+        # Greedy maximal marginal relevance over unit-normalized candidates:
+        # each step picks argmax(lambda * relevance - (1 - lambda) * redundancy),
+        # where redundancy is the highest similarity to an already picked chunk.
+        similarities = candidate_vectors @ candidate_vectors.T
+        available = np.ones(len(relevance), dtype=bool)
+        selected = [int(np.argmax(relevance))]
+        available[selected[0]] = False
+        redundancy = similarities[selected[0]].copy()
+
+        while len(selected) < min(top_k, len(relevance)):
+            mmr_scores = mmr_lambda * relevance - (1 - mmr_lambda) * redundancy
+            mmr_scores[~available] = -np.inf
+            best = int(np.argmax(mmr_scores))
+            selected.append(best)
+            available[best] = False
+            np.maximum(redundancy, similarities[best], out=redundancy)
+
+        return np.array(selected, dtype=np.int64)
+
+    @staticmethod
+    def retrieve_many(
+        queries: list[str],
+        collection: list[Chunk] | Collection,
+        top_k: int = 5,
+        mode: str = "dense",
+        batch_size: int = DEFAULT_EMBEDDING_BATCH_SIZE,
+        top_documents: int = DEFAULT_TOP_DOCUMENTS,
+    ) -> list[list[Chunk]]:
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(
+                f"Unknown retrieval mode: {mode}. "
+                f"Available modes: {', '.join(RETRIEVAL_MODES)}"
+            )
+        if len(collection) == 0 or not queries:
+            return [[] for _ in queries]
+
+        if mode == "lexical":
+            results = [
+                RagService.search_lexical(query, collection, top_k) for query in queries
+            ]
+            return [RagService.get_records(collection, *result) for result in results]
+
+        candidates = max(top_k, HYBRID_CANDIDATES) if mode == "hybrid" else top_k
+        query_embeddings = RagService.generate_embeddings_batch(
+            queries, batch_size=batch_size
+        )
+        if mode == "hierarchical":
+            results = [
+                RagService.search_hierarchical(
+                    query, collection, top_k, query_embedding, None, top_documents
+                )
+                for query, query_embedding in zip(queries, query_embeddings)
+            ]
+            return [RagService.get_records(collection, *result) for result in results]
+
+        index = RagService.get_index(collection)
+        results = index.search_many(
+            np.asarray(query_embeddings, dtype=np.float32), candidates
+        )
+        RagService.last_index_name = index.name
+        if mode == "hybrid":
+            results = [
+                RagService.fuse_rankings(
+                    dense_rows,
+                    RagService.search_lexical(query, collection, candidates)[0],
+                    top_k,
+                )
+                for query, (dense_rows, _) in zip(queries, results)
+            ]
+            RagService.last_index_name = f"{index.name}+bm25"
 
-        return [record for _, record in top_records]
+        return [RagService.get_records(collection, *result) for result in results]
 
     @staticmethod
     @track_stats
     def similarity_search(
         query: str,
-        collection: list[Chunk],
+        collection: list[Chunk] | Collection,
         top_k: int = 5,
+        mode: str = "dense",
     ) -> str:
-        retrieved_chunks = RagService.retrieve_chunks(query, collection, top_k)
+        retrieved_chunks = RagService.retrieve_chunks(query, collection, top_k, mode)
         return "\n\n".join([record.text for record in retrieved_chunks])
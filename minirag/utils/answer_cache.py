@@ -0,0 +1,172 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_ANSWER_CACHE_PATH = "collections/.cache/answers.sqlite3"
+DEFAULT_ANSWER_CACHE_SIZE = 1000
+DEFAULT_ANSWER_CACHE_TTL = 7 * 24 * 60 * 60
+DEFAULT_SIMILARITY_THRESHOLD = 0.95
+
+
+class AnswerCache:
+    def __init__(
+        self,
+        path: str = DEFAULT_ANSWER_CACHE_PATH,
+        max_entries: int = DEFAULT_ANSWER_CACHE_SIZE,
+        ttl_seconds: int = DEFAULT_ANSWER_CACHE_TTL,
+        similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+    ) -> None:
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS answers ("
+            " collection TEXT NOT NULL,"
+            " model TEXT NOT NULL,"
+            " chunks_key BLOB NOT NULL,"
+            " query_embedding BLOB NOT NULL,"
+            " answer TEXT NOT NULL,"
+            " created_at INTEGER NOT NULL,"
+            " last_used INTEGER NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS answers_key"
+            " ON answers (collection, model, chunks_key)"
+        )
+        self._connection.commit()
+
+    @staticmethod
+    def hash_chunks(
+        chunk_ids: list[str], texts: list[str], query: str | None = None
+    ) -> bytes:
+        # Texts are part of the key so answers go stale when a collection
+        # update changes the content behind an unchanged chunk id.
+        digest = hashlib.sha256()
+        for chunk_id, text in zip(chunk_ids, texts):
+            digest.update(chunk_id.encode("utf-8") + b"\0")
+            digest.update(text.encode("utf-8") + b"\0")
+        if query is not None:
+            # Exact lookups without a query embedding key on the question.
+            digest.update(b"query\0" + query.encode("utf-8"))
+        return digest.digest()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM answers"
+            ).fetchone()
+        return int(count)
+
+    def get(
+        self,
+        collection_name: str,
+        model_name: str,
+        chunks_key: bytes,
+        query_embedding: list[float] | None,
+    ) -> str | None:
+        min_created_at = time.time_ns() - self.ttl_seconds * 1_000_000_000
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT rowid, query_embedding, answer FROM answers"
+                " WHERE collection = ? AND model = ? AND chunks_key = ?"
+                " AND created_at >= ?",
+                (collection_name, model_name, chunks_key, min_created_at),
+            ).fetchall()
+            if query_embedding is None:
+                # Exact entries are stored without an embedding.
+                rows = [row for row in rows if not row[1]]
+            else:
+                rows = [row for row in rows if row[1]]
+            if not rows:
+                return None
+
+            best = 0
+            if query_embedding is not None:
+                query_vector = np.asarray(query_embedding, dtype=np.float32)
+                cached_vectors = np.array(
+                    [np.frombuffer(row[1], dtype=np.float32) for row in rows]
+                )
+                if cached_vectors.shape[1] != query_vector.shape[0]:
+                    return None
+
+                norms = np.linalg.norm(cached_vectors, axis=1) * np.linalg.norm(
+                    query_vector
+                )
+                similarities = cached_vectors @ query_vector / np.maximum(norms, 1e-12)
+                best = int(np.argmax(similarities))
+                if similarities[best] < self.similarity_threshold:
+                    return None
+
+            self._connection.execute(
+                "UPDATE answers SET last_used = ? WHERE rowid = ?",
+                (time.time_ns(), rows[best][0]),
+            )
+            self._connection.commit()
+            return rows[best][2]
+
+    def put(
+        self,
+        collection_name: str,
+        model_name: str,
+        chunks_key: bytes,
+        query_embedding: list[float] | None,
+        answer: str,
+    ) -> None:
+        now = time.time_ns()
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO answers"
+                " (collection, model, chunks_key, query_embedding, answer,"
+                " created_at, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    collection_name,
+                    model_name,
+                    chunks_key,
+                    np.asarray(query_embedding or [], dtype=np.float32).tobytes(),
+                    answer,
+                    now,
+                    now,
+                ),
+            )
+            self._evict(now)
+            self._connection.commit()
+
+    def _evict(self, now: int) -> None:
+        self._connection.execute(
+            "DELETE FROM answers WHERE created_at < ?",
+            (now - self.ttl_seconds * 1_000_000_000,),
+        )
+        (count,) = self._connection.execute("SELECT COUNT(*) FROM answers").fetchone()
+        if count <= self.max_entries:
+            return
+
+        self._connection.execute(
+            "DELETE FROM answers WHERE rowid IN ("
+            " SELECT rowid FROM answers ORDER BY last_used ASC LIMIT ?)",
+            (count - self.max_entries,),
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+_answer_cache: AnswerCache | None = None
+
+
+def set_answer_cache(cache: AnswerCache | None) -> None:
+    global _answer_cache
+    _answer_cache = cache
+
+
+def get_answer_cache() -> AnswerCache | None:
+    return _answer_cache
@@ -4,11 +4,13 @@ from minirag.backends.base import Backend
 from minirag.backends import get_backend
 
 _backend: Backend | None = None
+_backend_name: str = "ollama"
 
 
 def set_backend(backend_name: str = "ollama") -> None:
-    global _backend
+    global _backend, _backend_name
     _backend = get_backend(backend_name)
+    _backend_name = backend_name
 
 
 def get_backend_instance() -> Backend:
@@ -16,3 +18,7 @@ def get_backend_instance() -> Backend:
     if _backend is None:
         set_backend()
     return cast(Backend, _backend)
+
+
+def get_backend_name() -> str:
+    return _backend_name
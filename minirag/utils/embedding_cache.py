@@ -0,0 +1,147 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_CACHE_PATH = "collections/.cache/embeddings.sqlite3"
+DEFAULT_MAX_ENTRIES = 200_000
+
+
+class EmbeddingCache:
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " backend TEXT NOT NULL,"
+            " model TEXT NOT NULL,"
+            " text_hash BLOB NOT NULL,"
+            " embedding BLOB NOT NULL,"
+            " last_used INTEGER NOT NULL,"
+            " PRIMARY KEY (backend, model, text_hash))"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)"
+        )
+        self._connection.commit()
+
+    @staticmethod
+    def hash_text(text: str) -> bytes:
+        return hashlib.sha256(text.encode("utf-8")).digest()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM embeddings"
+            ).fetchone()
+        return int(count)
+
+    def get_many(
+        self,
+        backend_name: str,
+        model_name: str,
+        texts: list[str],
+    ) -> list[list[float] | None]:
+        text_hashes = [self.hash_text(text) for text in texts]
+        found: dict[bytes, list[float]] = {}
+
+        with self._lock:
+            for text_hash in set(text_hashes):
+                row = self._connection.execute(
+                    "SELECT embedding FROM embeddings"
+                    " WHERE backend = ? AND model = ? AND text_hash = ?",
+                    (backend_name, model_name, text_hash),
+                ).fetchone()
+                if row is not None:
+                    found[text_hash] = np.frombuffer(row[0], dtype=np.float32).tolist()
+
+            if found:
+                now = time.time_ns()
+                self._connection.executemany(
+                    "UPDATE embeddings SET last_used = ?"
+                    " WHERE backend = ? AND model = ? AND text_hash = ?",
+                    [(now, backend_name, model_name, text_hash) for text_hash in found],
+                )
+                self._connection.commit()
+
+        return [found.get(text_hash) for text_hash in text_hashes]
+
+    def put_many(
+        self,
+        backend_name: str,
+        model_name: str,
+        texts: list[str],
+        embeddings: list[list[float]],
+    ) -> None:
+        now = time.time_ns()
+        rows = [
+            (
+                backend_name,
+                model_name,
+                self.hash_text(text),
+                np.asarray(embedding, dtype=np.float32).tobytes(),
+                now,
+            )
+            for text, embedding in zip(texts, embeddings)
+        ]
+
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO embeddings"
+                " (backend, model, text_hash, embedding, last_used)"
+                " VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._evict()
+            self._connection.commit()
+
+    def get(self, backend_name: str, model_name: str, text: str) -> list[float] | None:
+        return self.get_many(backend_name, model_name, [text])[0]
+
+    def put(
+        self,
+        backend_name: str,
+        model_name: str,
+        text: str,
+        embedding: list[float],
+    ) -> None:
+        self.put_many(backend_name, model_name, [text], [embedding])
+
+    def _evict(self) -> None:
+        (count,) = self._connection.execute(
+            "SELECT COUNT(*) FROM embeddings"
+        ).fetchone()
+        if count <= self.max_entries:
+            return
+
+        self._connection.execute(
+            "DELETE FROM embeddings WHERE rowid IN ("
+            " SELECT rowid FROM embeddings ORDER BY last_used ASC LIMIT ?)",
+            (count - self.max_entries,),
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+_embedding_cache: EmbeddingCache | None = None
+
+
+def set_embedding_cache(cache: EmbeddingCache | None) -> None:
+    global _embedding_cache
+    _embedding_cache = cache
+
+
+def get_embedding_cache() -> EmbeddingCache | None:
+    return _embedding_cache
@@ -0,0 +1,60 @@
+import threading
+from collections import OrderedDict
+
+DEFAULT_QUERY_CACHE_SIZE = 1024
+
+
+class QueryEmbeddingCache:
+    def __init__(self, max_entries: int = DEFAULT_QUERY_CACHE_SIZE) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, str, str], list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, backend_name: str, model_name: str, text: str) -> list[float] | None:
+        key = (backend_name, model_name, text)
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return embedding
+
+    def put(
+        self,
+        backend_name: str,
+        model_name: str,
+        text: str,
+        embedding: list[float],
+    ) -> None:
+        key = (backend_name, model_name, text)
+        with self._lock:
+            self._entries[key] = embedding
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_query_cache: QueryEmbeddingCache | None = None
+
+
+def set_query_cache(cache: QueryEmbeddingCache | None) -> None:
+    global _query_cache
+    _query_cache = cache
+
+
+def get_query_cache() -> QueryEmbeddingCache | None:
+    return _query_cache
@@ -58,6 +58,20 @@ class TestOllamaBackend:
 
         mock_embeddings.assert_called_once_with(model="all-minilm", prompt="test text")
 
+    def test_generate_embeddings_batch_uses_embed_endpoint(self, mocker):
+        backend = get_backend("ollama")
+        mock_embed = mocker.patch(
+            "ollama.embed", return_value={"embeddings": [[0.1, 0.2], [0.3, 0.4]]}
+        )
+
+        result = backend.generate_embeddings_batch(["first", "second"])
+
+        assert result == [[0.1, 0.2], [0.3, 0.4]]
+        mock_embed.assert_called_once_with(
+            model="all-minilm",
+            input=["first", "second"],
+        )
+
     def test_check_model_exists(self, mocker):
         backend = get_backend("ollama")
         mocker.patch("ollama.list", return_value={"models": [{"name": "llama3.2"}]})
@@ -158,6 +172,28 @@ class TestOpenAIBackend:
             input="test text",
         )
 
+    def test_generate_embeddings_batch(self, mocker, monkeypatch):
+        mock_client = mocker.MagicMock()
+        mock_response = mocker.MagicMock()
+        mock_response.data = [
+            mocker.MagicMock(embedding=[0.1, 0.2]),
+            mocker.MagicMock(embedding=[0.3, 0.4]),
+        ]
+        mock_client.embeddings.create.return_value = mock_response
+
+        mocker.patch("minirag.backends.openai_backend.OpenAI", return_value=mock_client)
+        monkeypatch.setenv("OPENAI_API_KEY", "test_key")
+
+        from minirag.backends.openai_backend import OpenAIBackend
+
+        backend = OpenAIBackend()
+        result = backend.generate_embeddings_batch(["first", "second"])
+        assert result == [[0.1, 0.2], [0.3, 0.4]]
+        mock_client.embeddings.create.assert_called_once_with(
+            model="text-embedding-3-small",
+            input=["first", "second"],
+        )
+
     def test_chat_streaming_uses_deterministic_temperature(self, mocker, monkeypatch):
         mock_client = mocker.MagicMock()
         mock_chunk = mocker.MagicMock()
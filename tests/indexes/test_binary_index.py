@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from minirag.indexes import BinaryIndex, FlatIndex
+from minirag.indexes.binary import POPCOUNT, pack_signs
+
+
+@pytest.fixture
+def embeddings():
+    return np.random.default_rng(0).normal(size=(2000, 64)).astype(np.float32)
+
+
+class TestBinaryIndex:
+    def test_codes_pack_one_sign_bit_per_dimension(self, embeddings):
+        index = BinaryIndex.build(embeddings)
+
+        assert index.codes.shape == (2000, 8)
+        assert index.nbytes == embeddings.nbytes // 32
+        assert np.unpackbits(index.codes[0]).tolist() == (embeddings[0] > 0).tolist()
+
+    def test_hamming_distances_count_differing_signs(self, embeddings):
+        index = BinaryIndex.build(embeddings)
+
+        distances = index.hamming_distances(pack_signs(-embeddings[0]))
+
+        assert distances[0] == 64
+        assert distances[1] == int(POPCOUNT[index.codes[1] ^ ~index.codes[0]].sum())
+
+    def test_odd_byte_codes_are_padded_to_words(self):
+        codes = pack_signs(np.ones((3, 12), dtype=np.float32))
+
+        distances = BinaryIndex(codes).hamming_distances(pack_signs(-np.ones(12)))
+
+        assert codes.shape == (3, 2)
+        assert distances.tolist() == [12, 12, 12]
+
+    def test_rescored_search_has_high_recall(self):
+        rng = np.random.default_rng(0)
+        centers = rng.normal(size=(20, 64))
+        embeddings = np.repeat(centers, 100, axis=0) + 0.3 * rng.normal(size=(2000, 64))
+        index = BinaryIndex.build(embeddings, candidates=200)
+        flat = FlatIndex(embeddings)
+
+        hits = 0
+        for query in embeddings[::100] + 0.1 * rng.normal(size=(20, 64)):
+            rows, scores = index.search(query, top_k=5)
+            exact_rows, exact_scores = flat.search(query, top_k=5)
+            hits += len(set(rows.tolist()) & set(exact_rows.tolist()))
+            assert scores[0] == pytest.approx(exact_scores[0], abs=1e-5)
+
+        assert hits / (5 * len(embeddings[::100])) >= 0.9
+
+    def test_save_and_load_round_trip(self, embeddings, tmp_path):
+        index = BinaryIndex.build(embeddings, candidates=64)
+        index.save(tmp_path)
+
+        loaded = BinaryIndex.load(tmp_path, embeddings, candidates=64)
+
+        assert np.array_equal(loaded.codes, index.codes)
+        assert loaded.search(embeddings[3], 3)[0].tolist() == (
+            index.search(embeddings[3], 3)[0].tolist()
+        )
@@ -0,0 +1,70 @@
+from typing import ClassVar
+
+import numpy as np
+
+from minirag.indexes import BM25Index
+from minirag.indexes.bm25 import tokenize
+
+
+class TestBM25Index:
+    texts: ClassVar[list[str]] = [
+        "The runner belongs to club MPT.",
+        "The race starts at the town square.",
+        "Registration closes one week before the race.",
+    ]
+
+    def test_tokenize_lowercases_words(self):
+        assert tokenize("Qué CARRERA es, esta?") == ["qué", "carrera", "es", "esta"]
+
+    def test_search_ranks_matching_chunks(self):
+        index = BM25Index.build(self.texts)
+
+        rows, scores = index.search("race registration close", 3)
+
+        assert rows.tolist() == [2, 1]
+        assert scores[0] > scores[1] > 0
+
+    def test_search_without_matches_returns_nothing(self):
+        rows, scores = BM25Index.build(self.texts).search("weather", 3)
+
+        assert rows.size == 0
+        assert scores.size == 0
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        index = BM25Index.build(self.texts)
+        index.save(tmp_path)
+
+        loaded = BM25Index.load(tmp_path)
+
+        assert BM25Index.exists(tmp_path)
+        assert loaded.score("club runner").tolist() == (
+            index.score("club runner").tolist()
+        )
+
+    def test_build_in_blocks_to_directory_matches_in_memory_build(self, tmp_path):
+        texts = self.texts * 5
+        index = BM25Index.build(texts)
+
+        built = BM25Index.build(iter(texts), tmp_path, block_size=4)
+        loaded = BM25Index.load(tmp_path)
+
+        for other in (built, loaded):
+            assert other.vocabulary == index.vocabulary
+            assert np.array_equal(other.term_offsets, index.term_offsets)
+            assert np.array_equal(other.posting_rows, index.posting_rows)
+            assert np.array_equal(other.posting_frequencies, index.posting_frequencies)
+            assert np.array_equal(other.row_lengths, index.row_lengths)
+        assert sorted(path.name for path in tmp_path.iterdir()) == [
+            "bm25_posting_frequencies.npy",
+            "bm25_posting_rows.npy",
+            "bm25_row_lengths.npy",
+            "bm25_term_offsets.npy",
+            "bm25_vocabulary.json",
+        ]
+
+    def test_search_with_rows_only_scores_those_rows(self):
+        index = BM25Index.build(self.texts)
+
+        rows, _ = index.search("race registration close", 3, rows=np.array([1]))
+
+        assert rows.tolist() == [1]
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from minirag.indexes import FlatIndex
+from minirag.indexes.base import select_top_k
+from minirag.services.rag_service import RagService
+
+
+class TestFlatIndex:
+    def test_search_matches_cosine_similarity_ranking(self):
+        rng = np.random.default_rng(0)
+        embeddings = rng.normal(size=(200, 16))
+        query = rng.normal(size=16)
+
+        rows, scores = FlatIndex(embeddings).search(query, top_k=10)
+
+        expected = sorted(
+            range(len(embeddings)),
+            key=lambda row: RagService.cosine_similarity(
+                embeddings[row].tolist(), query.tolist()
+            ),
+            reverse=True,
+        )[:10]
+        assert rows.tolist() == expected
+        assert np.all(np.diff(scores) <= 0)
+
+    def test_search_breaks_ties_by_row_order(self):
+        embeddings = np.array([[0.0, 1.0], [1.0, 0.0], [0.0, 0.0], [2.0, 0.0]])
+
+        rows, scores = FlatIndex(embeddings).search(np.array([1.0, 0.0]), top_k=3)
+
+        assert rows.tolist() == [1, 3, 0]
+        assert scores.tolist() == [1.0, 1.0, 0.0]
+
+    def test_search_empty_index(self):
+        rows, scores = FlatIndex(np.zeros((0, 3))).search(np.ones(3), top_k=5)
+
+        assert rows.size == 0
+        assert scores.size == 0
+
+    def test_select_top_k_with_k_larger_than_scores(self):
+        scores = np.array([0.1, 0.5, 0.5, 0.2], dtype=np.float32)
+
+        assert select_top_k(scores, 10).tolist() == [1, 2, 3, 0]
+
+    def test_search_many_matches_single_queries(self, monkeypatch):
+        rng = np.random.default_rng(0)
+        index = FlatIndex(rng.normal(size=(50, 8)))
+        queries = rng.normal(size=(7, 8))
+        monkeypatch.setattr("minirag.indexes.flat.MAX_BLOCK_SCORES", 120)
+
+        results = index.search_many(queries, top_k=3)
+
+        for query, (rows, scores) in zip(queries, results):
+            expected_rows, expected_scores = index.search(query, top_k=3)
+            assert rows.tolist() == expected_rows.tolist()
+            assert scores == pytest.approx(expected_scores)
+
+    def test_blocked_scan_matches_full_scan(self):
+        rng = np.random.default_rng(0)
+        embeddings = rng.normal(size=(1000, 16)).astype(np.float32)
+        full = FlatIndex(embeddings)
+        blocked = FlatIndex(embeddings, block_size=64)
+
+        for query in rng.normal(size=(5, 16)):
+            rows, scores = blocked.search(query, top_k=10)
+            exact_rows, exact_scores = full.search(query, top_k=10)
+
+            assert rows.tolist() == exact_rows.tolist()
+            assert scores == pytest.approx(exact_scores, abs=1e-6)
+        assert blocked.vectors is embeddings
+
+    def test_blocked_scan_breaks_ties_by_row_order(self):
+        index = FlatIndex(np.ones((10, 2)), block_size=3)
+
+        rows, _ = index.search(np.array([1.0, 0.0]), top_k=4)
+
+        assert rows.tolist() == [0, 1, 2, 3]
+
+    def test_blocked_search_many_matches_search(self):
+        rng = np.random.default_rng(1)
+        index = FlatIndex(rng.normal(size=(300, 8)), block_size=50)
+        queries = rng.normal(size=(4, 8))
+
+        results = index.search_many(queries, top_k=5)
+
+        for query, (rows, _) in zip(queries, results):
+            assert rows.tolist() == index.search(query, top_k=5)[0].tolist()
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from minirag.indexes import FlatIndex, HNSWIndex
+
+
+@pytest.fixture
+def clustered_embeddings():
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(10, 16))
+    return np.repeat(centers, 30, axis=0) + 0.1 * rng.normal(size=(300, 16))
+
+
+class TestHNSWIndex:
+    def test_search_has_high_recall(self, clustered_embeddings):
+        index = HNSWIndex.build(clustered_embeddings, m=8, ef_construction=40)
+        flat = FlatIndex(clustered_embeddings)
+
+        hits = 0
+        for query in clustered_embeddings[::30]:
+            rows, scores = index.search(query, top_k=5)
+            exact_rows, _ = flat.search(query, top_k=5)
+            hits += len(set(rows.tolist()) & set(exact_rows.tolist()))
+            assert np.all(np.diff(scores) <= 0)
+
+        assert hits / (5 * len(clustered_embeddings[::30])) >= 0.9
+
+    def test_neighbor_lists_are_bounded(self, clustered_embeddings):
+        index = HNSWIndex.build(clustered_embeddings, m=4)
+
+        assert index.base_neighbors.shape[1] == 8
+        assert all(links.shape[1] == 4 for links in index.upper_neighbors.values())
+
+    def test_incremental_insertion_after_reload(self, clustered_embeddings, tmp_path):
+        index = HNSWIndex.build(clustered_embeddings[:200], m=8, ef_search=32)
+        index.save(tmp_path)
+
+        loaded = HNSWIndex.load(tmp_path, clustered_embeddings[:200], **index.params)
+        rebuilt = loaded.rebuild(clustered_embeddings)
+
+        assert rebuilt is loaded
+        assert len(rebuilt) == 300
+        assert rebuilt.ef_search == 32
+        assert rebuilt.search(clustered_embeddings[250], top_k=1)[0].tolist() == [250]
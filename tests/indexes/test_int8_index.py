@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from minirag.indexes import FlatIndex, Int8Index
+from minirag.indexes.int8 import quantize_int8
+
+
+@pytest.fixture
+def embeddings():
+    return np.random.default_rng(0).normal(size=(500, 32)).astype(np.float32)
+
+
+class TestInt8Index:
+    @pytest.mark.parametrize("scale", ["dimension", "vector"])
+    def test_rerank_matches_exact_search(self, embeddings, scale):
+        index = Int8Index.build(embeddings, scale=scale, rerank_factor=4)
+        flat = FlatIndex(embeddings)
+
+        for query in embeddings[::50] + 0.05:
+            rows, scores = index.search(query, top_k=5)
+            exact_rows, exact_scores = flat.search(query, top_k=5)
+
+            assert rows.tolist() == exact_rows.tolist()
+            assert scores == pytest.approx(exact_scores, abs=1e-5)
+
+    def test_codes_use_a_quarter_of_float32_memory(self, embeddings):
+        index = Int8Index.build(embeddings)
+
+        assert index.codes.dtype == np.int8
+        assert index.nbytes <= embeddings.nbytes / 4 + index.scales.nbytes
+
+    def test_quantize_rejects_unknown_scale(self, embeddings):
+        with pytest.raises(ValueError, match="Unknown int8 scale"):
+            quantize_int8(embeddings, "row")
+
+    def test_save_and_load_keeps_scale_mode(self, embeddings, tmp_path):
+        index = Int8Index.build(embeddings, scale="vector", rerank_factor=2)
+        index.save(tmp_path)
+
+        loaded = Int8Index.load(tmp_path, embeddings, scale="dimension")
+
+        assert loaded.params == {"scale": "vector", "rerank_factor": 4}
+        assert loaded.search(embeddings[7], 3)[0].tolist() == (
+            index.search(embeddings[7], 3)[0].tolist()
+        )
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from minirag.indexes import FlatIndex, IVFIndex
+
+
+@pytest.fixture
+def clustered_embeddings():
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(8, 16))
+    return np.repeat(centers, 50, axis=0) + 0.05 * rng.normal(size=(400, 16))
+
+
+class TestIVFIndex:
+    def test_search_with_all_lists_matches_exact_search(self, clustered_embeddings):
+        index = IVFIndex.build(clustered_embeddings, n_lists=8, nprobe=8)
+        query = clustered_embeddings[3] + 0.1
+
+        rows, scores = index.search(query, top_k=5)
+        exact_rows, exact_scores = FlatIndex(clustered_embeddings).search(query, 5)
+
+        assert rows.tolist() == exact_rows.tolist()
+        assert scores == pytest.approx(exact_scores)
+
+    def test_search_with_few_probes_has_high_recall(self, clustered_embeddings):
+        index = IVFIndex.build(clustered_embeddings, n_lists=8, nprobe=2)
+        flat = FlatIndex(clustered_embeddings)
+
+        hits = 0
+        for query in clustered_embeddings[::40]:
+            rows, _ = index.search(query, top_k=10)
+            exact_rows, _ = flat.search(query, top_k=10)
+            hits += len(set(rows.tolist()) & set(exact_rows.tolist()))
+
+        assert hits / (10 * len(clustered_embeddings[::40])) >= 0.9
+
+    def test_add_inserts_without_retraining(self, clustered_embeddings):
+        index = IVFIndex.build(clustered_embeddings[:200], n_lists=4, nprobe=4)
+        centroids = index.centroids.copy()
+
+        index.add(clustered_embeddings[200:])
+
+        assert len(index) == 400
+        np.testing.assert_array_equal(index.centroids, centroids)
+        rows, _ = index.search(clustered_embeddings[350], top_k=1)
+        assert rows.tolist() == [350]
+
+    def test_save_and_load_round_trip(self, clustered_embeddings, tmp_path):
+        index = IVFIndex.build(clustered_embeddings, n_lists=8, nprobe=3)
+        index.save(tmp_path)
+
+        loaded = IVFIndex.load(tmp_path, clustered_embeddings, **index.params)
+
+        assert loaded.nprobe == 3
+        assert loaded.search(clustered_embeddings[7], 3)[0].tolist() == (
+            index.search(clustered_embeddings[7], 3)[0].tolist()
+        )
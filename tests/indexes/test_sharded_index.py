@@ -0,0 +1,64 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from minirag.indexes import FlatIndex, ShardedIndex
+
+
+@pytest.fixture
+def embeddings():
+    return np.random.default_rng(0).normal(size=(1000, 16)).astype(np.float32)
+
+
+class TestShardedIndex:
+    def test_build_splits_into_fixed_size_shards(self, embeddings):
+        index = ShardedIndex.build(embeddings, shard_size=300)
+
+        assert [len(shard) for shard in index.shards] == [300, 300, 300, 100]
+        assert len(index) == 1000
+
+    def test_build_and_save_normalize_one_shard_at_a_time(self, embeddings, tmp_path):
+        np.save(tmp_path / "embeddings.npy", embeddings)
+        mapped = np.load(tmp_path / "embeddings.npy", mmap_mode="r")
+
+        index = ShardedIndex.build(mapped, shard_size=300)
+        index.save(tmp_path)
+
+        # Shards are still views of the mapped rows, not normalized copies.
+        assert all(isinstance(shard, np.memmap) for shard in index.shards)
+        saved = ShardedIndex.load(tmp_path, mapped)
+        for shard_id in range(len(saved.shards)):
+            norms = np.linalg.norm(saved._shard(shard_id), axis=1)
+            assert norms == pytest.approx(np.ones(len(norms)), abs=1e-6)
+
+    def test_search_matches_exact_search(self, embeddings):
+        index = ShardedIndex.build(embeddings, shard_size=128, workers=4)
+        flat = FlatIndex(embeddings)
+
+        for query in embeddings[::100] + 0.1:
+            rows, scores = index.search(query, top_k=10)
+            exact_rows, exact_scores = flat.search(query, top_k=10)
+
+            assert rows.tolist() == exact_rows.tolist()
+            assert scores == pytest.approx(exact_scores, abs=1e-6)
+
+    def test_ties_resolve_by_row_across_shards(self):
+        index = ShardedIndex.build(np.ones((6, 2), dtype=np.float32), shard_size=2)
+
+        rows, _ = index.search(np.array([1.0, 1.0]), top_k=3)
+
+        assert rows.tolist() == [0, 1, 2]
+
+    def test_loaded_shards_are_memory_mapped_on_first_search(
+        self, embeddings, tmp_path
+    ):
+        ShardedIndex.build(embeddings, shard_size=400).save(tmp_path)
+
+        index = ShardedIndex.load(tmp_path, embeddings, shard_size=50)
+
+        assert index.shard_size == 400
+        assert all(isinstance(shard, Path) for shard in index.shards)
+        rows, _ = index.search(embeddings[950], top_k=1)
+        assert rows.tolist() == [950]
+        assert all(isinstance(shard, np.memmap) for shard in index.shards)
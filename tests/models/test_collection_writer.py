@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from minirag.models import Chunk, Collection
+from minirag.models.collection_writer import CollectionWriter
+
+
+class TestCollectionWriter:
+    def test_append_writes_full_batches_and_keeps_the_rest_pending(self, tmp_path):
+        writer = CollectionWriter(tmp_path, batch_size=2)
+
+        writer.append(
+            [
+                Chunk("a.txt", "first", [1.0, 0.0]),
+                Chunk("a.txt", "second", [0.0, 1.0], chunk_index=1),
+                Chunk("b.pdf", "third", [1.0, 1.0], page_number=3),
+            ]
+        )
+
+        assert writer.count == 2
+        assert len(writer) == 3
+        writer.close()
+
+    def test_finalize_matches_in_memory_collection(self, tmp_path):
+        chunks = [
+            Chunk("a.txt", "first", [1.0, 0.0]),
+            Chunk("b.pdf", "segundo año", [0.0, 1.0], page_number=3),
+            Chunk("a.txt", "third", [1.0, 1.0], chunk_index=1),
+        ]
+        writer = CollectionWriter(tmp_path, "docs", batch_size=2)
+        writer.append(chunks[:1])
+        writer.append(chunks[1:])
+
+        collection = writer.finalize({"sources": ["a.txt", "b.pdf"]})
+        expected = Collection.from_chunks(chunks)
+
+        assert isinstance(collection.embeddings, np.memmap)
+        assert collection.documents == expected.documents
+        assert collection.manifest["sources"] == ["a.txt", "b.pdf"]
+        assert [chunk.chunk_id for chunk in collection] == [
+            chunk.chunk_id for chunk in expected
+        ]
+        assert collection.get_texts() == expected.get_texts()
+        assert list(collection.iter_texts(block_size=2)) == expected.get_texts()
+        assert np.array_equal(collection.embeddings, expected.embeddings)
+        assert np.array_equal(collection.page_numbers, expected.page_numbers)
+
+    def test_resume_drops_rows_written_after_checkpoint(self, tmp_path):
+        writer = CollectionWriter(tmp_path, batch_size=1)
+        writer.append([Chunk("a.txt", "first", [1.0, 0.0])])
+        checkpoint = writer.checkpoint()
+        writer.append([Chunk("b.txt", "lost", [0.0, 1.0])])
+        writer.close()
+
+        writer = CollectionWriter(
+            tmp_path, checkpoint={**checkpoint, "documents": ["a.txt"]}
+        )
+        writer.append([Chunk("c.txt", "second", [1.0, 1.0])])
+        collection = writer.finalize()
+
+        assert collection.documents == ["a.txt", "c.txt"]
+        assert collection.get_texts() == ["first", "second"]
+        assert collection.embeddings.tolist() == [[1.0, 0.0], [1.0, 1.0]]
+
+    def test_append_collection_remaps_document_ids(self, tmp_path):
+        writer = CollectionWriter(tmp_path)
+        writer.append([Chunk("b.txt", "b", [1.0])])
+        writer.append_collection(
+            Collection.from_chunks(
+                [Chunk("a.txt", "a", [2.0]), Chunk("b.txt", "b2", [3.0])]
+            )
+        )
+
+        collection = writer.finalize()
+
+        assert collection.documents == ["b.txt", "a.txt"]
+        assert [chunk.document_name for chunk in collection] == [
+            "b.txt",
+            "a.txt",
+            "b.txt",
+        ]
+
+    def test_finalize_without_chunks(self, tmp_path):
+        collection = CollectionWriter(tmp_path).finalize()
+
+        assert len(collection) == 0
+        assert collection.embeddings.shape == (0, 0)
+
+    def test_append_rejects_mismatched_dimension(self, tmp_path):
+        writer = CollectionWriter(tmp_path, batch_size=1)
+        writer.append([Chunk("a.txt", "a", [1.0, 0.0])])
+
+        with pytest.raises(ValueError, match="dimension"):
+            writer.append([Chunk("a.txt", "b", [1.0])])
+        writer.close()
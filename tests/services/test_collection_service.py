@@ -4,11 +4,24 @@ import shutil
 import tempfile
 from unittest.mock import patch
 
+import numpy as np
+
+from minirag.indexes import (
+    FlatIndex,
+    HNSWIndex,
+    IVFIndex,
+    Int8Index,
+    ShardedIndex,
+)
 from minirag.services.collection_service import CollectionService
-from minirag.models import Chunk
+from minirag.models import Chunk, Collection
 from minirag.services import rag_service
 
 
+def fake_embeddings_batch(texts, *args, **kwargs):
+    return [[0.1, 0.2, 0.3] for _ in texts]
+
+
 class TestCollectionService:
     @pytest.fixture
     def temp_dir(self):
@@ -47,7 +60,9 @@ class TestCollectionService:
 
         # Mock the embedding generation to avoid external dependencies
         with patch.object(
-            rag_service.RagService, "generate_embeddings", return_value=[0.1, 0.2, 0.3]
+            rag_service.RagService,
+            "generate_embeddings_batch",
+            side_effect=fake_embeddings_batch,
         ):
             # Create collection from folder
             collection_service.create_collection(
@@ -55,16 +70,15 @@ class TestCollectionService:
                 collection_name=collection_name,
             )
 
-        # Verify collection file exists
-        collection_file = (
-            Path(collection_service.storage_path) / f"{collection_name}.npy"
-        )
-        assert collection_file.exists()
+        # Verify collection files exist
+        collection_dir = Path(collection_service.storage_path) / collection_name
+        assert (collection_dir / "embeddings.npy").exists()
+        assert (collection_dir / "manifest.json").exists()
 
         # Load and verify collection contents
         collection_service.load_collection(collection_name)
         assert collection_service.active_collection is not None
-        assert isinstance(collection_service.active_collection, list)
+        assert isinstance(collection_service.active_collection, Collection)
         assert all(
             isinstance(chunk, Chunk) for chunk in collection_service.active_collection
         )
@@ -99,6 +113,57 @@ class TestCollectionService:
         assert storage_dir.exists()
         assert storage_dir.is_dir()
 
+    def test_load_collection_memory_maps_float32_embeddings(self, collection_service):
+        chunks = [
+            Chunk("a.pdf", "first page", [1.0, 2.0], chunk_index=0, page_number=1),
+            Chunk("b.txt", "segundo año", [3.0, 4.0], chunk_index=0),
+        ]
+        collection_service._store_embeddings(chunks, "columnar")
+
+        collection_service.load_collection("columnar")
+        collection = collection_service.active_collection
+
+        assert isinstance(collection.embeddings, np.memmap)
+        assert collection.embeddings.dtype == np.float32
+        assert collection.embeddings.shape == (2, 2)
+        assert collection[0].chunk_id == "a.pdf#page-1-chunk-0"
+        assert collection[1].text == "segundo año"
+        assert collection[1].page_number is None
+        assert collection[1].embedding == [3.0, 4.0]
+
+    def test_load_collection_reads_stored_document_centroids(self, collection_service):
+        chunks = [
+            Chunk("a.txt", "first", [2.0, 0.0], chunk_index=0),
+            Chunk("a.txt", "second", [0.0, 3.0], chunk_index=1),
+            Chunk("b.txt", "third", [0.0, -1.0], chunk_index=0),
+        ]
+        collection_service._store_embeddings(chunks, "centroids")
+
+        collection_service.load_collection("centroids")
+        centroids = collection_service.active_collection.document_centroids
+
+        assert (
+            collection_service.storage_path / "centroids" / "document_centroids.npy"
+        ).exists()
+        assert centroids == pytest.approx(
+            np.array([[0.70710677, 0.70710677], [0.0, -1.0]])
+        )
+
+    def test_load_collection_migrates_legacy_file(self, collection_service):
+        legacy_chunk = Chunk("test_doc.txt", "legacy content", [1.0, 0.0])
+        del legacy_chunk.chunk_id
+        legacy_path = Path(collection_service.storage_path) / "legacy.npy"
+        np.save(legacy_path, np.array([legacy_chunk]))
+
+        collection_service.load_collection("legacy")
+
+        assert not legacy_path.exists()
+        assert (Path(collection_service.storage_path) / "legacy").is_dir()
+        assert collection_service.active_collection[0].text == "legacy content"
+        assert collection_service.active_collection[0].chunk_id == (
+            "test_doc.txt#chunk-0"
+        )
+
     def test_load_nonexistent_collection(self, collection_service):
         collection_service.load_collection("nonexistent")
         assert collection_service.active_collection is None
@@ -122,7 +187,9 @@ class TestCollectionService:
     def test_list_collections(self, collection_service, sample_text_files, capsys):
         # Create a few collections first
         with patch.object(
-            rag_service.RagService, "generate_embeddings", return_value=[0.1, 0.2, 0.3]
+            rag_service.RagService,
+            "generate_embeddings_batch",
+            side_effect=fake_embeddings_batch,
         ):
             collection_service.create_collection(
                 doc_paths=[sample_text_files[0]], collection_name="test1"
@@ -141,3 +208,251 @@ class TestCollectionService:
         assert "Available collections:" in captured.out
         assert "test1" in captured.out
         assert "test2" in captured.out
+
+    def test_update_collection_only_reembeds_changed_files(
+        self, collection_service, sample_text_files
+    ):
+        docs_dir = Path(sample_text_files[-1])
+        with patch.object(
+            rag_service.RagService,
+            "generate_embeddings_batch",
+            side_effect=fake_embeddings_batch,
+        ):
+            collection_service.create_collection([str(docs_dir)], "incremental")
+
+        (docs_dir / "test1.txt").write_text("This is the edited document 1.")
+        (docs_dir / "test2.txt").unlink()
+        (docs_dir / "test3.txt").write_text("This is a new document 3.")
+
+        with patch.object(
+            rag_service.RagService,
+            "generate_embeddings_batch",
+            side_effect=fake_embeddings_batch,
+        ) as embeddings:
+            collection_service.update_collection("incremental")
+
+        embedded_texts = [
+            text for call in embeddings.call_args_list for text in call.args[0]
+        ]
+        assert embedded_texts == [
+            "This is the edited document 1.",
+            "This is a new document 3.",
+        ]
+        collection_service.load_collection("incremental")
+        texts = sorted(chunk.text for chunk in collection_service.active_collection)
+        assert texts == ["This is a new document 3.", "This is the edited document 1."]
+
+    def test_create_collection_resumes_from_checkpoint(
+        self, collection_service, sample_text_files
+    ):
+        with (
+            patch.object(
+                rag_service.RagService,
+                "generate_embeddings_batch",
+                side_effect=[[[0.1, 0.2, 0.3]], RuntimeError("backend down")],
+            ),
+            pytest.raises(RuntimeError),
+        ):
+            collection_service.create_collection(sample_text_files[:2], "resumed")
+
+        assert not (collection_service.storage_path / "resumed").exists()
+
+        with patch.object(
+            rag_service.RagService,
+            "generate_embeddings_batch",
+            side_effect=fake_embeddings_batch,
+        ) as embeddings:
+            collection_service.create_collection(sample_text_files[:2], "resumed")
+
+        embeddings.assert_called_once_with(
+            ["This is test document 2."],
+            batch_size=collection_service.embedding_batch_size,
+        )
+        collection_service.load_collection("resumed")
+        collection = collection_service.active_collection
+        assert collection.documents == sample_text_files[:2]
+        assert [
+            (chunk.text, chunk.document_name, chunk.chunk_id) for chunk in collection
+        ] == [
+            (
+                "This is test document 1.",
+                sample_text_files[0],
+                f"{sample_text_files[0]}#chunk-0",
+            ),
+            (
+                "This is test document 2.",
+                sample_text_files[1],
+                f"{sample_text_files[1]}#chunk-0",
+            ),
+        ]
+        assert not (collection_service.storage_path / ".resumed.partial").exists()
+
+    def test_create_collection_restarts_when_checkpointed_file_changed(
+        self, collection_service, sample_text_files
+    ):
+        with (
+            patch.object(
+                rag_service.RagService,
+                "generate_embeddings_batch",
+                side_effect=[[[0.1, 0.2, 0.3]], RuntimeError("backend down")],
+            ),
+            pytest.raises(RuntimeError),
+        ):
+            collection_service.create_collection(sample_text_files[:2], "changed")
+        Path(sample_text_files[0]).write_text("This is edited document 1.")
+
+        with patch.object(
+            rag_service.RagService,
+            "generate_embeddings_batch",
+            side_effect=fake_embeddings_batch,
+        ) as embeddings:
+            collection_service.create_collection(sample_text_files[:2], "changed")
+
+        assert embeddings.call_count == 2
+        collection_service.load_collection("changed")
+        assert len(collection_service.active_collection) == 2
+
+    def test_create_collection_embeds_duplicate_files_once(
+        self, collection_service, temp_dir
+    ):
+        docs_dir = Path(temp_dir) / "share"
+        (docs_dir / "copies").mkdir(parents=True)
+        (docs_dir / "report.txt").write_text("Quarterly report.")
+        (docs_dir / "copies" / "report copy.txt").write_text("Quarterly report.")
+        (docs_dir / "copies" / "notes.md").write_text("Ignored notes.")
+
+        with patch.object(
+            rag_service.RagService,
+            "generate_embeddings_batch",
+            side_effect=fake_embeddings_batch,
+        ) as embeddings:
+            collection_service.create_collection([str(docs_dir)], "deduped")
+
+        embeddings.assert_called_once()
+        collection_service.load_collection("deduped")
+        collection = collection_service.active_collection
+        assert collection.documents == [str(docs_dir / "report.txt")]
+        assert list(collection.manifest["files"]) == [str(docs_dir / "report.txt")]
+
+    def test_update_collection_without_changes_skips_embedding(
+        self, collection_service, sample_text_files, capsys
+    ):
+        with patch.object(
+            rag_service.RagService,
+            "generate_embeddings_batch",
+            side_effect=fake_embeddings_batch,
+        ) as embeddings:
+            collection_service.create_collection([sample_text_files[-1]], "unchanged")
+            embeddings.reset_mock()
+
+            collection_service.update_collection("unchanged")
+
+        embeddings.assert_not_called()
+        assert "Collection unchanged is up to date" in capsys.readouterr().out
+
+    def test_create_collection_persists_ivf_index(self, temp_dir):
+        collection_service = CollectionService(
+            storage_path=temp_dir,
+            index_type="ivf",
+            index_params={"n_lists": 1, "nprobe": 1},
+        )
+        chunks = [
+            Chunk("a.txt", "first", [1.0, 0.0], chunk_index=0),
+            Chunk("a.txt", "second", [0.0, 1.0], chunk_index=1),
+        ]
+        collection_service._store_embeddings(chunks, "indexed")
+
+        collection_service.load_collection("indexed")
+
+        collection = collection_service.active_collection
+        assert (Path(temp_dir) / "indexed" / "ivf_centroids.npy").exists()
+        assert isinstance(collection.index, IVFIndex)
+        with patch.object(
+            rag_service.RagService, "generate_embeddings", return_value=[0.1, 0.9]
+        ):
+            result = rag_service.RagService.retrieve_chunks("query", collection, 1)
+        assert [chunk.text for chunk in result] == ["second"]
+
+    def test_int8_index_reranks_against_memory_mapped_embeddings(self, temp_dir):
+        collection_service = CollectionService(storage_path=temp_dir, index_type="int8")
+        chunks = [
+            Chunk("a.txt", "first", [1.0, 0.0], chunk_index=0),
+            Chunk("a.txt", "second", [0.0, 1.0], chunk_index=1),
+        ]
+        collection_service._store_embeddings(chunks, "quantized")
+
+        collection_service.load_collection("quantized")
+
+        collection = collection_service.active_collection
+        assert isinstance(collection.index, Int8Index)
+        assert isinstance(collection.index.embeddings, np.memmap)
+        with patch.object(
+            rag_service.RagService, "generate_embeddings", return_value=[0.1, 0.9]
+        ):
+            result = rag_service.RagService.retrieve_chunks("query", collection, 1)
+        assert [chunk.text for chunk in result] == ["second"]
+
+    def test_sharded_index_writes_shard_files(self, temp_dir):
+        collection_service = CollectionService(
+            storage_path=temp_dir,
+            index_type="sharded",
+            index_params={"shard_size": 1},
+        )
+        chunks = [
+            Chunk("a.txt", "first", [1.0, 0.0], chunk_index=0),
+            Chunk("a.txt", "second", [0.0, 1.0], chunk_index=1),
+        ]
+        collection_service._store_embeddings(chunks, "sharded")
+
+        collection_service.load_collection("sharded")
+
+        shards_dir = Path(temp_dir) / "sharded" / "shards"
+        assert sorted(path.name for path in shards_dir.iterdir()) == [
+            "shard_00000.npy",
+            "shard_00001.npy",
+        ]
+        collection = collection_service.active_collection
+        assert isinstance(collection.index, ShardedIndex)
+        with patch.object(
+            rag_service.RagService, "generate_embeddings", return_value=[0.1, 0.9]
+        ):
+            result = rag_service.RagService.retrieve_chunks("query", collection, 1)
+        assert [chunk.text for chunk in result] == ["second"]
+
+    def test_load_collection_scans_memory_mapped_rows_in_blocks(self, temp_dir):
+        chunks = [
+            Chunk("a.txt", "first", [1.0, 0.0], chunk_index=0),
+            Chunk("a.txt", "second", [0.0, 1.0], chunk_index=1),
+        ]
+        CollectionService(storage_path=temp_dir)._store_embeddings(chunks, "docs")
+        collection_service = CollectionService(
+            storage_path=temp_dir, index_params={"block_size": 1}
+        )
+
+        collection_service.load_collection("docs")
+
+        index = collection_service.active_collection.index
+        assert isinstance(index, FlatIndex)
+        assert isinstance(index.vectors, np.memmap)
+        assert index.search(np.array([0.1, 0.9]), 1)[0].tolist() == [1]
+
+    def test_create_collection_inserts_into_hnsw_per_document(
+        self, temp_dir, sample_text_files
+    ):
+        collection_service = CollectionService(storage_path=temp_dir, index_type="hnsw")
+        with (
+            patch.object(
+                rag_service.RagService,
+                "generate_embeddings_batch",
+                side_effect=fake_embeddings_batch,
+            ),
+            patch.object(
+                HNSWIndex, "add", autospec=True, side_effect=HNSWIndex.add
+            ) as add,
+        ):
+            collection_service.create_collection([sample_text_files[-1]], "graph")
+
+        assert add.call_count == 2
+        collection_service.load_collection("graph")
+        assert isinstance(collection_service.active_collection.index, HNSWIndex)
+        assert len(collection_service.active_collection.index) == 2
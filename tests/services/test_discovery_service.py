@@ -0,0 +1,86 @@
+from pathlib import Path
+
+import pytest
+
+from minirag.services.discovery_service import DiscoveryService
+
+
+class TestDiscoveryService:
+    @pytest.fixture
+    def docs_dir(self, tmp_path):
+        (tmp_path / "reports" / "2024").mkdir(parents=True)
+        (tmp_path / "drafts").mkdir()
+        (tmp_path / "notes.txt").write_text("notes")
+        (tmp_path / "image.png").write_bytes(b"\x89PNG")
+        (tmp_path / "reports" / "summary.pdf").write_bytes(b"%PDF summary")
+        (tmp_path / "reports" / "2024" / "q1.txt").write_text("first quarter")
+        (tmp_path / "reports" / "2024" / "big.txt").write_text("x" * 2048)
+        (tmp_path / "drafts" / "draft.txt").write_text("draft")
+        return tmp_path
+
+    def relative(self, paths: list[str], root: Path) -> list[str]:
+        return [str(Path(path).relative_to(root)) for path in paths]
+
+    def test_find_documents_walks_folders_recursively(self, docs_dir):
+        found = DiscoveryService.find_documents([str(docs_dir)])
+
+        assert self.relative(found, docs_dir) == [
+            "notes.txt",
+            "drafts/draft.txt",
+            "reports/summary.pdf",
+            "reports/2024/big.txt",
+            "reports/2024/q1.txt",
+        ]
+
+    def test_find_documents_applies_patterns_and_size_limit(self, docs_dir):
+        found = DiscoveryService.find_documents(
+            [str(docs_dir)],
+            include=["*.txt"],
+            exclude=["drafts"],
+            max_file_size=1024,
+        )
+
+        assert self.relative(found, docs_dir) == ["notes.txt", "reports/2024/q1.txt"]
+
+    def test_find_documents_keeps_explicit_files(self, docs_dir):
+        image_path = str(docs_dir / "image.png")
+
+        found = DiscoveryService.find_documents(
+            [image_path, image_path], exclude=["*.png"]
+        )
+
+        assert found == [image_path]
+
+    def test_iter_unique_documents_skips_duplicates_and_missing(self, tmp_path, capsys):
+        for name, text in [("a.txt", "same"), ("b.txt", "other"), ("c.txt", "same")]:
+            (tmp_path / name).write_text(text)
+        doc_paths = [
+            str(tmp_path / name) for name in ("a.txt", "missing.txt", "b.txt", "c.txt")
+        ]
+
+        unique = list(DiscoveryService.iter_unique_documents(doc_paths, workers=2))
+
+        assert [doc_path for doc_path, _ in unique] == [doc_paths[0], doc_paths[2]]
+        assert unique[0][1]["size"] == 4
+        output = capsys.readouterr().out
+        assert f"Skipping unreadable document: {doc_paths[1]}" in output
+
+    def test_iter_unique_documents_reuses_unchanged_fingerprints(
+        self, tmp_path, mocker
+    ):
+        doc_path = tmp_path / "a.txt"
+        doc_path.write_text("content")
+        stat = doc_path.stat()
+        previous = {"size": stat.st_size, "mtime": stat.st_mtime, "sha256": "abc"}
+        hash_document = mocker.patch(
+            "minirag.services.document_service.DocumentService.hash_document"
+        )
+
+        unique = list(
+            DiscoveryService.iter_unique_documents(
+                [str(doc_path)], {str(doc_path): previous}
+            )
+        )
+
+        assert unique == [(str(doc_path), previous)]
+        hash_document.assert_not_called()
@@ -1,3 +1,4 @@
+import fitz
 import pytest
 from unittest.mock import mock_open, patch, MagicMock
 from minirag.services.document_service import DocumentService
@@ -40,10 +41,10 @@ def test_process_document_adds_chunk_metadata():
             DocumentService, "read_document_pages", return_value=[(None, "content")]
         ),
         patch(
-            "minirag.services.document_service.RagService.generate_embeddings"
+            "minirag.services.document_service.RagService.generate_embeddings_batch"
         ) as embeddings,
     ):
-        embeddings.return_value = [0.1, 0.2, 0.3]
+        embeddings.return_value = [[0.1, 0.2, 0.3]]
 
         result = DocumentService.process_document("sample.txt")
 
@@ -94,3 +95,55 @@ def test_read_pdf_document_general_error():
     with patch("fitz.open", side_effect=Exception("Some error")):
         result = DocumentService.read_pdf_document("error.pdf")
         assert result == ""
+
+
+def test_process_document_embeds_chunks_in_batches():
+    with (
+        patch.object(
+            DocumentService,
+            "read_document_pages",
+            return_value=[(1, "first page"), (2, "second page")],
+        ),
+        patch(
+            "minirag.services.document_service.RagService.generate_embeddings_batch"
+        ) as embeddings,
+    ):
+        embeddings.return_value = [[0.1, 0.2], [0.3, 0.4]]
+
+        result = DocumentService.process_document("sample.pdf", batch_size=8)
+
+    embeddings.assert_called_once_with(["first page", "second page"], batch_size=8)
+    assert [chunk.chunk_id for chunk in result] == [
+        "sample.pdf#page-1-chunk-0",
+        "sample.pdf#page-2-chunk-1",
+    ]
+    assert result[1].embedding == [0.3, 0.4]
+
+
+def test_read_pdf_pages_in_parallel_keeps_page_order(tmp_path, monkeypatch):
+    pdf_path = str(tmp_path / "report.pdf")
+    with fitz.open() as doc:
+        for page_number in range(1, 21):
+            doc.new_page().insert_text((72, 72), f"Page {page_number} content")
+        doc.save(pdf_path)
+    monkeypatch.setattr("minirag.services.document_service.PARALLEL_PDF_MIN_PAGES", 10)
+    monkeypatch.setattr("minirag.services.document_service.MIN_PAGES_PER_RANGE", 3)
+
+    result = DocumentService.read_pdf_pages(pdf_path, workers=2)
+
+    assert result == DocumentService.read_pdf_pages(pdf_path)
+    assert result[0] == (1, "Page 1 content")
+    assert [page_number for page_number, _ in result] == list(range(1, 21))
+
+
+def test_read_pdf_pages_keeps_small_pdfs_sequential(tmp_path):
+    pdf_path = str(tmp_path / "short.pdf")
+    with fitz.open() as doc:
+        doc.new_page().insert_text((72, 72), "Only page")
+        doc.save(pdf_path)
+
+    with patch("minirag.services.document_service.ProcessPoolExecutor") as executor:
+        result = DocumentService.read_pdf_pages(pdf_path, workers=4)
+
+    executor.assert_not_called()
+    assert result == [(1, "Only page")]
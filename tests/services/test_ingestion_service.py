@@ -0,0 +1,83 @@
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from minirag.services import rag_service
+from minirag.services.document_service import DocumentService
+from minirag.services.ingestion_service import IngestionPipeline
+
+
+def fake_embeddings_batch(texts, *args, **kwargs):
+    return [[float(len(text)), 1.0] for text in texts]
+
+
+@pytest.fixture
+def doc_paths(tmp_path):
+    paths = []
+    for doc_number in range(4):
+        doc_path = tmp_path / f"doc{doc_number}.txt"
+        doc_path.write_text(" ".join([f"word{doc_number}"] * (60 * (doc_number + 1))))
+        paths.append(str(doc_path))
+    return paths
+
+
+def test_pipeline_matches_sequential_processing(doc_paths):
+    with patch.object(
+        rag_service.RagService,
+        "generate_embeddings_batch",
+        side_effect=fake_embeddings_batch,
+    ):
+        sequential = []
+        for doc_path in doc_paths:
+            sequential.extend(DocumentService.process_document(doc_path))
+        pipelined = IngestionPipeline(
+            read_workers=2,
+            embedding_concurrency=3,
+            batch_size=2,
+            queue_size=1,
+        ).run(doc_paths)
+
+    assert len(pipelined) > len(doc_paths)
+    assert [chunk.chunk_id for chunk in pipelined] == [
+        chunk.chunk_id for chunk in sequential
+    ]
+    assert pipelined == sequential
+
+
+def test_pipeline_raises_embedding_errors(doc_paths):
+    with (
+        patch.object(
+            rag_service.RagService,
+            "generate_embeddings_batch",
+            side_effect=ConnectionError("backend unavailable"),
+        ),
+        pytest.raises(ConnectionError, match="backend unavailable"),
+    ):
+        IngestionPipeline(read_workers=2, queue_size=1, batch_size=1).run(doc_paths)
+
+
+def test_pipeline_stops_reading_when_closed_early(tmp_path):
+    doc_paths = []
+    for doc_number in range(20):
+        doc_path = tmp_path / f"doc{doc_number}.txt"
+        doc_path.write_text(f"This is document {doc_number}.")
+        doc_paths.append(str(doc_path))
+
+    submit = ProcessPoolExecutor.submit
+    with (
+        patch.object(
+            rag_service.RagService,
+            "generate_embeddings_batch",
+            side_effect=fake_embeddings_batch,
+        ),
+        patch.object(
+            ProcessPoolExecutor, "submit", autospec=True, side_effect=submit
+        ) as submitted,
+    ):
+        documents = IngestionPipeline(read_workers=1).iter_documents(doc_paths)
+        first_document = next(documents)
+        documents.close()
+
+    assert first_document[0].document_name == doc_paths[0]
+    assert submitted.call_count < len(doc_paths)
@@ -0,0 +1,142 @@
+import json
+import threading
+
+import pytest
+
+from minirag.services.collection_service import CollectionService, IngestionCancelled
+from minirag.services.job_service import IngestionJobQueue
+
+
+class TestIngestionJobQueue:
+    @pytest.fixture
+    def collection_service(self, tmp_path):
+        return CollectionService(storage_path=str(tmp_path))
+
+    @pytest.fixture
+    def job_queue(self, collection_service):
+        return IngestionJobQueue(collection_service)
+
+    def test_submit_persists_queued_job(self, job_queue, mocker):
+        mocker.patch.object(job_queue, "start")
+
+        job = job_queue.submit(["docs/a.txt"], "docs")
+
+        with open(job_queue.path) as f:
+            stored = json.load(f)
+        assert stored[0]["job_id"] == job.job_id
+        assert stored[0]["status"] == "queued"
+        assert stored[0]["doc_paths"] == ["docs/a.txt"]
+
+    def test_submit_rejects_empty_name_and_documents(self, job_queue):
+        with pytest.raises(ValueError, match="name"):
+            job_queue.submit(["docs/a.txt"], "")
+        with pytest.raises(ValueError, match="documents"):
+            job_queue.submit([], "docs")
+
+        assert job_queue.jobs == []
+
+    def test_interrupted_running_job_is_queued_again(self, job_queue, mocker):
+        mocker.patch.object(job_queue, "start")
+        job = job_queue.submit(["docs/a.txt"], "docs")
+        job_queue._next_job()
+
+        reloaded = IngestionJobQueue(job_queue.collection_service)
+
+        assert reloaded.get_job(job.job_id).status == "queued"
+
+    def test_run_job_records_progress(self, job_queue, collection_service, mocker):
+        def create_collection(doc_paths, name, progress, cancel_event):
+            progress(1, 4, 10)
+            progress(3, 4, 30)
+
+        mocker.patch.object(
+            collection_service, "create_collection", side_effect=create_collection
+        )
+        mocker.patch.object(job_queue, "start")
+        job = job_queue.submit(["docs"], "docs")
+
+        job_queue.run_job(job_queue._next_job())
+
+        assert job.status == "done"
+        assert (job.documents_done, job.documents_total, job.chunks_done) == (3, 4, 30)
+        assert (job.documents_resumed, job.chunks_resumed) == (1, 10)
+
+    def test_run_job_swaps_active_collection(
+        self, job_queue, collection_service, mocker
+    ):
+        mocker.patch.object(collection_service, "create_collection")
+        load_collection = mocker.patch.object(collection_service, "load_collection")
+        collection_service.active_collection = mocker.Mock()
+        collection_service.active_collection.name = "docs"
+        mocker.patch.object(job_queue, "start")
+        job_queue.submit(["docs"], "docs")
+
+        job_queue.run_job(job_queue._next_job())
+
+        load_collection.assert_called_once_with("docs")
+
+    def test_run_job_records_failure(self, job_queue, collection_service, mocker):
+        mocker.patch.object(
+            collection_service,
+            "create_collection",
+            side_effect=RuntimeError("backend down"),
+        )
+        mocker.patch.object(job_queue, "start")
+        job = job_queue.submit(["docs"], "docs")
+
+        job_queue.run_job(job_queue._next_job())
+
+        assert job.status == "failed"
+        assert job.error == "backend down"
+
+    def test_run_job_fails_when_folder_has_no_documents(
+        self, job_queue, tmp_path, mocker
+    ):
+        empty_dir = tmp_path / "empty"
+        empty_dir.mkdir()
+        mocker.patch.object(job_queue, "start")
+        job = job_queue.submit([str(empty_dir)], "docs")
+
+        job_queue.run_job(job_queue._next_job())
+
+        assert job.status == "failed"
+        assert job.error == f"No documents found in {empty_dir}"
+
+    def test_cancel_queued_job(self, job_queue, mocker):
+        mocker.patch.object(job_queue, "start")
+        job = job_queue.submit(["docs"], "docs")
+
+        assert job_queue.cancel(job.job_id)
+        assert job.status == "cancelled"
+        assert job_queue._next_job() is None
+        assert not job_queue.cancel(job.job_id)
+
+    def test_cancel_running_job_stops_create_collection(
+        self, job_queue, collection_service, mocker
+    ):
+        def create_collection(doc_paths, name, progress, cancel_event):
+            job_queue.cancel(job.job_id)
+            assert cancel_event.is_set()
+            raise IngestionCancelled(name)
+
+        mocker.patch.object(
+            collection_service, "create_collection", side_effect=create_collection
+        )
+        mocker.patch.object(job_queue, "start")
+        job = job_queue.submit(["docs"], "docs")
+
+        job_queue.run_job(job_queue._next_job())
+
+        assert job.status == "cancelled"
+
+    def test_worker_runs_submitted_jobs(self, job_queue, collection_service, mocker):
+        finished = threading.Event()
+        mocker.patch.object(
+            collection_service,
+            "create_collection",
+            side_effect=lambda *args, **kwargs: finished.set(),
+        )
+
+        job_queue.submit(["docs"], "docs")
+
+        assert finished.wait(timeout=5)
@@ -1,9 +1,10 @@
+import numpy as np
 import pytest
 
-from minirag.services.rag_service import RagService
+from minirag.services.rag_service import DEFAULT_EMBEDDING_BATCH_SIZE, RagService
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
-from minirag.models import Chunk
+from minirag.models import Chunk, Collection, RetrievalFilter
 
 
 class TestRagService:
@@ -46,6 +47,26 @@ class TestRagService:
             "This is a test text", "custom-model"
         )
 
+    def test_generate_embeddings_batch_splits_requests(self, mocker):
+        mock_backend = mocker.MagicMock()
+        mock_backend.generate_embeddings_batch.side_effect = lambda texts, _: [
+            [float(len(text))] for text in texts
+        ]
+        mocker.patch(
+            "minirag.services.rag_service.get_backend_instance",
+            return_value=mock_backend,
+        )
+
+        embeddings = RagService.generate_embeddings_batch(
+            ["a", "bb", "ccc"], batch_size=2
+        )
+
+        assert embeddings == [[1.0], [2.0], [3.0]]
+        assert mock_backend.generate_embeddings_batch.call_args_list == [
+            mocker.call(["a", "bb"], ""),
+            mocker.call(["ccc"], ""),
+        ]
+
     def test_similarity_search(self, mocker):
         # Mock generate_embeddings
         mock_generate_embeddings = mocker.patch.object(
@@ -134,3 +155,237 @@ class TestRagService:
         RagService.similarity_search("test query", chunks, top_k=1)
 
         assert [chunk.text for chunk in chunks] == ["First chunk", "Second chunk"]
+
+    def test_retrieve_chunks_reuses_collection_index(self, mocker):
+        mocker.patch.object(
+            RagService,
+            "generate_embeddings",
+            return_value=[1.0, 0.0, 0.0],
+        )
+        collection = Collection.from_chunks(
+            [
+                Chunk("test_doc.txt", "First chunk", [0.2, 0.7, 0.1]),
+                Chunk("test_doc.txt", "Second chunk", [0.8, 0.1, 0.1], chunk_index=1),
+            ]
+        )
+
+        first = RagService.retrieve_chunks("test query", collection, top_k=1)
+        index = collection.index
+        second = RagService.retrieve_chunks("test query", collection, top_k=1)
+
+        assert index is not None
+        assert collection.index is index
+        assert [chunk.text for chunk in first] == ["Second chunk"]
+        assert second[0].chunk_id == "test_doc.txt#chunk-1"
+
+    def test_retrieve_chunks_lexical_mode_skips_embedding(self, mocker):
+        generate_embeddings = mocker.patch.object(RagService, "generate_embeddings")
+        chunks = [
+            Chunk("test_doc.txt", "The runner belongs to club MPT", [0.0, 1.0]),
+            Chunk("test_doc.txt", "The race starts at noon", [1.0, 0.0]),
+        ]
+
+        result = RagService.retrieve_chunks("which club?", chunks, mode="lexical")
+
+        generate_embeddings.assert_not_called()
+        assert result == [chunks[0]]
+        assert RagService.last_index_name == "bm25"
+        assert RagService.last_query_embedding is None
+
+    def test_retrieve_chunks_keeps_query_embedding(self, mocker):
+        mocker.patch.object(RagService, "generate_embeddings", return_value=[1.0, 0.0])
+        chunks = [Chunk("test_doc.txt", "content", [1.0, 0.0])]
+
+        RagService.retrieve_chunks("query", chunks)
+
+        assert RagService.last_query_embedding == [1.0, 0.0]
+
+    def test_retrieve_chunks_hybrid_mode_fuses_rankings(self, mocker):
+        mocker.patch.object(
+            RagService,
+            "generate_embeddings",
+            return_value=[1.0, 0.0],
+        )
+        chunks = [
+            Chunk("test_doc.txt", "The weather today", [1.0, 0.0]),
+            Chunk("test_doc.txt", "Club race, the club race", [0.0, 1.0]),
+            Chunk("test_doc.txt", "Club meeting", [0.9, 0.1]),
+        ]
+
+        result = RagService.retrieve_chunks("club race", chunks, top_k=2, mode="hybrid")
+
+        assert [chunk.text for chunk in result] == [
+            "Club race, the club race",
+            "Club meeting",
+        ]
+        assert RagService.last_index_name == "flat+bm25"
+
+    def test_retrieve_chunks_rejects_unknown_mode(self):
+        chunks = [Chunk("test_doc.txt", "content", [1.0])]
+
+        with pytest.raises(ValueError, match="Unknown retrieval mode"):
+            RagService.retrieve_chunks("query", chunks, mode="fuzzy")
+
+    def test_retrieve_many_embeds_queries_in_one_batch(self, mocker):
+        generate_embeddings_batch = mocker.patch.object(
+            RagService,
+            "generate_embeddings_batch",
+            return_value=[[1.0, 0.0], [0.0, 1.0]],
+        )
+        collection = Collection.from_chunks(
+            [
+                Chunk("test_doc.txt", "first", [0.9, 0.1]),
+                Chunk("test_doc.txt", "second", [0.1, 0.9]),
+            ]
+        )
+
+        results = RagService.retrieve_many(["q1", "q2"], collection, top_k=1)
+
+        generate_embeddings_batch.assert_called_once_with(
+            ["q1", "q2"], batch_size=DEFAULT_EMBEDDING_BATCH_SIZE
+        )
+        assert [[chunk.text for chunk in chunks] for chunks in results] == [
+            ["first"],
+            ["second"],
+        ]
+
+    def test_retrieve_many_matches_retrieve_chunks(self, mocker):
+        rng = np.random.default_rng(0)
+        query_embeddings = rng.normal(size=(3, 8)).tolist()
+        collection = Collection.from_chunks(
+            [
+                Chunk("test_doc.txt", f"chunk {row}", embedding)
+                for row, embedding in enumerate(rng.normal(size=(20, 8)).tolist())
+            ]
+        )
+        mocker.patch.object(
+            RagService, "generate_embeddings_batch", return_value=query_embeddings
+        )
+        mocker.patch.object(
+            RagService, "generate_embeddings", side_effect=query_embeddings
+        )
+
+        results = RagService.retrieve_many(["a", "b", "c"], collection, top_k=4)
+
+        for query, chunks in zip(["a", "b", "c"], results):
+            expected = RagService.retrieve_chunks(query, collection, top_k=4)
+            assert [chunk.text for chunk in chunks] == [c.text for c in expected]
+
+    def test_select_mmr_skips_near_duplicates(self):
+        candidate_vectors = np.array(
+            [[1.0, 0.0], [0.999, 0.045], [0.8, 0.6]], dtype=np.float32
+        )
+        relevance = np.array([0.99, 0.98, 0.8], dtype=np.float32)
+
+        assert RagService.select_mmr(candidate_vectors, relevance, 2, 0.5).tolist() == [
+            0,
+            2,
+        ]
+        assert RagService.select_mmr(candidate_vectors, relevance, 2, 1.0).tolist() == [
+            0,
+            1,
+        ]
+
+    def test_retrieve_chunks_with_mmr_returns_distinct_chunks(self, mocker):
+        mocker.patch.object(RagService, "generate_embeddings", return_value=[1.0, 0.0])
+        collection = Collection.from_chunks(
+            [
+                Chunk("test_doc.txt", "chunk a", [1.0, 0.0]),
+                Chunk("test_doc.txt", "chunk a, overlapping", [0.999, 0.045]),
+                Chunk("test_doc.txt", "chunk b", [0.8, 0.6]),
+                Chunk("test_doc.txt", "unrelated", [0.0, 1.0]),
+            ]
+        )
+
+        result = RagService.retrieve_chunks(
+            "query", collection, top_k=2, mmr_lambda=0.3, mmr_candidates=3
+        )
+
+        assert [chunk.text for chunk in result] == ["chunk a", "chunk b"]
+        assert result[1].similarity == pytest.approx(0.8)
+
+    def test_retrieve_chunks_scores_only_filtered_rows(self, mocker):
+        mocker.patch.object(RagService, "generate_embeddings", return_value=[1.0, 0.0])
+        get_embeddings = mocker.spy(RagService, "get_embeddings")
+        collection = Collection.from_chunks(
+            [
+                Chunk("docs/report.pdf", "p1", [1.0, 0.0], page_number=1),
+                Chunk("docs/report.pdf", "p4", [0.6, 0.8], page_number=4),
+                Chunk("docs/other.pdf", "other", [1.0, 0.0], page_number=4),
+                Chunk("docs/report.pdf", "p12", [0.9, 0.1], page_number=12),
+            ]
+        )
+
+        result = RagService.retrieve_chunks(
+            "query",
+            collection,
+            top_k=3,
+            retrieval_filter=RetrievalFilter(documents=["report.pdf"], pages=(3, 10)),
+        )
+
+        assert [chunk.text for chunk in result] == ["p4"]
+        assert get_embeddings.call_args.args[1].tolist() == [1]
+
+    def test_retrieve_chunks_lexical_filter_by_document(self):
+        chunks = [
+            Chunk("a.txt", "club MPT", [1.0]),
+            Chunk("b.txt", "club MPT runner", [1.0]),
+        ]
+
+        result = RagService.retrieve_chunks(
+            "club",
+            chunks,
+            mode="lexical",
+            retrieval_filter=RetrievalFilter(documents=["b.txt"]),
+        )
+
+        assert [chunk.document_name for chunk in result] == ["b.txt"]
+
+    def test_retrieve_chunks_with_empty_filter_match_returns_nothing(self, mocker):
+        generate_embeddings = mocker.patch.object(RagService, "generate_embeddings")
+        chunks = [Chunk("a.txt", "content", [1.0])]
+
+        result = RagService.retrieve_chunks(
+            "query", chunks, retrieval_filter=RetrievalFilter(documents=["b.txt"])
+        )
+
+        assert result == []
+        generate_embeddings.assert_not_called()
+
+    def test_retrieve_chunks_hierarchical_scores_closest_documents_only(self, mocker):
+        mocker.patch.object(RagService, "generate_embeddings", return_value=[1.0, 0.0])
+        get_embeddings = mocker.spy(RagService, "get_embeddings")
+        collection = Collection.from_chunks(
+            [
+                Chunk("near.txt", "near a", [1.0, 0.1]),
+                Chunk("far.txt", "far", [0.0, 1.0]),
+                Chunk("near.txt", "near b", [1.0, -0.2]),
+                Chunk("mixed.txt", "outlier", [1.0, 0.0]),
+                Chunk("mixed.txt", "mixed", [-1.0, 1.0]),
+            ]
+        )
+
+        result = RagService.retrieve_chunks(
+            "query", collection, top_k=3, mode="hierarchical", top_documents=1
+        )
+
+        assert [chunk.text for chunk in result] == ["near a", "near b"]
+        assert get_embeddings.call_args.args[1].tolist() == [0, 2]
+        assert RagService.last_index_name == "hierarchical"
+
+    def test_retrieve_chunks_hierarchical_respects_filter(self, mocker):
+        mocker.patch.object(RagService, "generate_embeddings", return_value=[1.0, 0.0])
+        chunks = [
+            Chunk("near.txt", "near", [1.0, 0.0]),
+            Chunk("far.txt", "far", [0.0, 1.0]),
+        ]
+
+        result = RagService.retrieve_chunks(
+            "query",
+            chunks,
+            mode="hierarchical",
+            top_documents=1,
+            retrieval_filter=RetrievalFilter(documents=["far.txt"]),
+        )
+
+        assert [chunk.text for chunk in result] == ["far"]
@@ -85,3 +85,31 @@ class TestChat:
         result = chat.build_retrieval_query("y qué carrera es?", session)
 
         assert result == "a qué equipo pertenece el corredor?\ny qué carrera es?"
+
+    def test_build_retrieval_embedding_embeds_each_message_once(self, mocker):
+        embeddings = {"first": [1.0, 0.0], "second": [0.0, 2.0], "third": [0.0, 1.0]}
+        embed_query = mocker.patch(
+            "minirag.chat.RagService.embed_query", side_effect=embeddings.get
+        )
+        session = ChatSession()
+
+        chat.build_retrieval_embedding("first", session)
+        chat.add_msg_to_memory(session, "first", "answer")
+        result = chat.build_retrieval_embedding("second", session, decay=0.5)
+        chat.add_msg_to_memory(session, "second", "answer")
+        chat.build_retrieval_embedding("third", session)
+
+        assert result == [0.5, 1.0]
+        assert [call.args[0] for call in embed_query.call_args_list] == [
+            "first",
+            "second",
+            "third",
+        ]
+
+    def test_clear_conversation_drops_cached_query_embeddings(self):
+        session = ChatSession()
+        session.query_embeddings["hello"] = [1.0]
+
+        chat.clear_conversation(session)
+
+        assert session.query_embeddings == {}
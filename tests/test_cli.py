@@ -1,4 +1,9 @@
+import json
+
+import pytest
+
 import minirag.cli as cli
+from minirag.models import IngestionJob
 
 
 class TestCli:
@@ -74,7 +79,9 @@ class TestCli:
             "/retrieve test question", "llama3.1:8b", session, top_k=3
         )
 
-        retrieve_chunks.assert_called_once_with("test question", session, 3)
+        retrieve_chunks.assert_called_once_with(
+            "test question", session, 3, cli.RetrievalFilter()
+        )
         show_retrieved_chunks.assert_called_once_with([])
 
     def test_parse_arguments_accepts_top_k(self, monkeypatch):
@@ -83,3 +90,204 @@ class TestCli:
         args = cli.parse_arguments()
 
         assert args.top_k == 3
+
+    def test_update_command_updates_collection(self, mocker):
+        update_collection = mocker.patch.object(
+            cli.collection_service, "update_collection"
+        )
+
+        cli.handle_user_query("/update docs", "llama3.1:8b", self.session())
+
+        update_collection.assert_called_once_with("docs")
+
+    def test_retrieve_command_reports_serving_index(self, mocker, capsys):
+        chunk = cli.Chunk("doc.txt", "content", [1.0])
+        mocker.patch("minirag.cli.retrieve_chunks_for_query", return_value=[chunk])
+        mocker.patch.object(cli.RagService, "last_index_name", "hnsw")
+
+        cli.handle_user_query("/retrieve question", "llama3.1:8b", self.session())
+
+        assert "Served by: hnsw index" in capsys.readouterr().out
+
+    def test_run_batch_queries_writes_jsonl_results(self, mocker, tmp_path):
+        queries_path = tmp_path / "queries.jsonl"
+        output_path = tmp_path / "results.jsonl"
+        queries_path.write_text('{"id": 1, "query": "first"}\n{"query": "second"}\n')
+        chunk = cli.Chunk("doc.txt", "content", [1.0], chunk_id="doc.txt#chunk-0")
+        mocker.patch.object(cli.collection_service, "load_collection")
+        mocker.patch.object(cli.collection_service, "active_collection", [chunk])
+        retrieve_many = mocker.patch.object(
+            cli.RagService, "retrieve_many", return_value=[[chunk], []]
+        )
+
+        cli.run_batch_queries(str(queries_path), str(output_path), "docs", top_k=2)
+
+        assert retrieve_many.call_args.args[0] == ["first", "second"]
+        lines = [json.loads(line) for line in output_path.read_text().splitlines()]
+        assert lines[0]["id"] == 1
+        assert lines[0]["results"][0]["chunk_id"] == "doc.txt#chunk-0"
+        assert lines[1] == {"query": "second", "results": []}
+
+    def test_batch_queries_requires_output_and_collection(self, monkeypatch):
+        monkeypatch.setattr("sys.argv", ["minirag", "--batch-queries", "q.jsonl"])
+
+        with pytest.raises(SystemExit):
+            cli.parse_arguments()
+
+    def test_status_reports_query_cache_counters(self, mocker, capsys):
+        query_cache = cli.QueryEmbeddingCache(max_entries=8)
+        query_cache.put("ollama", "", "question", [1.0])
+        query_cache.get("ollama", "", "question")
+        query_cache.get("ollama", "", "other")
+        mocker.patch("minirag.cli.get_query_cache", return_value=query_cache)
+
+        cli.handle_user_query("/status", "llama3.1:8b", self.session())
+
+        assert "Query embedding cache: 1 hits, 1 misses (1/8 entries)." in (
+            capsys.readouterr().out
+        )
+
+    def test_vector_history_passes_combined_query_embedding(self, mocker):
+        mocker.patch.object(cli.collection_service, "active_collection", ["chunk"])
+        mocker.patch.object(cli.retrieval_options, "history", "vector")
+        mocker.patch("minirag.cli.build_retrieval_embedding", return_value=[0.5, 1.0])
+        retrieve_chunks = mocker.patch.object(
+            cli.RagService, "retrieve_chunks", return_value=[]
+        )
+
+        cli.retrieve_chunks_for_query("question", self.session())
+
+        assert retrieve_chunks.call_args.kwargs["query_embedding"] == [0.5, 1.0]
+
+    def test_answer_cache_hit_skips_generation(self, mocker, capsys, tmp_path):
+        chunk = cli.Chunk("doc.txt", "CLUB: MPT", [1.0], chunk_id="doc.txt#chunk-0")
+        collection = mocker.MagicMock()
+        collection.name = "docs"
+        answer_cache = cli.AnswerCache(str(tmp_path / "answers.sqlite3"))
+        mocker.patch.object(cli.collection_service, "active_collection", collection)
+        mocker.patch("minirag.cli.get_answer_cache", return_value=answer_cache)
+        mocker.patch("minirag.cli.retrieve_chunks_for_query", return_value=[chunk])
+        mocker.patch.object(cli.RagService, "last_query_embedding", [1.0, 0.0])
+        embed_query = mocker.patch.object(cli.RagService, "embed_query")
+        generate_response = mocker.patch(
+            "minirag.cli.generate_response", return_value="MPT"
+        )
+        session = self.session()
+
+        cli.handle_user_query("What club?", "llama3.1:8b", session)
+        cli.handle_user_query("What club?", "llama3.1:8b", session)
+
+        embed_query.assert_not_called()
+        generate_response.assert_called_once()
+        assert (session.answer_cache_hits, session.answer_cache_misses) == (1, 1)
+        assert capsys.readouterr().out.strip().endswith("MPT")
+        answer_cache.close()
+
+    def test_answer_cache_matches_exact_question_without_embedding(
+        self, mocker, tmp_path
+    ):
+        chunk = cli.Chunk("doc.txt", "CLUB: MPT", [1.0], chunk_id="doc.txt#chunk-0")
+        collection = mocker.MagicMock()
+        collection.name = "docs"
+        answer_cache = cli.AnswerCache(str(tmp_path / "answers.sqlite3"))
+        mocker.patch.object(cli.collection_service, "active_collection", collection)
+        mocker.patch("minirag.cli.get_answer_cache", return_value=answer_cache)
+        mocker.patch("minirag.cli.retrieve_chunks_for_query", return_value=[chunk])
+        mocker.patch.object(cli.RagService, "last_query_embedding", None)
+        embed_query = mocker.patch.object(cli.RagService, "embed_query")
+        mocker.patch("minirag.cli.generate_response", return_value="MPT")
+        session = self.session()
+
+        cli.handle_user_query("What club?", "llama3.1:8b", session)
+        cli.handle_user_query("Which club?", "llama3.1:8b", session)
+        cli.handle_user_query("What club?", "llama3.1:8b", session)
+
+        embed_query.assert_not_called()
+        assert (session.answer_cache_hits, session.answer_cache_misses) == (1, 2)
+        answer_cache.close()
+
+    def test_parse_retrieval_filter_reads_leading_options(self):
+        retrieval_filter, query = cli.parse_retrieval_filter(
+            '--doc "annual report.pdf" --pages 3-10 what\'s the revenue?'
+        )
+
+        assert retrieval_filter == cli.RetrievalFilter(
+            documents=["annual report.pdf"], pages=(3, 10)
+        )
+        assert query == "what's the revenue?"
+
+    def test_retrieve_rejects_invalid_page_range(self, mocker, capsys):
+        retrieve_chunks = mocker.patch("minirag.cli.retrieve_chunks_for_query")
+
+        cli.handle_user_query("/retrieve --pages 10-3 q", "llama3.1:8b", self.session())
+
+        retrieve_chunks.assert_not_called()
+        assert "Invalid page range: 10-3" in capsys.readouterr().out
+
+    def test_add_command_submits_background_job(self, mocker, capsys, tmp_path):
+        (tmp_path / "a.txt").write_text("Document A.")
+        mocker.patch("minirag.cli.get_documents", return_value=[str(tmp_path)])
+        mocker.patch("minirag.cli.prompt", return_value="docs")
+        job_queue = mocker.Mock()
+        job_queue.submit.return_value.job_id = "abc123"
+        mocker.patch("minirag.cli.get_job_queue", return_value=job_queue)
+
+        cli.handle_user_query("/add", "llama3.1:8b", self.session())
+
+        job_queue.submit.assert_called_once_with([str(tmp_path)], "docs")
+        assert "Job abc123 queued" in capsys.readouterr().out
+
+    def test_add_command_rejects_missing_documents(self, mocker, capsys, tmp_path):
+        mocker.patch(
+            "minirag.cli.get_documents", return_value=[str(tmp_path / "missing.txt")]
+        )
+        job_queue = mocker.Mock()
+        mocker.patch("minirag.cli.get_job_queue", return_value=job_queue)
+
+        cli.handle_user_query("/add", "llama3.1:8b", self.session())
+
+        job_queue.submit.assert_not_called()
+        assert f"Path not found: {tmp_path / 'missing.txt'}" in capsys.readouterr().out
+
+    def test_add_command_does_not_walk_folders_before_queueing(self, mocker, tmp_path):
+        mocker.patch("minirag.cli.get_documents", return_value=[str(tmp_path)])
+        mocker.patch("minirag.cli.prompt", return_value="docs")
+        find_documents = mocker.patch.object(cli.collection_service, "find_documents")
+        job_queue = mocker.Mock()
+        mocker.patch("minirag.cli.get_job_queue", return_value=job_queue)
+
+        cli.handle_user_query("/add", "llama3.1:8b", self.session())
+
+        find_documents.assert_not_called()
+        job_queue.submit.assert_called_once_with([str(tmp_path)], "docs")
+
+    def test_add_command_rejects_empty_collection_name(self, mocker, capsys, tmp_path):
+        (tmp_path / "a.txt").write_text("Document A.")
+        mocker.patch("minirag.cli.get_documents", return_value=[str(tmp_path)])
+        mocker.patch("minirag.cli.prompt", return_value="  ")
+        job_queue = mocker.Mock()
+        mocker.patch("minirag.cli.get_job_queue", return_value=job_queue)
+
+        cli.handle_user_query("/add", "llama3.1:8b", self.session())
+
+        job_queue.submit.assert_not_called()
+        assert "Collection name cannot be empty" in capsys.readouterr().out
+
+    def test_jobs_command_shows_progress(self, mocker, capsys):
+        job = IngestionJob("abc123", "docs", ["docs"], status="running")
+        job.documents_total, job.documents_done, job.chunks_done = 10, 4, 40
+        job.started_at = 0.0
+        mocker.patch("minirag.models.ingestion_job.time.time", return_value=2.0)
+        mocker.patch("minirag.cli.get_job_queue").return_value.jobs = [job]
+
+        cli.handle_user_query("/jobs", "llama3.1:8b", self.session())
+
+        assert capsys.readouterr().out == (
+            "abc123  docs  running  4/10 documents, 40 chunks"
+            "  2.00 docs/s, 20.0 chunks/s, ETA 3s\n"
+        )
+
+    def test_cancel_without_job_id_prints_usage(self, capsys):
+        cli.handle_user_query("/cancel", "llama3.1:8b", self.session())
+
+        assert "Usage: /cancel <job_id>" in capsys.readouterr().out
@@ -0,0 +1,59 @@
+import pytest
+
+from minirag.utils.answer_cache import AnswerCache
+
+
+class TestAnswerCache:
+    @pytest.fixture
+    def cache(self, tmp_path):
+        cache = AnswerCache(str(tmp_path / "cache" / "answers.sqlite3"))
+        yield cache
+        cache.close()
+
+    @pytest.fixture
+    def chunks_key(self):
+        return AnswerCache.hash_chunks(["doc.txt#chunk-0"], ["CLUB: MPT"])
+
+    def test_similar_query_on_same_chunks_hits(self, cache, chunks_key):
+        cache.put("docs", "llama3.1:8b", chunks_key, [1.0, 0.0], "MPT")
+
+        assert cache.get("docs", "llama3.1:8b", chunks_key, [0.99, 0.05]) == "MPT"
+        assert cache.get("docs", "llama3.1:8b", chunks_key, [0.5, 0.5]) is None
+        assert cache.get("docs", "other-model", chunks_key, [1.0, 0.0]) is None
+
+    def test_exact_entries_without_embedding(self, cache):
+        key = AnswerCache.hash_chunks(["doc.txt#chunk-0"], ["CLUB: MPT"], "What club?")
+        other_key = AnswerCache.hash_chunks(
+            ["doc.txt#chunk-0"], ["CLUB: MPT"], "Which club?"
+        )
+        cache.put("docs", "llama3.1:8b", key, None, "MPT")
+
+        assert cache.get("docs", "llama3.1:8b", key, None) == "MPT"
+        assert cache.get("docs", "llama3.1:8b", other_key, None) is None
+        assert cache.get("docs", "llama3.1:8b", key, [1.0, 0.0]) is None
+
+    def test_different_chunks_miss(self, cache, chunks_key):
+        cache.put("docs", "llama3.1:8b", chunks_key, [1.0, 0.0], "MPT")
+        changed_key = AnswerCache.hash_chunks(["doc.txt#chunk-0"], ["CLUB: XYZ"])
+
+        assert cache.get("docs", "llama3.1:8b", changed_key, [1.0, 0.0]) is None
+
+    def test_expired_answers_miss(self, tmp_path, chunks_key, mocker):
+        cache = AnswerCache(str(tmp_path / "answers.sqlite3"), ttl_seconds=60)
+        time_ns = mocker.patch("minirag.utils.answer_cache.time.time_ns")
+        time_ns.return_value = 0
+        cache.put("docs", "model", chunks_key, [1.0], "old")
+
+        time_ns.return_value = 61 * 1_000_000_000
+
+        assert cache.get("docs", "model", chunks_key, [1.0]) is None
+
+    def test_put_evicts_least_recently_used(self, tmp_path):
+        cache = AnswerCache(str(tmp_path / "answers.sqlite3"), max_entries=2)
+        for answer in ["first", "second", "third"]:
+            key = AnswerCache.hash_chunks([answer], [answer])
+            cache.put("docs", "model", key, [1.0], answer)
+
+        assert len(cache) == 2
+        first_key = AnswerCache.hash_chunks(["first"], ["first"])
+        assert cache.get("docs", "model", first_key, [1.0]) is None
@@ -0,0 +1,67 @@
+import pytest
+
+from minirag.services.rag_service import RagService
+from minirag.utils.embedding_cache import EmbeddingCache, set_embedding_cache
+
+
+class TestEmbeddingCache:
+    @pytest.fixture
+    def cache(self, tmp_path):
+        cache = EmbeddingCache(str(tmp_path / "cache" / "embeddings.sqlite3"))
+        yield cache
+        cache.close()
+
+    def test_get_returns_stored_embedding(self, cache):
+        cache.put("ollama", "all-minilm", "hello", [0.5, 0.25])
+
+        assert cache.get("ollama", "all-minilm", "hello") == [0.5, 0.25]
+        assert cache.get("openai", "all-minilm", "hello") is None
+        assert cache.get("ollama", "other-model", "hello") is None
+
+    def test_put_evicts_least_recently_used(self, tmp_path):
+        cache = EmbeddingCache(str(tmp_path / "embeddings.sqlite3"), max_entries=2)
+        cache.put("ollama", "", "first", [1.0])
+        cache.put("ollama", "", "second", [2.0])
+        cache.get("ollama", "", "first")
+
+        cache.put("ollama", "", "third", [3.0])
+
+        assert len(cache) == 2
+        assert cache.get("ollama", "", "second") is None
+        assert cache.get("ollama", "", "first") == [1.0]
+        cache.close()
+
+    def test_cache_persists_between_instances(self, tmp_path):
+        cache_path = str(tmp_path / "embeddings.sqlite3")
+        cache = EmbeddingCache(cache_path)
+        cache.put("ollama", "", "hello", [0.5])
+        cache.close()
+
+        reopened = EmbeddingCache(cache_path)
+
+        assert reopened.get("ollama", "", "hello") == [0.5]
+        reopened.close()
+
+    def test_generate_embeddings_batch_only_embeds_misses(self, cache, mocker):
+        mock_backend = mocker.MagicMock()
+        mock_backend.generate_embeddings_batch.side_effect = lambda texts, _: [
+            [float(len(text))] for text in texts
+        ]
+        mocker.patch(
+            "minirag.services.rag_service.get_backend_instance",
+            return_value=mock_backend,
+        )
+        mocker.patch(
+            "minirag.services.rag_service.get_backend_name", return_value="ollama"
+        )
+        cache.put("ollama", "", "cached", [42.0])
+        set_embedding_cache(cache)
+        try:
+            embeddings = RagService.generate_embeddings_batch(["cached", "new"])
+            again = RagService.generate_embeddings_batch(["new"])
+        finally:
+            set_embedding_cache(None)
+
+        assert embeddings == [[42.0], [3.0]]
+        assert again == [[3.0]]
+        mock_backend.generate_embeddings_batch.assert_called_once_with(["new"], "")
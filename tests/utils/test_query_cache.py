@@ -0,0 +1,71 @@
+import pytest
+
+from minirag.backends.ollama_backend import OllamaBackend
+from minirag.services.rag_service import RagService
+from minirag.utils.query_cache import QueryEmbeddingCache, set_query_cache
+
+
+class TestQueryEmbeddingCache:
+    def test_get_counts_hits_and_misses(self):
+        cache = QueryEmbeddingCache()
+        cache.put("ollama", "all-minilm", "hello", [0.5, 0.25])
+
+        assert cache.get("ollama", "all-minilm", "hello") == [0.5, 0.25]
+        assert cache.get("openai", "all-minilm", "hello") is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_put_evicts_least_recently_used(self):
+        cache = QueryEmbeddingCache(max_entries=2)
+        cache.put("ollama", "", "first", [1.0])
+        cache.put("ollama", "", "second", [2.0])
+        cache.get("ollama", "", "first")
+
+        cache.put("ollama", "", "third", [3.0])
+
+        assert len(cache) == 2
+        assert cache.get("ollama", "", "second") is None
+        assert cache.get("ollama", "", "first") == [1.0]
+
+
+class TestRagServiceQueryCache:
+    @pytest.fixture(autouse=True)
+    def query_cache(self, mocker):
+        mocker.patch(
+            "minirag.services.rag_service.get_backend_instance",
+            return_value=OllamaBackend(),
+        )
+        mocker.patch(
+            "minirag.services.rag_service.get_backend_name", return_value="ollama"
+        )
+        cache = QueryEmbeddingCache()
+        set_query_cache(cache)
+        yield cache
+        set_query_cache(None)
+
+    def test_repeated_query_is_embedded_once(self, mocker, query_cache):
+        generate_embeddings = mocker.patch.object(
+            RagService, "generate_embeddings", return_value=[1.0, 0.0]
+        )
+
+        first = RagService.embed_query("same question")
+        second = RagService.embed_query("same question")
+
+        assert first == second == [1.0, 0.0]
+        generate_embeddings.assert_called_once_with("same question", "all-minilm")
+        assert (query_cache.hits, query_cache.misses) == (1, 1)
+
+    def test_entries_are_keyed_by_embedding_model(self, mocker, query_cache):
+        generate_embeddings = mocker.patch.object(
+            RagService, "generate_embeddings", side_effect=[[1.0, 0.0], [0.5]]
+        )
+
+        default_model = RagService.embed_query("same question")
+        mocker.patch.object(
+            OllamaBackend, "default_embedding_model", "nomic-embed-text"
+        )
+        other_model = RagService.embed_query("same question")
+
+        assert default_model == [1.0, 0.0]
+        assert other_model == [0.5]
+        assert generate_embeddings.call_count == 2
+        assert query_cache.get("ollama", "all-minilm", "same question") == [1.0, 0.0]